@@ -0,0 +1,123 @@
+"""
+Benchmark for the reaction lookups with and without the secondary indexes.
+A reactions table with the given number of rows is created in a temporary SQLite
+database and the queries of get_reaction and get_reaction_for_remove are timed.
+
+Usage: python -m benchmarks.bench_reaction_lookup --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.schema import CreateTable
+from src.db import Reaction, ReactionStatus
+
+EMOJIS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "🇭", "👍", "🔥"]
+
+
+def fill_reactions(conn, rows: int, messages: int, users: int) -> None:
+    """
+    Function to insert random reactions in batches.
+
+    Args:
+        conn (Connection): Database connection
+        rows (int): Number of reactions
+        messages (int): Number of different messages
+        users (int): Number of different users
+    """
+    rng = random.Random(42)
+    now = datetime.now()
+    statuses = list(ReactionStatus)
+    batch_size = 50000
+    for start in range(0, rows, batch_size):
+        conn.execute(
+            insert(Reaction),
+            [
+                {
+                    "dc_id": str(rng.randrange(users)),
+                    "status": rng.choice(statuses),
+                    "timestamp": now,
+                    "message_id": rng.randrange(messages),
+                    "channel_id": 1,
+                    "emoji": rng.choice(EMOJIS),
+                }
+                for _ in range(min(batch_size, rows - start))
+            ],
+        )
+
+
+def time_lookups(conn, lookups: list[tuple[int, str, str]]) -> float:
+    """
+    Function to run both reaction lookups for all given keys.
+
+    Args:
+        conn (Connection): Database connection
+        lookups (list[tuple[int, str, str]]): message ID, user ID and emoji per lookup
+
+    Returns:
+        float: Average latency per lookup pair in milliseconds
+    """
+    start = time.perf_counter()
+    for message_id, dc_id, emoji in lookups:
+        conn.execute(
+            select(Reaction)
+            .where(Reaction.message_id == message_id)
+            .where(Reaction.dc_id == dc_id)
+            .where(Reaction.status == ReactionStatus.REGISTERED)
+        ).all()
+        conn.execute(
+            select(Reaction)
+            .where(Reaction.message_id == message_id)
+            .where(Reaction.dc_id == dc_id)
+            .where(Reaction.emoji == emoji)
+            .where(
+                Reaction.status.not_in(
+                    [
+                        ReactionStatus.DELETED_STATUS,
+                        ReactionStatus.DELETED_PLAYER,
+                        ReactionStatus.REMOVED,
+                    ]
+                )
+            )
+        ).all()
+    return (time.perf_counter() - start) * 1000 / len(lookups)
+
+
+def main():
+    """
+    Entry point of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+    messages, users = 2000, 500
+    rng = random.Random(7)
+    lookups = [
+        (rng.randrange(messages), str(rng.randrange(users)), rng.choice(EMOJIS))
+        for _ in range(args.lookups)
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        table = Reaction.__table__
+        with engine.begin() as conn:
+            conn.execute(CreateTable(table))
+            start = time.perf_counter()
+            fill_reactions(conn, args.rows, messages, users)
+            print(f"Inserted {args.rows} reactions in {time.perf_counter() - start:.1f}s")
+        with engine.connect() as conn:
+            print(f"Without indexes: {time_lookups(conn, lookups):.3f} ms per lookup")
+        with engine.begin() as conn:
+            for index in table.indexes:
+                index.create(conn)
+        with engine.connect() as conn:
+            print(f"With indexes:    {time_lookups(conn, lookups):.3f} ms per lookup")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
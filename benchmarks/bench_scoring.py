@@ -0,0 +1,114 @@
+"""
+Benchmark for scoring game 1 results with the former loop per game compared to the
+vectorised scoring module. Random results of games with six players are simulated
+and all games are scored with the configured default weights.
+
+Usage: python -m benchmarks.bench_scoring --results 10000 100000
+"""
+
+import argparse
+import time
+import numpy as np
+from src.scoring import ScoreWeights, score_games
+
+WEIGHTS = ScoreWeights(10, 5, 1)
+PLAYERS_PER_GAME = 6
+
+
+def simulate_results(results: int) -> tuple[np.ndarray, ...]:
+    """
+    Function to simulate the results of games with six players.
+
+    Args:
+        results (int): Number of player results
+
+    Returns:
+        tuple[np.ndarray, ...]: Game IDs, completed tasks, survived and player days
+    """
+    rng = np.random.default_rng(42)
+    game_ids = np.arange(results) // PLAYERS_PER_GAME
+    completed_tasks = rng.integers(0, 6, results)
+    survived = rng.random(results) < 0.3
+    player_days = rng.integers(0, 71, results)
+    return game_ids, completed_tasks, survived, player_days
+
+
+def time_loop(columns: tuple[np.ndarray, ...]) -> float:
+    """
+    Function to score the results with the former loop per game.
+
+    Args:
+        columns (tuple[np.ndarray, ...]): Simulated results
+
+    Returns:
+        float: Time in milliseconds
+    """
+    rows = list(zip(*(column.tolist() for column in columns)))
+    start = time.perf_counter()
+    games = {}
+    for game_id, tasks, survived, days in rows:
+        games.setdefault(game_id, []).append((tasks, survived, days))
+    for results in games.values():
+        scores = sorted(
+            (
+                tasks * WEIGHTS.tasks
+                + (1 if survived else 0) * WEIGHTS.survived
+                + days * WEIGHTS.days
+                for tasks, survived, days in results
+            ),
+            reverse=True,
+        )
+        rank, points, last_score = 1, 6, 0
+        for score in scores:
+            if score < last_score:
+                rank += 1
+                points -= 1
+            last_score = score
+    return (time.perf_counter() - start) * 1000
+
+
+def time_vectorised(columns: tuple[np.ndarray, ...]) -> float:
+    """
+    Function to score the results with the vectorised scoring module.
+
+    Args:
+        columns (tuple[np.ndarray, ...]): Simulated results
+
+    Returns:
+        float: Time in milliseconds
+    """
+    start = time.perf_counter()
+    score_games(*columns, WEIGHTS)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(results: int, repeats: int) -> None:
+    """
+    Function to run the benchmark for one number of results.
+
+    Args:
+        results (int): Number of player results
+        repeats (int): Number of repetitions, the best time is reported
+    """
+    columns = simulate_results(results)
+    loop = min(time_loop(columns) for _ in range(repeats))
+    vectorised = min(time_vectorised(columns) for _ in range(repeats))
+    print(f"{results} results in {results // PLAYERS_PER_GAME} games")
+    print(f"  loop per game:  {loop:8.3f} ms")
+    print(f"  vectorised:     {vectorised:8.3f} ms")
+
+
+def main() -> None:
+    """
+    Entry point of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    for results in args.results:
+        run(results, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark for drawing random tasks with ORDER BY random() in SQLite compared to
+the task sampler on the in-memory task pool. A tasks table with the given number
+of rows is created in a temporary SQLite database and the random task of a practice
+game and the main task of a game are drawn repeatedly.
+
+Usage: python -m benchmarks.bench_task_sampling --rows 10000 100000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, CreateTable
+from src.db import Task
+from src.task_pool import TaskPool, TaskSampler
+
+
+def fill_tasks(conn, rows: int) -> None:
+    """
+    Function to insert random tasks with one main task per hundred tasks.
+
+    Args:
+        conn (Connection): Database connection
+        rows (int): Number of tasks
+    """
+    rng = random.Random(42)
+    conn.execute(
+        insert(Task),
+        [
+            {
+                "name": f"task_{i}",
+                "active": True,
+                "once": rng.random() < 0.1,
+                "rating": rng.randint(0, 100),
+                "description": "benchmark task",
+                "language": "en",
+                "game": 1,
+                "type": "main" if i % 100 == 0 else "task",
+            }
+            for i in range(rows)
+        ],
+    )
+
+
+def time_order_by_random(conn, draws: int) -> float:
+    """
+    Function to draw tasks with ORDER BY random() like the former database functions.
+
+    Args:
+        conn (Connection): Database connection
+        draws (int): Number of draws
+
+    Returns:
+        float: Average time per draw in milliseconds
+    """
+    start = time.perf_counter()
+    for i in range(draws):
+        query = select(Task).order_by(func.random()).limit(1)  # pylint: disable=not-callable
+        if i % 2:
+            query = query.where(Task.type == "main")
+        else:
+            query = query.where(Task.rating >= 40).where(Task.rating < 59)
+        conn.execute(query).first()
+    return (time.perf_counter() - start) * 1000 / draws
+
+
+def time_task_sampler(
+    pool: TaskPool, sampler: TaskSampler, draws: int, weighting: str
+) -> float:
+    """
+    Function to draw tasks with the task sampler from the task pool.
+
+    Args:
+        pool (TaskPool): Loaded task pool
+        sampler (TaskSampler): Task sampler
+        draws (int): Number of draws
+        weighting (str): Weighting of the sampler
+
+    Returns:
+        float: Average time per draw in milliseconds
+    """
+    start = time.perf_counter()
+    for i in range(draws):
+        if i % 2:
+            sampler.draw(pool, "main", 1, weighting=weighting)
+        else:
+            sampler.draw(pool, "task", 1, 40, 59, weighting)
+    return (time.perf_counter() - start) * 1000 / draws
+
+
+def run(rows: int, draws: int) -> None:
+    """
+    Function to run the benchmark for one table size.
+
+    Args:
+        rows (int): Number of tasks
+        draws (int): Number of draws per variant
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        with engine.begin() as conn:
+            conn.execute(CreateTable(Task.__table__))
+            for index in Task.__table__.indexes:
+                conn.execute(CreateIndex(index))
+            fill_tasks(conn, rows)
+        with engine.connect() as conn:
+            order_by_random = time_order_by_random(conn, draws)
+        start = time.perf_counter()
+        with Session(engine) as session:
+            pool = TaskPool()
+            pool.load(session.execute(select(Task)).scalars().all())
+        load_time = (time.perf_counter() - start) * 1000
+        sampler = TaskSampler(seed=42)
+        uniform = time_task_sampler(pool, sampler, draws, "uniform")
+        weighted = time_task_sampler(pool, sampler, draws, "rating")
+        engine.dispose()
+    print(f"{rows} tasks, {draws} draws")
+    print(f"  ORDER BY random():        {order_by_random:8.3f} ms per draw")
+    print(f"  task pool load (once):    {load_time:8.3f} ms")
+    print(f"  sampler uniform:          {uniform:8.3f} ms per draw")
+    print(f"  sampler rating weighted:  {weighted:8.3f} ms per draw")
+
+
+def main() -> None:
+    """
+    Entry point of the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--draws", type=int, default=200)
+    args = parser.parse_args()
+    for rows in args.rows:
+        run(rows, args.draws)
+
+
+if __name__ == "__main__":
+    main()
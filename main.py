@@ -22,14 +22,24 @@ async def main():
     config = src.Configuration()
     src.watcher.init_logging(config)
     config.db.initialize_db()
-    await src.sync_db(config.db.engine)
+    await src.run_migrations(config)
+    await src.check_db_settings(config)
+    await src.load_active_games(config)
+    src.task_sampler.seed(config.game.task_seed)
     src.watcher.logger.info(f"Start application in version: {src.__version__}")
-    await src.generate_league_table(config)
+    src.reaction_writer.start(config)
+    src.executor_service.start(config)
+    src.http_client.configure(config.gen_req)
     discord_bot = src.DiscordBot(config)
     tasks = [discord_bot.start()]
     # tasks.append(background_task())
     # tasks.append(onlyonce(config))
-    await asyncio.gather(*tasks)
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await src.reaction_writer.stop()
+        src.executor_service.stop()
+        await src.http_client.close()
 
 
 if __name__ == "__main__":
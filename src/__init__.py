@@ -8,8 +8,14 @@ and enables
 """
 from .configuration import *
 from .db import *
+from .migrations import *
 from .discord_bot import *
 from .game import *
+from .reaction_writer import *
+from .executor import *
+from .task_pool import *
+from .scoring import *
+from .stats_cache import *
 from .tetue_generic.generic_requests import *
 from .tetue_generic.watcher import *
 __version__ = "v0.3.1"
@@ -2,12 +2,14 @@
 Load environment variables and validation of project configurations from user
 """
 import re
-import asyncio
+from typing import Literal
 # from typing import List, Optional
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import BaseModel, field_validator, ConfigDict
+from pydantic import BaseModel, PositiveInt, NonNegativeInt, Field, field_validator, ConfigDict
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
+from .lock_manager import LockManager
 from .tetue_generic.generic_requests import GenReqConfiguration
 from .tetue_generic.watcher import WatcherConfiguration
 
@@ -24,11 +26,15 @@ class GeneralGame(BaseModel):
     num_quests: int
     input_task_path: str
     export_task_path: str
+    export_chunk_size: PositiveInt = 1000
     weighted_hours_g1: float
     weighted_league_pos_g1: float
     weighted_rank_task_g1: int
     weighted_rank_surv_g1: int
     weighted_rank_days_g1: int
+    dc_concurrency: PositiveInt = 3
+    task_sampling: Literal["uniform", "rating"] = "uniform"
+    task_seed: int | None = None
 
 class DbConfiguration(BaseModel):
     """
@@ -38,15 +44,49 @@ class DbConfiguration(BaseModel):
     db_url: str = None
     engine: AsyncEngine = None
     session: async_sessionmaker = None
-    write_lock: asyncio.locks.Lock = asyncio.Lock()  # pylint: disable=not-callable
+    locks: LockManager = Field(default_factory=LockManager)
+    reaction_batch_size: PositiveInt = 100
+    reaction_flush_ms: PositiveInt = 20
+    migration_batch_size: PositiveInt = 10000
+    league_check_minutes: PositiveInt = 60
+    journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"] = "WAL"
+    synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    cache_size: int = -64000
+    mmap_size: NonNegativeInt = 268435456
+    temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    busy_timeout: NonNegativeInt = 5000
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    @property
+    def pragmas(self) -> dict[str, str | int]:
+        """
+        SQLite pragmas of the performance profile which are set on every connection
+
+        Returns:
+            dict[str, str | int]: Pragma name and value
+        """
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "cache_size": self.cache_size,
+            "mmap_size": self.mmap_size,
+            "temp_store": self.temp_store,
+            "busy_timeout": self.busy_timeout,
+        }
+
     def initialize_db(self):
         """
         Function to initialize the database connection
         """
         self.engine = create_async_engine(self.db_url)
         self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+        event.listen(self.engine.sync_engine, "connect", self._set_pragmas)
+
+    def _set_pragmas(self, dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in self.pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
 
 
     @field_validator("db_url")
@@ -70,6 +110,15 @@ class DbConfiguration(BaseModel):
         return value
 
 
+class ExecutorConfiguration(BaseModel):
+    """
+    Configuration settings for the worker pool of blocking file and CPU work
+    """
+
+    kind: Literal["thread", "process"] = "thread"
+    max_workers: PositiveInt = 2
+
+
 class DiscordBotConfiguration(BaseModel):
     """
     Configuration settings for discord bot
@@ -97,3 +146,4 @@ class Configuration(BaseSettings):
     db: DbConfiguration
     dc: DiscordBotConfiguration
     game: GeneralGame
+    executor: ExecutorConfiguration = Field(default_factory=ExecutorConfiguration)
@@ -1,11 +1,10 @@
 # pylint: disable=too-many-lines
 """All database related functions are here."""
 import asyncio
-import random
 from enum import Enum
-from typing import Set
+from typing import NamedTuple, Set
 from datetime import datetime
-from sqlalchemy import ForeignKey, func, case, desc, delete
+from sqlalchemy import ForeignKey, Index, Select, func, case, desc, delete, insert, update
 from sqlalchemy import Enum as AlchemyEnum
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -15,7 +14,7 @@ from sqlalchemy.orm import (
     joinedload,
     selectinload,
 )
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import (
     DBAPIError,
@@ -26,6 +25,9 @@ from sqlalchemy.exc import (
     SQLAlchemyError,
 )
 from .configuration import Configuration
+from .game_index import ActiveGameIndex
+from .task_pool import task_pool, task_sampler
+from .stats_cache import StatsSnapshot, game_stats_cache
 
 
 class ReactionStatus(Enum):
@@ -65,6 +67,9 @@ class GameStatus(Enum):
         return icons[self]
 
 
+active_games = ActiveGameIndex(untracked_status={GameStatus.FINISHED, GameStatus.STOPPED})
+
+
 class Base(DeclarativeBase):
     """Declarative base class
 
@@ -82,6 +87,11 @@ class GamePlayerAssociation(Base):
     """
 
     __tablename__ = "game_player_association"
+    __table_args__ = (
+        Index(
+            "ux_game_player_association_game_player", "game_id", "player_id", unique=True
+        ),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id"))
     player_id: Mapped[int] = mapped_column(ForeignKey("players.id"))
@@ -103,6 +113,7 @@ class Player(Base):
     """
 
     __tablename__ = "players"
+    __table_args__ = (Index("ux_players_dc_id", "dc_id", unique=True),)
     id: Mapped[int] = mapped_column(primary_key=True)
     dc_id: Mapped[str] = mapped_column()
     name: Mapped[str] = mapped_column(nullable=False)
@@ -126,6 +137,7 @@ class League(Base):
     points: Mapped[int] = mapped_column(nullable=False)
     player_id: Mapped[int] = mapped_column(ForeignKey("players.id"))
     survived: Mapped[int] = mapped_column(nullable=False)
+    position: Mapped[int] = mapped_column(nullable=True, index=True)
     player: Mapped[Player] = relationship(
         "Player", back_populates="league", lazy="joined"
     )
@@ -133,7 +145,7 @@ class League(Base):
     def __repr__(self) -> str:
         return (
             f"Player: {self.player_id!r} / "
-            f"Place: {self.id!r} / "
+            f"Place: {self.position!r} / "
             f"points:{self.points!r} / "
             f"survived:{self.survived!r})"
         )
@@ -169,11 +181,11 @@ class Game(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False)
     status: Mapped[GameStatus] = mapped_column(
-        AlchemyEnum(GameStatus), default=GameStatus.CREATED
+        AlchemyEnum(GameStatus), default=GameStatus.CREATED, index=True
     )
     playing_days: Mapped[int] = mapped_column(default=70)
     timestamp: Mapped[datetime] = mapped_column(nullable=False)
-    message_id: Mapped[int] = mapped_column(nullable=True)
+    message_id: Mapped[int] = mapped_column(nullable=True, index=True)
     channel_id: Mapped[int] = mapped_column(nullable=True)
     players = relationship("GamePlayerAssociation", back_populates="game")
 
@@ -252,6 +264,10 @@ class Task(Base):
     """
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_type_rating", "type", "rating"),
+        Index("ux_tasks_name", "name", unique=True),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False)
     active: Mapped[bool] = mapped_column(default=True)
@@ -261,6 +277,7 @@ class Task(Base):
     language: Mapped[str] = mapped_column(nullable=True)
     game: Mapped[int] = mapped_column(nullable=False)
     type: Mapped[str] = mapped_column(nullable=False)
+    fingerprint: Mapped[str] = mapped_column(nullable=True)
 
     quests = relationship("Quest", back_populates="task")
 
@@ -268,6 +285,27 @@ class Task(Base):
         return f"Name: {self.name!r}, rate:{self.rating!r})"
 
 
+class TaskImport(Base):
+    """Task import table with the file hash and the result of every import
+
+    Args:
+        Base (_type_): Basic class that is inherited
+    """
+
+    __tablename__ = "task_imports"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    file_hash: Mapped[str] = mapped_column(nullable=False)
+    path: Mapped[str] = mapped_column(nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(nullable=False)
+    inserted: Mapped[int] = mapped_column(default=0)
+    updated: Mapped[int] = mapped_column(default=0)
+    unchanged: Mapped[int] = mapped_column(default=0)
+    failed: Mapped[int] = mapped_column(default=0)
+
+    def __repr__(self) -> str:
+        return f"ID: {self.id!r}, hash:{self.file_hash!r})"
+
+
 class Reaction(Base):
     """Reaction table
 
@@ -276,6 +314,10 @@ class Reaction(Base):
     """
 
     __tablename__ = "reactions"
+    __table_args__ = (
+        Index("ix_reactions_message_dc_status", "message_id", "dc_id", "status"),
+        Index("ix_reactions_message_dc_emoji", "message_id", "dc_id", "emoji"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     dc_id: Mapped[str] = mapped_column(nullable=False)
     status: Mapped[ReactionStatus] = mapped_column(
@@ -292,6 +334,30 @@ class Reaction(Base):
         return f"ID: {self.id!r}, status:{self.status!r})"
 
 
+def lock_key(obj: Base) -> tuple:
+    """
+    Function to determine the aggregate lock for a database object. Reactions belong
+    to their game and ranks to the league.
+
+    Args:
+        obj (Base): Database object to write
+
+    Returns:
+        tuple: Aggregate key for the lock manager
+    """
+    match obj:
+        case Game():
+            return ("game", obj.id)
+        case Player():
+            return ("player", str(obj.dc_id))
+        case Reaction():
+            return ("game", obj.game_id)
+        case Rank():
+            return ("league",)
+        case _:
+            return (obj.__tablename__, obj.id)
+
+
 async def get_player(config, player_id: int) -> Player | None:
     """
     Function to get a player from the database by dc_id
@@ -345,7 +411,7 @@ async def process_player(
         list[Player]: processed player list
     """
     processed_player_list = []
-    async with config.db.write_lock:
+    async with config.db.locks.acquire(*(("player", str(p.dc_id)) for p in player_list)):
         async with config.db.session() as session:
             for p in player_list:
                 async with session.begin():
@@ -367,12 +433,13 @@ async def process_player(
                             player.hours = p.hours
                             # await session.commit()
                         processed_player_list.append(player)
+    game_stats_cache.invalidate()
     return processed_player_list
 
 
 async def create_game(
     config: Configuration, game_name: str, player: list[Player]
-) -> Game:
+) -> tuple[Game, dict[int, int]] | None:
     """
     Function to create a game in the database and link all players to the game.
 
@@ -382,10 +449,11 @@ async def create_game(
         player (list[Player]): All players in the game
 
     Returns:
-        Game: Object of the created game for further processing
+        tuple[Game, dict[int, int]] | None: Object of the created game for further processing
+            and the game player association ID for each player ID
     """
     try:
-        async with config.db.write_lock:
+        async with config.db.locks.acquire(*(("player", str(p.dc_id)) for p in player)):
             async with config.db.session() as session:
                 async with session.begin():
                     game = Game(
@@ -397,8 +465,16 @@ async def create_game(
                         GamePlayerAssociation(game=game, player=p) for p in player
                     ]
                     session.add_all(associations)
+                    await session.flush()
+                    association_ids = {
+                        association.player_id: association.id
+                        for association in associations
+                    }
                 await session.refresh(game)
-                return game
+                active_games.register(
+                    game.id, game.name, game.status, [p.dc_id for p in player]
+                )
+                return game, association_ids
     except IntegrityError as err:
         config.watcher.logger.error(f"Integrity error {str(err)}")
     except SQLAlchemyError as err:
@@ -484,88 +560,135 @@ async def get_games_f_reaction(config: Configuration) -> list[Game] | None:
     return games
 
 
+async def load_active_games(config: Configuration) -> None:
+    """
+    Function to load all games that are relevant for reaction tracking with their
+    players into the in-memory game index. Called once at startup.
+
+    Args:
+        config (Configuration): App configuration
+    """
+    async with config.db.session() as session:
+        async with session.begin():
+            games = (
+                (
+                    await session.execute(
+                        select(Game)
+                        .options(
+                            selectinload(Game.players).selectinload(
+                                GamePlayerAssociation.player
+                            )
+                        )
+                        .where(Game.status.not_in(active_games.untracked_status))
+                    )
+                )
+                .scalars()
+                .all()
+            )
+    active_games.clear()
+    for game in games:
+        active_games.register(
+            game.id,
+            game.name,
+            game.status,
+            [association.player.dc_id for association in game.players],
+            message_id=game.message_id,
+            channel_id=game.channel_id,
+        )
+    config.watcher.logger.info(f"Loaded {len(active_games)} games into game index")
+
+
 async def get_random_tasks(
-    config: Configuration, limit: int, rating_min: int = 0, rating_max: int = 101
+    config: Configuration,
+    limit: int,
+    rating_min: int = 0,
+    rating_max: int = 101,
+    task_type: str | None = None,
 ) -> list[Task]:
     """
-    This function gets a list of random tasks from the database.
+    This function gets a list of random tasks from the task pool.
     The number of tasks is limited by the limit parameter.
 
     Args:
         config (Configuration): App configuration
         limit (int): number of tasks to get
+        rating_min (int, optional): Lowest rating. Defaults to 0.
+        rating_max (int, optional): Upper bound of the rating (excluded). Defaults to 101.
+        task_type (str | None, optional): Type of the tasks. Defaults to all types.
 
     Returns:
-        list[Task]: Tasks from the database
-    """
-    async with config.db.session() as session:
-        return (
-            (
-                await session.execute(
-                    select(Task)
-                    .where(Task.rating >= rating_min)
-                    .where(Task.rating < rating_max)
-                    .order_by(func.random())  # pylint: disable=not-callable
-                    .limit(limit)
-                )
-            )
-            .scalars()
-            .all()
+        list[Task]: Randomly selected tasks
+    """
+    await load_task_pool(config)
+    if task_type is None:
+        return task_sampler.sample(
+            task_pool.tasks(None, rating_min, rating_max),
+            limit,
+            config.game.task_sampling,
         )
+    return task_sampler.draw(
+        task_pool,
+        task_type,
+        limit,
+        rating_min,
+        rating_max,
+        config.game.task_sampling,
+    )
 
 
-async def get_main_task(config: Configuration) -> Task:
+async def get_main_task(config: Configuration) -> Task | None:
     """
-    Funktion to get a random main task from the database for game 1
+    Funktion to get a random main task from the task pool for game 1
 
     Args:
         config (Configuration): App configuration
 
     Returns:
-        Task: main task
+        Task | None: main task or None if there is no main task
+    """
+    tasks = await get_random_tasks(config, 1, task_type="main")
+    return tasks[0] if tasks else None
+
+
+async def load_task_pool(config: Configuration) -> None:
+    """
+    Function to load all active tasks into the task pool if the pool is not loaded yet.
+
+    Args:
+        config (Configuration): App configuration
     """
+    if task_pool.loaded:
+        return
     async with config.db.session() as session:
-        return (
-            await session.execute(
-                select(Task)
-                .where(Task.type == "main")
-                .order_by(func.random())  # pylint: disable=not-callable
-                .limit(1)
-            )
-        ).scalar_one_or_none()
+        tasks = (
+            (await session.execute(select(Task).where(Task.active.is_(True))))
+            .scalars()
+            .all()
+        )
+    task_pool.load(tasks)
+    config.watcher.logger.debug(f"Loaded {len(task_pool)} active tasks into task pool")
 
 
-async def get_tasks_based_on_rating_1(config: Configuration, rating: int) -> list[Task]:
+async def get_tasks_based_on_rating_1(
+    config: Configuration, rating: int
+) -> list[list[Task]]:
     """
-    This function gets a list of tasks from the database based on the rating for game 1.
-    The rating is used to filter the tasks.
+    This function gets the tasks for game 1 based on the rating. All tasks with a rating
+    lower or equal to the rating are used. If there are less than 5 tasks, the rating
+    is increased by 5 up to 5 times.
 
     Args:
         config (Configuration): App configuration
         rating (int): rating to filter the tasks from 0 to 100
 
     Returns:
-        list[Task]: Tasks from the database
+        list[list[Task]]: Tasks divided into the five rating groups or an empty list
     """
-    async with config.db.session() as session:
-        for _ in range(6):
-            tasks = (
-                (
-                    await session.execute(
-                        select(Task)
-                        .filter(Task.rating <= rating)
-                        .filter(Task.type == "task")
-                        .order_by(Task.rating.desc())
-                    )
-                )
-                .scalars()
-                .all()
-            )
-
-            if len(tasks) >= 5:
-                return tasks
-            rating += 5
-    return []
+    await load_task_pool(config)
+    rating_max = task_pool.widened_rating("task", rating)
+    if rating_max is None:
+        return []
+    return task_pool.rating_groups("task", rating_max)
 
 
 async def get_tasks_sort_hard(tasks: list[Task], number_of_tasks=5) -> list[Task]:
@@ -613,22 +736,22 @@ async def balanced_task_mix(tasks: list[Task], number_of_tasks=5) -> list[Task]:
 
 
 async def balanced_task_mix_random(
-    config: Configuration, tasks: list[Task], exclude_ids: Set[int]
+    config: Configuration, sorted_tasks: list[list[Task]], exclude_ids: Set[int]
 ) -> list[Task]:
     """
-    This function creates a balanced random task mix from the list of tasks.
-    The tasks are sorted by rating and the list is divided into equal parts.
-    There is one task from each of the different difficulty levels.
+    This function creates a balanced random task mix from the tasks in the rating
+    groups. There is one task from each of the different difficulty levels. If a group
+    is empty, the next easier group provides one more task.
+
+    Args:
+        config (Configuration): App configuration
+        sorted_tasks (list[list[Task]]): Tasks per rating group from easy to hard
+        exclude_ids (Set[int]): Task IDs that are already assigned and only allowed once
 
     Returns:
         list[Task]: Balanced task mix
     """
     try:
-        sorted_tasks = [[] for _ in range(5)]
-        for task in tasks:
-            group = min(task.rating // 20, 4)
-            sorted_tasks[group].append(task)
-
         list_counter = 1
         selected_task = []
 
@@ -638,9 +761,7 @@ async def balanced_task_mix_random(
                 continue
             filtered_tasks = [t for t in grouped_tasks if t.id not in exclude_ids]
             n = min(list_counter, len(filtered_tasks))
-            selected_task.extend(
-                random.sample(filtered_tasks, n)  # pylint: disable=no-member
-            )
+            selected_task.extend(task_sampler.sample(filtered_tasks, n))
             exclude_ids.update(t.id for t in selected_task if t.once)
             list_counter -= n
             if list_counter <= 0:
@@ -708,7 +829,7 @@ async def update_db_obj(
         config (_type_): configuration
         obj (Game | Player | Exercise | Reaction): Object to update in the database
     """
-    async with config.db.write_lock:
+    async with config.db.locks.acquire(lock_key(obj)):
         async with config.db.session() as session:
             async with session.begin():
                 session.add(obj)
@@ -729,7 +850,7 @@ async def update_db_objs(
         config (_type_): configuration
         obj (Game | Player | Exercise | Reaction): Object to update in the database
     """
-    async with config.db.write_lock:
+    async with config.db.locks.acquire(*(lock_key(obj) for obj in objs)):
         async with config.db.session() as session:
             async with session.begin():
                 session.add_all(objs)
@@ -752,7 +873,7 @@ async def insert_db_obj(config: Configuration, obj: Reaction) -> Reaction:
         Reaction: Inserted and updated object
     """
     try:
-        async with config.db.write_lock:
+        async with config.db.locks.acquire(lock_key(obj)):
             async with config.db.session() as session:
                 async with session.begin():
                     session.add(obj)
@@ -831,7 +952,7 @@ async def set_reaction_status(
         reactions (list[Reaction]): List of Reaction objects to update
         status (ReactionStatus): Status to set for the reactions
     """
-    async with config.db.write_lock:
+    async with config.db.locks.acquire(*(lock_key(reaction) for reaction in reactions)):
         async with config.db.session() as session:
             async with session.begin():
                 for reaction in reactions:
@@ -888,6 +1009,50 @@ async def get_reaction(
         return None
 
 
+async def get_completed_tasks(
+    config: Configuration, message_id: int
+) -> dict[str, list[str]] | None:
+    """
+    Function to get the completed tasks of all players of a game in one query. The
+    registered reactions of the game message are grouped by player and emoji, so every
+    emoji counts once per player.
+
+    Args:
+        config (Configuration): App configuration
+        message_id (int): Message ID of the game
+
+    Returns:
+        dict[str, list[str]] | None: Emojis of the completed tasks for each Discord ID
+            or None if an error occurs
+    """
+    config.watcher.logger.trace(f"Get completed tasks for message ID: {message_id}")
+    try:
+        async with config.db.session() as session:
+            rows = await session.execute(
+                select(Reaction.dc_id, Reaction.emoji)
+                .where(Reaction.message_id == message_id)
+                .where(Reaction.status == ReactionStatus.REGISTERED)
+                .group_by(Reaction.dc_id, Reaction.emoji)
+            )
+            completed_tasks = {}
+            for dc_id, emoji in rows:
+                completed_tasks.setdefault(dc_id, []).append(emoji)
+            return completed_tasks
+    except (
+        DBAPIError,
+        InvalidRequestError,
+        StatementError,
+        IntegrityError,
+        OperationalError,
+        asyncio.TimeoutError,
+        asyncio.CancelledError,
+    ) as err:
+        config.watcher.logger.error(
+            f"Error getting completed tasks: {str(err)}", exc_info=True
+        )
+        return None
+
+
 async def merging_calc_base_game_1(
     config: Configuration, game_ids: list[int]
 ) -> list[Game1PlayerResult]:
@@ -942,36 +1107,353 @@ async def merging_calc_base_game_1(
         return []
 
 
-async def schedule_new_league_table(
-    config: Configuration, sorted_players: list[tuple]
-) -> None:
+async def save_game_1_results(
+    config: Configuration, game: Game, results: list[Game1PlayerResult]
+) -> bool:
+    """
+    Function to save the entered player results and the game days of a stopped game
+    in one transaction. Results entered before for the game are replaced, so the
+    input can be repeated until the game is evaluated.
+
+    Args:
+        config (Configuration): App configuration
+        game (Game): Stopped game with the entered game days
+        results (list[Game1PlayerResult]): Results of all players of the game
+
+    Returns:
+        bool: True if the results are saved
+    """
+    try:
+        async with config.db.locks.acquire(("game", game.id)):
+            async with config.db.session() as session:
+                async with session.begin():
+                    await session.execute(
+                        delete(Game1PlayerResult).where(
+                            Game1PlayerResult.game_player_association_id.in_(
+                                select(GamePlayerAssociation.id).where(
+                                    GamePlayerAssociation.game_id == game.id
+                                )
+                            )
+                        )
+                    )
+                    await session.execute(
+                        update(Game)
+                        .where(Game.id == game.id)
+                        .values(playing_days=game.playing_days)
+                    )
+                    session.add_all(results)
+    except (
+        DBAPIError,
+        InvalidRequestError,
+        StatementError,
+        IntegrityError,
+        OperationalError,
+        asyncio.TimeoutError,
+    ) as err:
+        config.watcher.logger.error(
+            f"Error saving the results of game {game.id}: {str(err)}", exc_info=True
+        )
+        return False
+    config.watcher.logger.info(
+        f"Results of game {game.id} saved for {len(results)} players"
+    )
+    return True
+
+
+class LeagueChange(NamedTuple):
+    """
+    Difference of one player between the stored and the recalculated league table.
+    None marks a player that is missing in the respective table.
+    """
+
+    player_id: int
+    old_position: int | None
+    new_position: int | None
+    old_points: int | None
+    new_points: int | None
+    old_survived: int | None
+    new_survived: int | None
+
+
+def league_standings_statement() -> Select:
+    """
+    Function to create the statement that aggregates all ranks per player in league
+    order. Ties in points and survived days are broken by the player ID.
+
+    Returns:
+        Select: Statement with player_id, points, survived and position
+    """
+    points = func.sum(Rank.points).label("points")
+    survived = func.sum(Rank.survived).label("survived")
+    position = (
+        func.row_number()  # pylint: disable=not-callable
+        .over(order_by=[desc(points), desc(survived), GamePlayerAssociation.player_id])
+        .label("position")
+    )
+    return (
+        select(GamePlayerAssociation.player_id, points, survived, position)
+        .join(GamePlayerAssociation, Rank.game_player_association_id == GamePlayerAssociation.id)
+        .group_by(GamePlayerAssociation.player_id)
+        .order_by(desc(points), desc(survived), GamePlayerAssociation.player_id)
+    )
+
+
+def diff_league(current: list[tuple], standings: list[tuple]) -> list[LeagueChange]:
+    """
+    Function to compare the stored league table with recalculated standings.
+
+    Args:
+        current (list[tuple]): player_id, points and survived of the stored table in order
+        standings (list[tuple]): player_id, points and survived of the standings in order
+
+    Returns:
+        list[LeagueChange]: All players with a different position, points or survived days
+    """
+    old = {row[0]: (pos, row[1], row[2]) for pos, row in enumerate(current, start=1)}
+    new = {row[0]: (pos, row[1], row[2]) for pos, row in enumerate(standings, start=1)}
+    changes = []
+    for player_id in sorted(old.keys() | new.keys()):
+        old_values = old.get(player_id, (None, None, None))
+        new_values = new.get(player_id, (None, None, None))
+        if old_values != new_values:
+            changes.append(
+                LeagueChange(
+                    player_id,
+                    old_values[0],
+                    new_values[0],
+                    old_values[1],
+                    new_values[1],
+                    old_values[2],
+                    new_values[2],
+                )
+            )
+    return changes
+
+
+async def rebuild_league_table(
+    config: Configuration, dry_run: bool = False
+) -> list[LeagueChange]:
     """
-    Function to create a new league table based on the sorted players. First the old
-    league table is deleted and then the new one is created based on the sorted players
-    with their points and survived games.
+    Function to rebuild the league table from all ranks in one transaction with a
+    single INSERT ... SELECT ... GROUP BY. The position of each player is calculated
+    in the same statement.
 
     Args:
         config (Configuration): App configuration
-        sorted_players (list[tuple]): Sorted list of players with their points and survived games
+        dry_run (bool, optional): Only calculate the differences without writing.
+        Defaults to False.
+
+    Returns:
+        list[LeagueChange]: Differences between the old and the new league table
     """
-    async with config.db.write_lock:
+    async with config.db.locks.acquire(("league",)):
         async with config.db.session() as session:
             async with session.begin():
-                await session.execute(delete(League))
-                for player_id, value in sorted_players:
-                    player = await get_player(config, player_id)
-                    session.add(
-                        League(
-                            player=player,
-                            points=value["total_points"],
-                            survived=value["total_survived"],
+                current = (
+                    await session.execute(
+                        select(League.player_id, League.points, League.survived).order_by(
+                            League.position
+                        )
+                    )
+                ).all()
+                standings = (await session.execute(league_standings_statement())).all()
+                changes = diff_league(current, standings)
+                if not dry_run:
+                    await session.execute(delete(League))
+                    await session.execute(
+                        insert(League).from_select(
+                            ["player_id", "points", "survived", "position"],
+                            league_standings_statement(),
                         )
                     )
-                    config.watcher.logger.debug(
-                        f"Player: {player.name}, Points: {value['total_points']}, "
-                        f"Survived: {value['total_survived']}"
+    if not dry_run:
+        game_stats_cache.invalidate()
+    for change in changes:
+        config.watcher.logger.debug(f"League change: {change}")
+    config.watcher.logger.info(
+        f"League table {'checked' if dry_run else 'generated'} "
+        f"with {len(standings)} players and {len(changes)} changes"
+    )
+    return changes
+
+
+def sort_league(entries: list[tuple]) -> list[tuple]:
+    """
+    Function to sort league entries with the same order as the league rebuild.
+
+    Args:
+        entries (list[tuple]): player_id, points and survived for each player
+
+    Returns:
+        list[tuple]: Entries in league order
+    """
+    return sorted(entries, key=lambda x: (-x[1], -x[2], x[0]))
+
+
+async def apply_ranks_to_league(session: AsyncSession, ranks: list[Rank]) -> int:
+    """
+    Function to insert the ranks in the given transaction and adjust the league table
+    incrementally. Only the totals of the affected players are adjusted and the
+    positions are sorted again. Only entries with a changed total or position are
+    written.
+
+    Args:
+        session (AsyncSession): Session with an open transaction
+        ranks (list[Rank]): New ranks with game player association IDs
+
+    Returns:
+        int: Number of affected players
+    """
+    session.add_all(ranks)
+    await session.flush()
+    association_players = dict(
+        (
+            await session.execute(
+                select(GamePlayerAssociation.id, GamePlayerAssociation.player_id).where(
+                    GamePlayerAssociation.id.in_(
+                        {rank.game_player_association_id for rank in ranks}
                     )
-    config.watcher.logger.info("League table generated")
+                )
+            )
+        ).all()
+    )
+    league = {
+        entry.player_id: entry
+        for entry in (await session.execute(select(League))).scalars()
+    }
+    for rank in ranks:
+        player_id = association_players[rank.game_player_association_id]
+        if player_id not in league:
+            league[player_id] = League(player_id=player_id, points=0, survived=0)
+            session.add(league[player_id])
+        league[player_id].points += rank.points
+        league[player_id].survived += rank.survived
+    entries = sort_league(
+        [(entry.player_id, entry.points, entry.survived) for entry in league.values()]
+    )
+    for position, (player_id, _, _) in enumerate(entries, start=1):
+        league[player_id].position = position
+    return len(set(association_players.values()))
+
+
+async def add_ranks_to_league(config: Configuration, ranks: list[Rank]) -> None:
+    """
+    Function to insert the ranks of finished games and maintain the league table
+    incrementally, all in one transaction.
+
+    Args:
+        config (Configuration): App configuration
+        ranks (list[Rank]): New ranks with game player association IDs
+    """
+    async with config.db.locks.acquire(("league",)):
+        async with config.db.session() as session:
+            async with session.begin():
+                players = await apply_ranks_to_league(session, ranks)
+    game_stats_cache.invalidate()
+    config.watcher.logger.info(
+        f"League table updated with {len(ranks)} ranks for {players} players"
+    )
+
+
+async def finish_games(
+    config: Configuration, games: list[Game], ranks: list[Rank]
+) -> bool:
+    """
+    Function to finish several evaluated games at once. The ranks of all games are
+    inserted, the league table is updated a single time and the games are set to
+    FINISHED, all in one transaction.
+
+    Args:
+        config (Configuration): App configuration
+        games (list[Game]): Evaluated games
+        ranks (list[Rank]): Ranks of all players of the games
+
+    Returns:
+        bool: True if the games are finished, False if the transaction failed
+    """
+    game_ids = [game.id for game in games]
+    try:
+        async with config.db.locks.acquire(
+            ("league",), *(("game", game_id) for game_id in game_ids)
+        ):
+            async with config.db.session() as session:
+                async with session.begin():
+                    players = await apply_ranks_to_league(session, ranks)
+                    await session.execute(
+                        update(Game)
+                        .where(Game.id.in_(game_ids))
+                        .values(status=GameStatus.FINISHED)
+                    )
+    except (
+        DBAPIError,
+        InvalidRequestError,
+        StatementError,
+        IntegrityError,
+        OperationalError,
+        asyncio.TimeoutError,
+    ) as err:
+        config.watcher.logger.error(
+            f"Error finishing the games {game_ids}: {str(err)}", exc_info=True
+        )
+        return False
+    game_stats_cache.invalidate()
+    for game in games:
+        game.status = GameStatus.FINISHED
+        active_games.update(game)
+    config.watcher.logger.info(
+        f"Games {game_ids} finished with {len(ranks)} ranks for {players} players"
+    )
+    return True
+
+
+async def check_league_consistency(config: Configuration) -> list[LeagueChange]:
+    """
+    Function to compare the incrementally maintained league table with a full
+    recalculation from all ranks. If there are differences, the table is rebuilt.
+
+    Args:
+        config (Configuration): App configuration
+
+    Returns:
+        list[LeagueChange]: Differences found before the repair
+    """
+    changes = await rebuild_league_table(config, dry_run=True)
+    if changes:
+        config.watcher.logger.warning(
+            f"League table has {len(changes)} differences to the ranks and is repaired"
+        )
+        await rebuild_league_table(config)
+    return changes
+
+
+async def load_game_stats(config: Configuration) -> StatsSnapshot:
+    """
+    Function to get the inputs for the player rank calculation. The snapshot is
+    loaded in one transaction if it was invalidated, otherwise the cached snapshot is
+    returned without a query.
+
+    Args:
+        config (Configuration): App configuration
+
+    Returns:
+        StatsSnapshot: League positions, number of participants and max hours
+    """
+    if game_stats_cache.valid:
+        return game_stats_cache.snapshot
+    generation = game_stats_cache.generation
+    async with config.db.session() as session:
+        async with session.begin():
+            positions = dict(
+                (await session.execute(select(League.player_id, League.position))).all()
+            )
+            max_hours = (await session.execute(select(func.max(Player.hours)))).scalar()
+    snapshot = StatsSnapshot(positions, len(positions), max_hours or 0)
+    game_stats_cache.store(snapshot, generation)
+    config.watcher.logger.debug(
+        f"Game stats loaded with {snapshot.count_league_participants} "
+        f"league participants and max hours {snapshot.max_hours}"
+    )
+    return snapshot
 
 
 async def get_all_game_days(config: Configuration) -> int:
@@ -994,12 +1476,35 @@ async def get_all_game_days(config: Configuration) -> int:
             return total_days.scalar() or 0
 
 
-async def sync_db(engine: AsyncEngine):
+async def check_db_settings(config: Configuration) -> dict[str, str | int]:
     """
-    Function to run the sync command and create all DB dependencies and tables
+    Function to read the effective SQLite settings of a pooled connection and log them.
+    A warning is logged for every setting that differs from the configured profile.
 
     Args:
-        engine (AsyncEngine): The engine to run the sync command
-    """
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        config (Configuration): App configuration
+
+    Returns:
+        dict[str, str | int]: Effective value for each configured pragma
+    """
+    synchronous_levels = ["OFF", "NORMAL", "FULL", "EXTRA"]
+    temp_store_levels = ["DEFAULT", "FILE", "MEMORY"]
+    effective = {}
+    async with config.db.engine.connect() as conn:
+        for name in config.db.pragmas:
+            effective[name] = (
+                await conn.exec_driver_sql(f"PRAGMA {name}")
+            ).scalar_one_or_none()
+    effective["journal_mode"] = str(effective["journal_mode"]).upper()
+    effective["synchronous"] = synchronous_levels[effective["synchronous"]]
+    effective["temp_store"] = temp_store_levels[effective["temp_store"]]
+    config.watcher.logger.info(
+        "Effective database settings: "
+        + ", ".join(f"{name}={value}" for name, value in effective.items())
+    )
+    for name, value in config.db.pragmas.items():
+        if effective[name] != value:
+            config.watcher.logger.warning(
+                f"Database setting {name} is {effective[name]} instead of {value}"
+            )
+    return effective
@@ -5,10 +5,11 @@ The bot is implemented using the discord.py library and provides a simple comman
 
 import discord
 from discord.ext import commands, tasks
-from .game_setup import setup_game, evaluate_game
-from .file_utils import import_tasks, export_tasks
+from .game_setup import setup_game, evaluate_game, evaluate_stopped_games, enter_game_results
+from .file_utils import import_tasks, export_tasks, export_writers
 from .game_1 import practice_game1, game1
 from .game import show_league_table
+from .db import check_league_consistency
 from .reaction_tracker import schedule_reaction_tracker_add, schedule_reaction_tracker_remove
 
 
@@ -66,6 +67,11 @@ class DiscordBot:
         )
         self.config.watcher.logger.info("start reaction tracker")
         self.reaction_tracker.start()
+        self.lock_statistics.start()
+        self.league_consistency.change_interval(
+            minutes=self.config.db.league_check_minutes
+        )
+        self.league_consistency.start()
 
     def register_commands(self):
         """
@@ -79,6 +85,17 @@ class DiscordBot:
         async def wrapped_evaluate_game(interaction: discord.Interaction):
             await evaluate_game(interaction, self.config)
 
+        async def wrapped_enter_game_results(interaction: discord.Interaction):
+            await enter_game_results(interaction, self.config)
+
+        @discord.app_commands.describe(
+            game_ids="Comma separated game IDs, all stopped games if empty"
+        )
+        async def wrapped_evaluate_stopped_games(
+            interaction: discord.Interaction, game_ids: str = ""
+        ):
+            await evaluate_stopped_games(interaction, self.config, game_ids)
+
         async def wrapped_practice_game1_command(interaction: discord.Interaction):
             await practice_game1(interaction, self.config)
 
@@ -91,8 +108,18 @@ class DiscordBot:
         async def wrapped_import_tasks(interaction: discord.Interaction):
             await import_tasks(interaction, self.config)
 
-        async def wrapped_export_tasks(interaction: discord.Interaction):
-            await export_tasks(interaction, self.config)
+        @discord.app_commands.describe(file_format="Format of the exported file")
+        @discord.app_commands.choices(
+            file_format=[
+                discord.app_commands.Choice(name=file_format, value=file_format)
+                for file_format in export_writers
+            ]
+        )
+        async def wrapped_export_tasks(
+            interaction: discord.Interaction,
+            file_format: str = "xlsx",
+        ):
+            await export_tasks(interaction, self.config, file_format)
 
         self.bot.tree.command(
             name="fast_and_hungry_task_hunt",
@@ -109,6 +136,18 @@ class DiscordBot:
             ),
         )(wrapped_evaluate_game)
 
+        self.bot.tree.command(
+            name="enter_game_results",
+            description="Enter the player results of a stopped game without finishing it.",
+        )(wrapped_enter_game_results)
+
+        self.bot.tree.command(
+            name="evaluate_stopped_games",
+            description=(
+                "Evaluate all stopped games with entered results at once and update the league."
+            ),
+        )(wrapped_evaluate_stopped_games)
+
         self.bot.tree.command(
             name="prac_fast_and_hungry_task_hunt",
             description=(
@@ -134,7 +173,7 @@ class DiscordBot:
 
         self.bot.tree.command(
             name="export_tasks",
-            description="Export current tasks from database to an Excel spreadsheet.",
+            description="Export current tasks from database to an Excel, CSV or Parquet file.",
         )(wrapped_export_tasks)
 
     @tasks.loop(seconds=10)
@@ -145,6 +184,21 @@ class DiscordBot:
         # await schedule_reaction_tracker(self.bot, self.config)
 
 
+    @tasks.loop(minutes=10)
+    async def lock_statistics(self):
+        """
+        Task to log the contention metrics of the database locks.
+        """
+        self.config.db.locks.log_contention(self.config.watcher.logger)
+
+    @tasks.loop(minutes=60)
+    async def league_consistency(self):
+        """
+        Task to compare the incrementally maintained league table with a full
+        recalculation and repair differences.
+        """
+        await check_league_consistency(self.config)
+
     @reaction_tracker.before_loop
     async def init_reaction_tracker(self):
         """
@@ -0,0 +1,85 @@
+"""
+Shared worker pool for blocking file and CPU work like reading and writing
+spreadsheets. The work runs outside of the event loop, so that the Discord gateway
+and the reaction events are not blocked while a large file is processed.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+from .configuration import Configuration
+
+
+class ExecutorService:
+    """
+    Thread or process pool for blocking jobs. With a process pool the functions and
+    arguments must be picklable, so only module level functions are submitted.
+    """
+
+    def __init__(self):
+        self.config: Configuration = None
+        self._executor: Executor = None
+
+    @property
+    def running(self) -> bool:
+        """
+        Status of the worker pool
+
+        Returns:
+            bool: True if the worker pool is started
+        """
+        return self._executor is not None
+
+    def start(self, config: Configuration) -> None:
+        """
+        Function to start the worker pool with the configured kind and size.
+
+        Args:
+            config (Configuration): App configuration
+        """
+        if self.running:
+            return
+        self.config = config
+        if config.executor.kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=config.executor.max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=config.executor.max_workers, thread_name_prefix="tt_worker"
+            )
+        config.watcher.logger.info(
+            f"Executor started with {config.executor.max_workers} "
+            f"{config.executor.kind} workers"
+        )
+
+    def stop(self) -> None:
+        """
+        Function to wait for all running jobs and stop the worker pool.
+        """
+        if not self.running:
+            return
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self.config.watcher.logger.info("Executor stopped")
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Function to run a blocking function in the worker pool and wait for the result.
+        If the pool is not started, the function runs in the default thread pool.
+
+        Args:
+            func (Callable): Blocking function
+            args: Positional arguments of the function
+            kwargs: Keyword arguments of the function
+
+        Returns:
+            Any: Result of the function
+        """
+        if not self.running:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+
+executor_service = ExecutorService()
@@ -3,126 +3,407 @@
 Here are all the functions needed to import and synchronize important game
 information from the game master.
 """
+import csv
+import hashlib
 import os
+import time
 from pathlib import Path
 import traceback
 from datetime import datetime
+from typing import Iterator
 import discord
 import pandas as pd
+from openpyxl import Workbook
 from pandas.errors import EmptyDataError, ParserError
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.engine import make_url
 from sqlalchemy.future import select
 from .configuration import Configuration
-from .db import Task
+from .db import Task, TaskImport
+from .executor import executor_service
+from .task_pool import task_pool
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
 
 positive_args = ("y", "yes", "1", "true", "j", "ja")
 
 
-async def check_rows(config: Configuration, row: pd.core.series.Series):
+TASK_COLUMNS = [
+    "name",
+    "active",
+    "once",
+    "rating",
+    "description",
+    "language",
+    "game",
+    "type",
+]
+
+
+def is_type(column: pd.Series, value_type: type) -> pd.Series:
+    """
+    Function to check the type of every value in a column.
+
+    Args:
+        column (pd.Series): Column of the task table
+        value_type (type): Expected type of the values
+
+    Returns:
+        pd.Series: Mask with True for every value of the expected type
+    """
+    return column.map(type).eq(value_type)
+
+
+def check_rows(df: pd.DataFrame) -> pd.Series:
     """
-    function checks whether all contents of the columns are filled with
+    Function checks for all rows whether all contents of the columns are filled with
     the correct type. If the required information is empty, the row cannot be read in.
 
+    Args:
+        df (pd.DataFrame): Task table with all columns
+
+    Returns:
+        pd.Series: Mask with True for every valid row
+    """
+    game = pd.to_numeric(df["game"], errors="coerce")
+    return (
+        is_type(df["name"], str)
+        & is_type(df["type"], str)
+        & is_type(df["description"], str)
+        & is_type(df["active"], str)
+        & is_type(df["once"], str)
+        & game.notna()
+        & game.eq(game.round())
+        & pd.to_numeric(df["rating"], errors="coerce").notna()
+    )
+
+
+def normalize_tasks(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Function to convert the valid rows of the task table into the database format.
+    For tasks with the same name the last row is used.
+
+    Args:
+        df (pd.DataFrame): Valid rows of the task table
+
+    Returns:
+        pd.DataFrame: Tasks with the columns of the database, indexed by the row number
+    """
+    tasks = pd.DataFrame(index=df.index)
+    tasks["name"] = df["name"]
+    tasks["active"] = df["active"].astype(str).str.lower().isin(positive_args)
+    tasks["once"] = df["once"].astype(str).str.lower().isin(positive_args)
+    tasks["rating"] = pd.to_numeric(df["rating"])
+    tasks["description"] = df["description"]
+    tasks["language"] = df["language"].where(df["language"].notna(), None)
+    tasks["game"] = pd.to_numeric(df["game"]).astype(int)
+    tasks["type"] = df["type"]
+    tasks = tasks.drop_duplicates("name", keep="last")
+    tasks["fingerprint"] = task_fingerprints(tasks)
+    return tasks
+
+
+def task_fingerprints(tasks: pd.DataFrame) -> pd.Series:
+    """
+    Function to calculate the content fingerprint of every task. All columns except
+    the name are converted into a canonical text, so that equal content always has
+    the same fingerprint.
+
+    Args:
+        tasks (pd.DataFrame): Normalized tasks
+
+    Returns:
+        pd.Series: Fingerprint as hex string per task
+    """
+    content = (
+        tasks["active"].astype(int).astype(str)
+        + "\x1f"
+        + tasks["once"].astype(int).astype(str)
+        + "\x1f"
+        + tasks["rating"].astype(float).map(repr)
+        + "\x1f"
+        + tasks["description"]
+        + "\x1f"
+        + tasks["language"].fillna("").astype(str)
+        + "\x1f"
+        + tasks["game"].astype(str)
+        + "\x1f"
+        + tasks["type"]
+    )
+    return content.map(
+        lambda x: hashlib.blake2b(x.encode("utf-8"), digest_size=16).hexdigest()
+    )
+
+
+def file_hash(path: str) -> str:
+    """
+    Function to calculate the hash of a file. Runs in the worker pool.
+
+    Args:
+        path (str): Path of the file
+
+    Returns:
+        str: SHA-256 hash as hex string
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def get_last_import_hash(config: Configuration) -> str | None:
+    """
+    Function to get the file hash of the last successful import.
+
     Args:
         config (Configuration): App configuration
-        row (pd.core.series.Series): Row with information
+
+    Returns:
+        str | None: File hash or None if there was no import yet
     """
-    try:
+    async with config.db.session() as session:
         return (
-            isinstance(row["name"], str)
-            and isinstance(row["game"], int)
-            and isinstance(row["type"], str)
-            and isinstance(row["description"], str)
-            and isinstance(row["active"], str)
-            and isinstance(row["once"], str)
-        )
-    except (KeyError, TypeError) as err:
-        config.watcher.logger.error(f"Validation error: {err}")
+            await session.execute(
+                select(TaskImport.file_hash).order_by(TaskImport.id.desc()).limit(1)
+            )
+        ).scalar_one_or_none()
 
 
-async def check_updated(config: Configuration, row: pd.core.series.Series):
+async def get_existing_tasks(config: Configuration) -> pd.DataFrame:
     """
-    This this function checks whether the entry already exists for a task.
-    The name of the task is used for this check. If an entry with the same
-    name already exists, it is overwritten with the new information. If it
-    does not yet exist in the database, it is created.
+    Function to load the name and fingerprint of all tasks from the database with
+    one query.
 
     Args:
         config (Configuration): App configuration
-        row (pd.core.series.Series): Row with information
+
+    Returns:
+        pd.DataFrame: Existing tasks with ID, name and fingerprint
     """
     async with config.db.session() as session:
-        async with session.begin():
-            task = (
-                (await session.execute(select(Task).filter(Task.name == row["name"])))
-                .scalars()
-                .first()
-            )
-            if task is not None:
-                task.name = "test"
-                task.name = row["name"]
-                task.active = (row["active"]).lower() in positive_args
-                task.once = (row["once"]).lower() in positive_args
-                task.rating = row["rating"]
-                task.description = row["description"]
-                task.language = row["language"]
-                task.game = row["game"]
-                task.type = row["type"]
-    if task is None:
-        return False
-    return True
+        rows = (
+            await session.execute(select(Task.id, Task.name, Task.fingerprint))
+        ).all()
+    return pd.DataFrame(rows, columns=["id", "name", "fingerprint"])
+
+
+def check_updated(
+    tasks: pd.DataFrame, existing: pd.DataFrame
+) -> tuple[pd.DataFrame, pd.DataFrame, int]:
+    """
+    This function splits the tasks into new tasks and existing tasks with changes.
+    The name of the task is used to find an existing entry and the fingerprint
+    to detect a change. Existing tasks without any change are dropped.
+
+    Args:
+        tasks (pd.DataFrame): Normalized tasks with fingerprint from the task table
+        existing (pd.DataFrame): Existing tasks from the database
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame, int]: New tasks, changed tasks with their ID
+            and the number of unchanged tasks
+    """
+    merged = tasks.reset_index().merge(
+        existing, on="name", how="left", suffixes=("", "_db")
+    )
+    merged = merged.set_index("index")
+    is_new = merged["id"].isna()
+    changed = merged["fingerprint"].ne(merged["fingerprint_db"])
+    columns = TASK_COLUMNS + ["fingerprint"]
+    return (
+        merged.loc[is_new, columns],
+        merged.loc[~is_new & changed, ["id"] + columns].astype({"id": int}),
+        int((~is_new & ~changed).sum()),
+    )
+
+
+def to_records(df: pd.DataFrame) -> list[dict]:
+    """
+    Function to convert a task table into parameters for a bulk statement.
+
+    Args:
+        df (pd.DataFrame): Task table
+
+    Returns:
+        list[dict]: One dictionary with Python values per row
+    """
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+async def write_tasks(
+    config: Configuration,
+    new_tasks: pd.DataFrame,
+    changed_tasks: pd.DataFrame,
+    task_import: TaskImport,
+) -> None:
+    """
+    Function to insert all new tasks, update all changed tasks and store the import
+    in one transaction.
+
+    Args:
+        config (Configuration): App configuration
+        new_tasks (pd.DataFrame): Tasks to insert
+        changed_tasks (pd.DataFrame): Tasks to update with their ID
+        task_import (TaskImport): File hash and result of the import
+    """
+    async with config.db.locks.acquire(("tasks",)):
+        async with config.db.session() as session:
+            async with session.begin():
+                if not new_tasks.empty:
+                    await session.execute(insert(Task.__table__), to_records(new_tasks))
+                if not changed_tasks.empty:
+                    await session.execute(update(Task), to_records(changed_tasks))
+                session.add(task_import)
+
+
+def read_tasks(path: str) -> tuple[pd.DataFrame, list[int]]:
+    """
+    Function to read and validate the task table. Runs in the worker pool.
+
+    Args:
+        path (str): Path of the task table
+
+    Returns:
+        tuple[pd.DataFrame, list[int]]: Valid rows and the row numbers of invalid rows
+    """
+    df = pd.read_excel(path)
+    df = df.reindex(columns=df.columns.union(TASK_COLUMNS, sort=False))
+    df["rating"] = df["rating"].fillna(0)
+    valid = check_rows(df)
+    return df[valid], df.index[~valid].tolist()
+
+
+def compare_tasks(
+    valid_rows: pd.DataFrame, existing: pd.DataFrame
+) -> tuple[pd.DataFrame, pd.DataFrame, list[int], int]:
+    """
+    Function to compare the valid rows of the task table with the existing tasks.
+    Runs in the worker pool.
+
+    Args:
+        valid_rows (pd.DataFrame): Valid rows of the task table
+        existing (pd.DataFrame): Existing tasks from the database
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame, list[int], int]: New tasks, changed tasks, the
+            row numbers of all rows that update a task and the number of unchanged tasks
+    """
+    new_tasks, changed_tasks, unchanged = check_updated(
+        normalize_tasks(valid_rows), existing
+    )
+    updated_rows = valid_rows.index[
+        valid_rows["name"].isin(changed_tasks["name"])
+        | (
+            valid_rows["name"].isin(new_tasks["name"])
+            & valid_rows["name"].duplicated(keep="first")
+        )
+    ].tolist()
+    return new_tasks, changed_tasks, updated_rows, unchanged
+
+
+async def send_followup(
+    config: Configuration, interaction: discord.Interaction, message: str
+) -> None:
+    """
+    Function to send the result of a deferred command to the user.
+
+    Args:
+        config (Configuration): App configuration
+        interaction (discord.Interaction): Deferred interaction of the command
+        message (str): Result message
+    """
+    try:
+        await interaction.followup.send(message, ephemeral=True)
+    except discord.errors.HTTPException as err:
+        config.watcher.logger.error(f"Error sending the result of the command: {err}")
+
+
+async def import_task_file(config: Configuration, current_hash: str) -> str:
+    """
+    Function to read the task table, write only new and changed tasks and store
+    the import.
+
+    Args:
+        config (Configuration): App configuration
+        current_hash (str): Hash of the task file
+
+    Returns:
+        str: Result message for the user
+    """
+    valid_rows, failed_rows = await executor_service.run(
+        read_tasks, config.game.input_task_path
+    )
+    existing = await get_existing_tasks(config)
+    new_tasks, changed_tasks, updated_rows, unchanged = await executor_service.run(
+        compare_tasks, valid_rows, existing
+    )
+    await write_tasks(
+        config,
+        new_tasks,
+        changed_tasks,
+        TaskImport(
+            file_hash=current_hash,
+            path=str(config.game.input_task_path),
+            timestamp=datetime.now(),
+            inserted=len(new_tasks),
+            updated=len(changed_tasks),
+            unchanged=unchanged,
+            failed=len(failed_rows),
+        ),
+    )
+    message = (
+        f"{len(new_tasks)} inserted, {len(changed_tasks)} updated, "
+        f"{unchanged} unchanged."
+    )
+    if failed_rows:
+        message += (
+            " There was a problem with the following entries: "
+            f"{", ".join(str(x+2) for x in failed_rows)}. "
+            "Check types and follow the documentation."
+        )
+    if updated_rows:
+        message += (
+            " Entries are already in the database and updated: "
+            f"{", ".join(str(x+2) for x in updated_rows)}."
+        )
+    return message
 
 
 async def import_tasks(interaction: discord.Interaction, config: Configuration):
     """
     Scheduling function for importing new tasks in the datebase or updating existing.
+    The interaction is deferred and the file is processed in the worker pool, the
+    result is sent as follow-up. If the file is unchanged since the last import,
+    the database is not touched.
 
     Args:
         interaction (discord.Interaction): Interaction object to get the guild
         config (Configuration): App configuration
     """
+    message = "The import has failed. Please check the error log."
     try:
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        start = time.perf_counter()
         config.watcher.logger.debug("Reading tasks from file")
         config.watcher.logger.debug(f"File path: {config.game.input_task_path}")
         config.watcher.logger.debug(f"Working directory: {os.getcwd()}")
-        new_tasks = []
-        failed_rows = []
-        updated_rows = []
-        df = pd.read_excel(config.game.input_task_path)
-        df["rating"] = df["rating"].fillna(0)
-        for index, row in df.iterrows():
-            if not await check_rows(config, row):
-                failed_rows.append(index)
-                continue
-            if await check_updated(config, row):
-                updated_rows.append(index)
-                continue
-            temp_task = Task(
-                name=row["name"],
-                active=(row["active"]).lower() in positive_args,
-                once=(row["once"]).lower() in positive_args,
-                rating=row["rating"],
-                description=row["description"],
-                language=row["language"],
-                game=row["game"],
-                type=row["type"],
-            )
-            new_tasks.append(temp_task)
-            async with config.db.session() as session:
-                async with session.begin():
-                    session.add_all(new_tasks)
-        message = f"Reading completed, {len(new_tasks)} Tasks created."
-        if failed_rows:
-            message += (
-                " There was a problem with the following entries: "
-                f"{", ".join(str(x+2) for x in failed_rows)}. "
-                "Check types and follow the documentation."
-            )
-        if updated_rows:
-            message += (
-                " Entries are already in the database and updated: "
-                f"{", ".join(str(x+2) for x in updated_rows)}."
+        current_hash = await executor_service.run(
+            file_hash, config.game.input_task_path
+        )
+        if current_hash == await get_last_import_hash(config):
+            config.watcher.logger.info("Task file unchanged since the last import.")
+            message = "The file is unchanged since the last import, nothing to do."
+        else:
+            result = await import_task_file(config, current_hash)
+            message = (
+                f"Reading completed in {time.perf_counter() - start:.1f}s: {result}"
             )
-        await interaction.response.send_message(message, ephemeral=True)
 
     except (FileNotFoundError, PermissionError, OSError) as err:
         config.watcher.logger.error(f"Error accessing the file: {err}")
@@ -134,52 +415,197 @@ async def import_tasks(interaction: discord.Interaction, config: Configuration):
         config.watcher.logger.error(
                 f"Error during callback: {traceback.print_exception(err)}"
             )
+    finally:
+        task_pool.invalidate()
+    await send_followup(config, interaction, message)
+
+
+def export_row(task) -> list:
+    """
+    Function to convert a task row from the database into a row of the task table.
+
+    Args:
+        task (Row): Task row with the columns of the task table
+
+    Returns:
+        list: Values in the order of the task table columns
+    """
+    return [
+        task.name,
+        "yes" if task.active else "No",
+        "yes" if task.once else "No",
+        task.rating,
+        task.description,
+        task.language,
+        task.game,
+        task.type,
+    ]
+
+
+def write_csv(path: Path, partitions: Iterator[list]) -> int:
+    """
+    Function to write the task table as CSV file chunk by chunk.
+
+    Args:
+        path (Path): Path of the file
+        partitions (Iterator[list]): Chunks of task rows
+
+    Returns:
+        int: Number of written tasks
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(TASK_COLUMNS)
+        for partition in partitions:
+            writer.writerows(export_row(task) for task in partition)
+            count += len(partition)
+    return count
+
+
+def write_xlsx(path: Path, partitions: Iterator[list]) -> int:
+    """
+    Function to write the task table as Excel file with a write-only workbook, so that
+    the rows are not kept in memory.
+
+    Args:
+        path (Path): Path of the file
+        partitions (Iterator[list]): Chunks of task rows
+
+    Returns:
+        int: Number of written tasks
+    """
+    count = 0
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(TASK_COLUMNS)
+    for partition in partitions:
+        for task in partition:
+            sheet.append(export_row(task))
+        count += len(partition)
+    workbook.save(path)
+    return count
+
+
+def write_parquet(path: Path, partitions: Iterator[list]) -> int:
+    """
+    Function to write the task table as Parquet file with one row group per chunk.
+    Needs the optional package pyarrow.
+
+    Args:
+        path (Path): Path of the file
+        partitions (Iterator[list]): Chunks of task rows
+
+    Returns:
+        int: Number of written tasks
+    """
+    if pa is None:
+        raise ImportError("The Parquet export needs the package pyarrow.")
+    schema = pa.schema(
+        [
+            ("name", pa.string()),
+            ("active", pa.string()),
+            ("once", pa.string()),
+            ("rating", pa.float64()),
+            ("description", pa.string()),
+            ("language", pa.string()),
+            ("game", pa.int64()),
+            ("type", pa.string()),
+        ]
+    )
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for partition in partitions:
+            columns = list(zip(*(export_row(task) for task in partition)))
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            count += len(partition)
+    return count
+
+
+export_writers = {"xlsx": write_xlsx, "csv": write_csv}
+if pa is not None:
+    export_writers["parquet"] = write_parquet
+
+
+def export_task_file(db_url: str, path: Path, file_format: str, chunk_size: int) -> int:
+    """
+    Function to stream all tasks from the database into a file. The tasks are read
+    with a server-side cursor in chunks and every chunk is written before the next
+    one is read, so the memory usage does not grow with the number of tasks. Runs
+    in the worker pool with its own synchronous database connection.
+
+    Args:
+        db_url (str): Connection string of the database
+        path (Path): Path of the file
+        file_format (str): Format of the file: xlsx, csv or parquet
+        chunk_size (int): Number of tasks per chunk
+
+    Returns:
+        int: Number of exported tasks
+    """
+    engine = create_engine(make_url(db_url).set(drivername="sqlite"))
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(
+                select(*(getattr(Task, column) for column in TASK_COLUMNS)).order_by(
+                    Task.id
+                )
+            )
+            return export_writers[file_format](path, result.partitions())
+    finally:
+        engine.dispose()
 
-async def export_tasks(interaction: discord.Interaction, config: Configuration):
+
+async def export_tasks(
+    interaction: discord.Interaction, config: Configuration, file_format: str = "xlsx"
+):
     """
-    Scheduling function for exporting existing tasks from datebase.
+    Scheduling function for exporting existing tasks from datebase. The interaction is
+    deferred and the file is written in the worker pool, the result is sent as follow-up.
 
     Args:
         interaction (discord.Interaction): Interaction object to get the guild
         config (Configuration): App configuration
+        file_format (str, optional): Format of the file: xlsx, csv or parquet.
+            Defaults to "xlsx".
     """
     try:
+        await interaction.response.defer(ephemeral=True, thinking=True)
         config.watcher.logger.debug("Exporting tasks from file")
-        async with config.db.session() as session:
-            async with session.begin():
-                tasks = (await session.execute(select(Task))).scalars().all()
-        data = [
-            {
-                "name": task.name,
-                "active": "yes" if task.active else "No",
-                "once": "yes" if task.once else "No",
-                "rating": task.rating,
-                "description": task.description,
-                "language": task.language,
-                "game": task.game,
-                "type": task.type,
-            }
-            for task in tasks
-        ]
-        df = pd.DataFrame(data)
-        if df.empty:
-            config.watcher.logger.warning("No data available in Database but requested.")
-            await interaction.response.send_message(
-                "No data availbale in Database.", ephemeral=True
-            )
-            return
-        config.watcher.logger.trace("Data available in Database.")
+        start = time.perf_counter()
         date = datetime.now().strftime("%Y_%m_%d")
-        path_file = Path(os.getcwd()) / Path("files") / f"{date}_tasks.xlsx"
+        export_path = Path(config.game.export_task_path)
+        export_path.mkdir(parents=True, exist_ok=True)
+        path_file = export_path.resolve() / f"{date}_tasks.{file_format}"
         config.watcher.logger.debug(f"Export-Path: {path_file}")
-        df.to_excel(path_file, index=False)
-        config.watcher.logger.trace("Data saved to excel.")
-        await interaction.response.send_message(
-            f"Export is generated and saved: {path_file}.", ephemeral=True
+        count = await executor_service.run(
+            export_task_file,
+            config.db.db_url,
+            path_file,
+            file_format,
+            config.game.export_chunk_size,
         )
+        if count == 0:
+            path_file.unlink(missing_ok=True)
+            config.watcher.logger.warning("No data available in Database but requested.")
+            await send_followup(config, interaction, "No data availbale in Database.")
+            return
+        config.watcher.logger.trace(f"{count} tasks saved to {file_format}.")
+        await send_followup(
+            config,
+            interaction,
+            f"Export of {count} tasks is generated in {time.perf_counter() - start:.1f}s "
+            f"and saved: {path_file}.",
+        )
+    except ImportError as err:
+        config.watcher.logger.error(f"Missing package for export: {err}")
+        await send_followup(config, interaction, str(err))
     except discord.errors.Forbidden as err:
         config.watcher.logger.error(f"Error during callback with DC permissons: {err}")
     except Exception as err:
         config.watcher.logger.error(
                 f"Error during callback: {traceback.print_exception(err)}"
             )
+        await send_followup(
+            config, interaction, "The export has failed. Please check the error log."
+        )
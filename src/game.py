@@ -4,9 +4,8 @@ This file contains all logic for creating a game and managing the game state.
 
 import asyncio
 from datetime import datetime
-from collections import defaultdict
 from discord import Interaction, errors
-from sqlalchemy import func
+from sqlalchemy import insert
 from sqlalchemy.future import select
 from sqlalchemy.exc import (
     SQLAlchemyError,
@@ -21,12 +20,16 @@ from .db import (
     Quest,
     Task,
     Game,
-    GamePlayerAssociation,
     GameStatus,
     League,
-    Rank,
 )
-from .db import update_db_obj, schedule_new_league_table, get_all_game_days
+from .db import (
+    update_db_obj,
+    get_all_game_days,
+    load_game_stats,
+    active_games,
+)
+from .stats_cache import StatsSnapshot, player_ranks
 
 
 league_positions = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
@@ -46,35 +49,33 @@ class GameStats:
     def __init__(self):
         self.count_league_participants = 0
         self.max_hours = 0
+        self.positions = {}
 
     def __repr__(self):
         return f"Gamestats: {str(self.max_hours)}"
 
-    async def process_league_stats(self, config: Configuration):
+    async def process_league_stats(self, config: Configuration, players: list[Player]):
         """
-        Function to process the league statistics and calculate the number of participants
-        and the maximum hours played by a player.
+        Function to process the league statistics from the cached snapshot. These are the
+        number of participants, the maximum hours played by a player and the league
+        positions of the given players. The snapshot is only loaded after a change of
+        the league table or the player hours.
 
         Args:
             config (Configuration): App configuration
+            players (list[Player]): Players to get the league positions for
         """
         try:
-            async with config.db.session() as session:
-                async with session.begin():
-                    count_league_participants = (
-                        await session.execute(
-                            select(
-                                func.count()  # pylint: disable=not-callable
-                            ).select_from(League)
-                        )
-                    ).scalar_one_or_none()
-                    max_hours = (
-                        await session.execute(select(func.max(Player.hours)))
-                    ).scalar_one_or_none()
-                    if count_league_participants:
-                        self.count_league_participants = count_league_participants
-                    if max_hours:
-                        self.max_hours = max_hours
+            snapshot = await load_game_stats(config)
+            self.positions = {
+                player.id: snapshot.positions[player.id]
+                for player in players
+                if player.id in snapshot.positions
+            }
+            if snapshot.count_league_participants:
+                self.count_league_participants = snapshot.count_league_participants
+            if snapshot.max_hours:
+                self.max_hours = snapshot.max_hours
         except (
             SQLAlchemyError,
             DBAPIError,
@@ -101,23 +102,6 @@ class GameStats:
         return self.count_league_participants > 0 and self.max_hours > 0
 
 
-class GameConfig:
-    """
-    General GameConfig class to store the configuration for a game.
-    """
-
-    def __init__(self, name, game_emojis):
-        self.name: str = name
-        self.game_emojis: list = game_emojis
-
-
-game_configs = {
-    "Fast and hungry, task hunt": GameConfig(
-        name="Fast and hungry, task hunt", game_emojis=["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "🇭"]
-    )
-}
-
-
 async def failed_game(config: Configuration, game: Game) -> None:
     """
     Helper function to stop a game in case that a wrong input has been givin in selection menu
@@ -129,89 +113,65 @@ async def failed_game(config: Configuration, game: Game) -> None:
     """
     game.status = GameStatus.FAILURE
     await update_db_obj(config, game)
+    active_games.update(game)
     config.watcher.logger.info(
         f"Game with ID: {game.id} was set to failure because of an error."
     )
 
 
 async def create_quests(
-    config: Configuration, player: Player, game: Game, tasks: list[Task]
-) -> None:
+    config: Configuration,
+    game: Game,
+    association_ids: dict[int, int],
+    assignments: dict[int, list[Task]],
+) -> bool:
     """
-    Function to get the quests for a player based on the playing hours.
+    Function to create the quests of all players in a game. All quests are inserted
+    with one statement in one transaction.
 
     Args:
         config (Configuration): App configuration
-        player (Player): Player object to get quests for
+        game (Game): Game the quests belong to
+        association_ids (dict[int, int]): Game player association ID for each player ID
+        assignments (dict[int, list[Task]]): Ordered tasks for each player ID
+
+    Returns:
+        bool: True if all quests are created
     """
+    start_time = datetime.now()
+    quests = [
+        {
+            "start_time": start_time,
+            "status": "running",
+            "task_id": task.id,
+            "position": i,
+            "game_player_association_id": association_ids[player_id],
+        }
+        for player_id, tasks in assignments.items()
+        for i, task in enumerate(tasks, start=1)
+    ]
     try:
-        async with config.db.session() as session:
-            async with session.begin():
-                game_player_association = (
-                    await session.execute(
-                        select(GamePlayerAssociation).where(
-                            GamePlayerAssociation.game_id == game.id,
-                            GamePlayerAssociation.player_id == player.id,
-                        )
-                    )
-                ).scalar_one_or_none()
-
-                for i, task in enumerate(tasks, start=1):
-                    quest = Quest(
-                        start_time=datetime.now(),
-                        status="running",
-                        task_id=task.id,
-                        position=i,
-                        game_player_association_id=game_player_association.id,
-                    )
-                    session.add(quest)
+        async with config.db.locks.acquire(("game", game.id)):
+            async with config.db.session() as session:
+                async with session.begin():
+                    await session.execute(insert(Quest), quests)
+        config.watcher.logger.trace(
+            f"Created {len(quests)} quests for game with ID: {game.id}"
+        )
+        return True
     except (SQLAlchemyError, IntegrityError, OperationalError) as db_err:
         config.watcher.logger.error(
-            f"Database error while creating quests for player {player.name}: {db_err}"
+            f"Database error while creating quests for game with ID {game.id}: {db_err}"
         )
     except asyncio.CancelledError:
         config.watcher.logger.error(
-            f"Async operation was cancelled while creating quests for player {player.name}"
+            f"Async operation was cancelled while creating quests for game with ID {game.id}"
         )
-    except (AttributeError, TypeError, ValueError) as err:
+    except (KeyError, AttributeError, TypeError, ValueError) as err:
         config.watcher.logger.error(
-            f"Error creating quests for player {player.name}: {err}"
+            f"Error creating quests for game with ID {game.id}: {err}"
         )
-
-
-async def generate_league_table(config: Configuration) -> None:
-    """
-    Function to generate the league table for the players based ranks.
-
-    Args:
-        config (Configuration): App configuration
-    """
-    async with config.db.session() as session:
-        async with session.begin():
-            ranks = (
-                await session.execute(
-                    select(Rank, GamePlayerAssociation.player_id).join(
-                        GamePlayerAssociation,
-                        Rank.game_player_association_id == GamePlayerAssociation.id,
-                    )
-                )
-                # .all()
-            )
-
-    player_data = defaultdict(
-        lambda: {"ranks": [], "total_points": 0, "total_survived": 0}
-    )
-    for rank, player_id in ranks:
-        player_data[player_id]["ranks"].append(rank)
-        player_data[player_id]["total_points"] += rank.points
-        player_data[player_id]["total_survived"] += rank.survived
-
-    sorted_players = sorted(
-        player_data.items(),
-        key=lambda x: (x[1]["total_points"], x[1]["total_survived"]),
-        reverse=True,
-    )
-    await schedule_new_league_table(config, sorted_players)
+    return False
 
 
 async def show_league_table(interaction: Interaction, config: Configuration) -> None:
@@ -228,7 +188,7 @@ async def show_league_table(interaction: Interaction, config: Configuration) ->
                 league_table = (
                     (
                         await session.execute(
-                            select(League).order_by(League.points.desc())
+                            select(League).order_by(League.position)
                         )
                     )
                     .scalars()
@@ -262,74 +222,42 @@ async def show_league_table(interaction: Interaction, config: Configuration) ->
         await interaction.response.send_message("Error sending league table message.")
 
 
-async def get_player_rank(
-    config: Configuration, player: Player, prepr_game_stats: GameStats
-) -> int:
+def get_player_ranks(
+    config: Configuration, players: list[Player], prepr_game_stats: GameStats
+) -> dict[int, float]:
     """
-    Function calculate the rank of a player based on the playing hours and league position.
-    The rank is calculated based on the formula PLAYER_RANK_G1
+    Function calculate the rank of all players based on the playing hours and league
+    position with one vectorised calculation. The rank is calculated based on the
+    formula PLAYER_RANK_G1
 
     Args:
         config (Configuration): App configuration
-        player (Player): Player to calculate the rank
+        players (list[Player]): Players to calculate the rank
         prepr_game_stats (GameStats): Complete game statistics
 
     Returns:
-        int: Rank fore the player based on formula
+        dict[int, float]: Rank for each player ID based on formula
     """
-    config.watcher.logger.trace(
-        f"Entry into get_player_rank with player: {player.name}"
-    )
     try:
-        hours = int(player.hours)
-        league_position = 0
-        async with config.db.session() as session:
-            async with session.begin():
-                league_position_tbl = (
-                    await session.execute(
-                        select(League).filter(League.player_id == player.id)
-                    )
-                ).scalar_one_or_none()
-        if league_position_tbl:
-            league_position = league_position_tbl.id
-        if not await prepr_game_stats.rank_calculation_possible():
-            return 0.0
-
-        game_score = config.game.weighted_hours_g1 * (
-            hours / prepr_game_stats.max_hours
-        )
-        config.watcher.logger.trace(
-            f"{config.game.weighted_hours_g1} * ({hours} / "
-            f"{prepr_game_stats.max_hours}) = {game_score}"
-        )
-        if league_position < 1:
-            league_score = 0.0
-        else:
-            league_score = config.game.weighted_league_pos_g1 * (
-                1
-                - (
-                    (league_position - 1)
-                    / (prepr_game_stats.count_league_participants - 1)
-                )
-            )
-        config.watcher.logger.trace(
-            f"{config.game.weighted_league_pos_g1} * (1 - (({league_position} - 1) / "
-            f"({prepr_game_stats.count_league_participants} - 1)) = {league_score}"
+        ranks = player_ranks(
+            [int(player.hours or 0) for player in players],
+            [prepr_game_stats.positions.get(player.id, 0) for player in players],
+            StatsSnapshot(
+                prepr_game_stats.positions,
+                prepr_game_stats.count_league_participants,
+                prepr_game_stats.max_hours,
+            ),
+            config.game.weighted_hours_g1,
+            config.game.weighted_league_pos_g1,
         )
-        result = game_score + league_score
-        config.watcher.logger.trace(f"Game score: {game_score}")
-        config.watcher.logger.trace(f"League score: {league_score}")
-        config.watcher.logger.trace(f"Exit get_player_rank with scor: {result}")
-        return result
-    except TypeError as err:
-        config.watcher.logger.error(f"TypeError in get_player_rank: {err}")
+    except (TypeError, ValueError) as err:
+        config.watcher.logger.error(f"Error in get_player_ranks: {err}")
         config.watcher.logger.error(
-            f"hours: {hours} ({type(hours)}) "
-            f"max_hours: {prepr_game_stats.max_hours} ({type(prepr_game_stats.max_hours)}) "
-            f"and league_position: {league_position} ({type(league_position)}) "
-            f"and participants: {prepr_game_stats.count_league_participants} "
-            f"({type(prepr_game_stats.count_league_participants)})"
+            f"hours: {[player.hours for player in players]} "
+            f"max_hours: {prepr_game_stats.max_hours} "
+            f"and participants: {prepr_game_stats.count_league_participants}"
         )
-    except ValueError as err:
-        config.watcher.logger.error(f"ValueError in get_player_rank: {err}")
-        config.watcher.logger.error(f"Input hours: {hours} ({type(hours)})")
+        return {player.id: 0.0 for player in players}
+    for player, rank in zip(players, ranks):
+        config.watcher.logger.trace(f"Rank of player {player.name}: {rank}")
+    return {player.id: float(rank) for player, rank in zip(players, ranks)}
@@ -9,23 +9,23 @@ import discord
 from discord import Interaction, errors
 from discord.errors import DiscordException, NotFound, HTTPException, Forbidden
 from .game import MissingGameConfig, GameStats
+from .game_config import game_configs
 from .game import (
-    game_configs,
     failed_game,
-    get_player_rank,
+    get_player_ranks,
     create_quests,
-    generate_league_table,
 )
 from .configuration import Configuration
+from .scoring import ScoreWeights, score_games
+from .stats_cache import game_stats_cache
 from .db import (
     Player,
     Exercise,
     Game,
     Task,
-    ReactionStatus,
     Game1PlayerResult,
     Rank,
-    GameStatus,
+    active_games,
 )
 from .db import (
     get_random_tasks,
@@ -36,12 +36,11 @@ from .db import (
     get_game_from_id,
     get_tasks_based_on_rating_1,
     balanced_task_mix_random,
-    get_all_db_obj_from_id,
     get_all_game_x_player_from_message_id,
-    get_reaction,
-    get_game_player_association,
-    update_db_objs,
+    get_completed_tasks,
+    save_game_1_results,
     merging_calc_base_game_1,
+    finish_games,
 )
 
 game_positions = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣"]
@@ -265,6 +264,7 @@ class PlayerLevelInput(
                     self.input_valid = False
                     break
                 player.hours = mapping[player.name]
+            game_stats_cache.invalidate()
             if not self.input_valid:
                 await interaction.response.send_message(
                     "Please enter only numbers for the playing hours.",
@@ -347,13 +347,22 @@ async def game1(interaction: discord.Interaction, config: Configuration):
                 f"Selected players: {[player.name for player in user_view.player_list]}"
             )
             players = await process_player(config, user_view.player_list)
-            game = await create_game(config, "Fast and hungry, task hunt", players)
+            created_game = await create_game(
+                config, "Fast and hungry, task hunt", players
+            )
+            if created_game is None:
+                await interaction.followup.send(
+                    "The game could not be created. Please check the error log.",
+                    ephemeral=True,
+                )
+                return
+            game, association_ids = created_game
             main_task = await get_main_task(config)
             config.watcher.logger.trace(
                 f"Created game with ID: {game.id} and main task: {main_task.name}"
             )
             success = await initialize_game_1(
-                config, interaction, game, players, main_task
+                config, interaction, game, association_ids, players, main_task
             )
             config.watcher.logger.trace(f"Game initialization success: {success}")
             if not success:
@@ -391,6 +400,7 @@ async def game1(interaction: discord.Interaction, config: Configuration):
             game.message_id = message.id
             game.channel_id = message.channel.id
             await update_db_obj(config, game)
+            active_games.update(game)
     except MissingGameConfig as err:
         config.watcher.logger.error(
             f"Missing game configuration: {err}, game not started."
@@ -401,86 +411,189 @@ async def game1(interaction: discord.Interaction, config: Configuration):
         )
 
 
-async def initialize_game_1(
+async def fetch_members_game_1(
+    config: Configuration, guild: discord.Guild, players: list[Player]
+) -> dict[int, discord.Member]:
+    """
+    Function to fetch the guild members of all players concurrently. The number of
+    parallel requests is limited by the configured Discord concurrency.
+
+    Args:
+        config (Configuration): App configuration
+        guild (discord.Guild): Guild of the game
+        players (list[Player]): Players to fetch
+
+    Returns:
+        dict[int, discord.Member]: Member for each player ID that was found
+    """
+    semaphore = asyncio.Semaphore(config.game.dc_concurrency)
+
+    async def fetch(player: Player) -> discord.Member:
+        async with semaphore:
+            return await guild.fetch_member(player.dc_id)
+
+    results = await asyncio.gather(
+        *(fetch(player) for player in players), return_exceptions=True
+    )
+    members = {}
+    for player, result in zip(players, results):
+        if isinstance(result, BaseException) or result is None:
+            config.watcher.logger.error(
+                f"User {player.name} not found in the guild with dc_id: {player.dc_id}. "
+                f"Error: {result}"
+            )
+            continue
+        members[player.id] = result
+    return members
+
+
+async def assign_tasks_game_1(
+    config: Configuration, players: list[Player], main_task: Task
+) -> dict[int, list[Task]] | None:
+    """
+    Function to compute the tasks of all players before any message is sent. The
+    players are processed in a fixed order (most playing hours first, then Discord ID),
+    so the exclusion of tasks that can only be assigned once is deterministic.
+
+    Args:
+        config (Configuration): App configuration
+        players (list[Player]): Players of the game
+        main_task (Task): Main task for all player in game 1
+
+    Returns:
+        dict[int, list[Task]] | None: Tasks for each player ID or None if a player has no tasks
+    """
+    game_statistics = GameStats()
+    await game_statistics.process_league_stats(config, players)
+    config.watcher.logger.debug(game_statistics)
+    ordered_players = sorted(players, key=lambda x: (-int(x.hours), str(x.dc_id)))
+    player_ranks = get_player_ranks(config, ordered_players, game_statistics)
+    exclude_ids = set()
+    assignments = {}
+    for player in ordered_players:
+        player_rank = player_ranks[player.id]
+        rated_tasks = await get_tasks_based_on_rating_1(config, player_rank * 100)
+        if not rated_tasks:
+            config.watcher.logger.error(
+                f"No tasks found for player rating {player_rank}: {player.name}."
+            )
+            return None
+        tasks = await balanced_task_mix_random(config, rated_tasks, exclude_ids)
+        config.watcher.logger.debug(
+            f"Tasks for player {player.name}: {[task.name for task in tasks]}"
+        )
+        config.watcher.logger.debug(f"Exclude IDs: {exclude_ids}")
+        if not tasks:
+            config.watcher.logger.error(
+                f"No tasks found for player with Algo-Balanced: {player.name}."
+            )
+            return None
+        assignments[player.id] = tasks + [main_task]
+    return assignments
+
+
+async def send_quests_game_1(
+    config: Configuration,
+    game: Game,
+    members: dict[int, discord.Member],
+    assignments: dict[int, list[Task]],
+) -> list[int]:
+    """
+    Function to send the quests to all players concurrently. The number of parallel
+    messages is limited by the configured Discord concurrency, discord.py itself
+    waits for the rate limit buckets.
+
+    Args:
+        config (Configuration): App configuration
+        game (Game): Game of the quests
+        members (dict[int, discord.Member]): Member for each player ID
+        assignments (dict[int, list[Task]]): Tasks for each player ID
+
+    Returns:
+        list[int]: Player IDs whose message could not be sent
+    """
+    positions_game_1 = game_configs.get("Fast and hungry, task hunt", []).game_emojis
+    semaphore = asyncio.Semaphore(config.game.dc_concurrency)
+
+    async def send(member: discord.Member, tasks: list[Task]) -> None:
+        async with semaphore:
+            await member.send(
+                f"Hello {member.name}, you are now in the game "
+                f'"{game.name}". You have to complete the following quests:\n'
+                + "\n".join(
+                    f"{positions_game_1[i]} {task.name}: {task.description}"
+                    for i, task in enumerate(tasks)
+                )
+            )
+
+    player_ids = list(assignments)
+    results = await asyncio.gather(
+        *(send(members[player_id], assignments[player_id]) for player_id in player_ids),
+        return_exceptions=True,
+    )
+    failed = []
+    for player_id, result in zip(player_ids, results):
+        if isinstance(result, BaseException):
+            config.watcher.logger.error(
+                f"Error sending message to user {members[player_id].name} "
+                f"with dc_id: {members[player_id].id}. Error: {result}"
+            )
+            failed.append(player_id)
+    return failed
+
+
+async def initialize_game_1(  # pylint: disable=too-many-arguments, too-many-positional-arguments
     config: Configuration,
     interaction: Interaction,
     game: Game,
+    association_ids: dict[int, int],
     players: list[Player],
     main_task: Task,
 ) -> bool:
     """
     Function to initialize the game and send a message to all players with the
-    tasks they have to complete.
+    tasks they have to complete. First all members are fetched and all tasks are
+    assigned, then the messages are sent concurrently.
 
     Args:
         config (Configuration): App configuration
         interaction (Interaction): Interaction object to get the guild
         game (Game): Game object to get the game id
+        association_ids (dict[int, int]): Game player association ID for each player ID
         players (list[Player]): List of players to get the player ids and send messages with quests
         main_task (Task): Main task for all player in game 1
     """
     try:
-        game_statistics = GameStats()
-        await game_statistics.process_league_stats(config)
-        players.sort(key=lambda x: x.hours, reverse=True)
-        config.watcher.logger.debug(game_statistics)
-        exclude_ids = set()
-        exclude_lock = asyncio.Lock()  # pylint: disable=not-callable
-        for player in players:
-            dc_user = await interaction.guild.fetch_member(player.dc_id)
-            if dc_user is None:
-                config.logger.error(
-                    f"User {player.name} not found in the guild with dc_id: {player.dc_id}."
-                )
-                await failed_game(config, game)
-                break
-            player_rank = await get_player_rank(config, player, game_statistics)
-            rated_tasks = await get_tasks_based_on_rating_1(config, player_rank * 100)
-            if not rated_tasks:
-                config.watcher.logger.error(
-                    f"No tasks found for player rating {player_rank}: {player.name}."
-                )
-                await failed_game(config, game)
-                break
-            async with exclude_lock:
-                tasks = await balanced_task_mix_random(config, rated_tasks, exclude_ids)
-                config.watcher.logger.debug(
-                    f"Tasks for player {player.name}: {[task.name for task in tasks]}"
-                )
-                config.watcher.logger.debug(f"Exclude IDs: {exclude_ids}")
-            if not tasks:
-                config.watcher.logger.error(
-                    f"No tasks found for player with Algo-Balanced: {player.name}."
-                )
-                await failed_game(config, game)
-                break
-            tasks.append(main_task)
-            await create_quests(config, player, game, tasks)
-            positions_game_1 = game_configs.get(
-                "Fast and hungry, task hunt", []
-            ).game_emojis
-            if not positions_game_1:
-                raise MissingGameConfig(
-                    "No emojis found for game 'Fast and hungry, task hunt'."
-                )
-            await dc_user.send(
-                f"Hello {dc_user.name}, you are now in the game "
-                f'"{game.name}". You have to complete the following quests:\n'
-                + "\n".join(
-                    f"{positions_game_1[i]} {task.name}: {task.description}"
-                    for i, task in enumerate(tasks)
-                )
+        if not game_configs.get("Fast and hungry, task hunt", []).game_emojis:
+            raise MissingGameConfig(
+                "No emojis found for game 'Fast and hungry, task hunt'."
             )
-        else:
-            return True
-        return False
-    except errors.HTTPException as err:
-        config.watcher.logger.error(
-            f"Error sending message to user {player.name} with dc_id: {player.dc_id}. "
-            f"Error: {err}"
-        )
-        await failed_game(config, game)
-        return False
+        members = await fetch_members_game_1(config, interaction.guild, players)
+        missing = [player for player in players if player.id not in members]
+        if missing:
+            await interaction.followup.send(
+                "The following players could not be found on the server: "
+                + ", ".join(f"<@{player.dc_id}>" for player in missing),
+                ephemeral=True,
+            )
+        assignments = None
+        if not missing:
+            assignments = await assign_tasks_game_1(config, players, main_task)
+        if assignments is None or not await create_quests(
+            config, game, association_ids, assignments
+        ):
+            await failed_game(config, game)
+            return False
+        failed = await send_quests_game_1(config, game, members, assignments)
+        if failed:
+            await interaction.followup.send(
+                "The quests could not be sent to: "
+                + ", ".join(f"<@{members[player_id].id}>" for player_id in failed),
+                ephemeral=True,
+            )
+            await failed_game(config, game)
+            return False
+        return True
     except MissingGameConfig as err:
         config.watcher.logger.error(f"Missing game configuration: {err}")
         await failed_game(config, game)
@@ -489,18 +602,31 @@ async def initialize_game_1(
         config.watcher.logger.error(
             f"Discord related error occurred while initialize the game: {err}"
         )
+        await failed_game(config, game)
+        return False
 
 
 class PlayerGameDaysInput(discord.ui.Modal):
     """
-    PlayerGameDaysInput class to create a input menu with for the player game days
+    PlayerGameDaysInput class to create a input menu with for the player game days.
+    The association IDs and completed tasks are collected once before the evaluation.
     """
-    def __init__(self, config, player_list, game):
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        config: Configuration,
+        player_list: list[Player],
+        game: Game,
+        association_ids: dict[int, int],
+        completed_tasks: dict[str, list[str]],
+    ):
         super().__init__(title="Enter game days and player survival days")
         self.config = config
         self.player_list = player_list
         self.game = game
+        self.association_ids = association_ids
+        self.completed_tasks = completed_tasks
         self.input_valid = True
+        self.saved = False
         self.add_item(
             discord.ui.TextInput(label="Game days", default="70", max_length=3)
         )
@@ -546,25 +672,12 @@ class PlayerGameDaysInput(discord.ui.Modal):
                 if int(result[player.name]) > int(result["Game days"]):
                     self.input_valid = False
                     break
-                game_player_association = await get_game_player_association(
-                    self.config, self.game.id, player.id
-                )
-                reactions = await get_reaction(
-                    self.config,
-                    self.game.message_id,
-                    player.dc_id,
-                    ReactionStatus.REGISTERED,
-                )
-                if not reactions:
-                    comp_tasks = 0
-                else:
-                    comp_tasks = len(reactions)
                 player_result = Game1PlayerResult(
                     player_days=int(result[player.name]),
                     total_tasks=5,
-                    completed_tasks=comp_tasks,
+                    completed_tasks=len(self.completed_tasks.get(str(player.dc_id), [])),
                     survived=result[player.name + ": survived"],
-                    gameplayerassociation=game_player_association,
+                    game_player_association_id=self.association_ids[player.id],
                 )
                 player_results.append(player_result)
             if not self.input_valid:
@@ -578,10 +691,14 @@ class PlayerGameDaysInput(discord.ui.Modal):
                 )
                 return
             self.game.playing_days = int(result["Game days"])
-            await update_db_obj(self.config, self.game)
-            await update_db_objs(self.config, player_results)
+            self.saved = await save_game_1_results(self.config, self.game, player_results)
             await interaction.response.send_message(
-                "All inputs have been saved.", ephemeral=True
+                (
+                    "All inputs have been saved."
+                    if self.saved
+                    else "The inputs could not be saved. Please check the error log."
+                ),
+                ephemeral=True,
             )
         except (DiscordException) as err:
             self.config.watcher.logger.error(
@@ -594,11 +711,21 @@ class ModalButtonView(discord.ui.View):
     ModalButtonView class to create a view with a button to open the modal for
     entering the player game days and survival status.
     """
-    def __init__(self, config: Configuration, player_list: list[Player], game: Game):
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        config: Configuration,
+        player_list: list[Player],
+        game: Game,
+        association_ids: dict[int, int],
+        completed_tasks: dict[str, list[str]],
+    ):
         super().__init__(timeout=None)
         self.config = config
         self.player_list = player_list
         self.game = game
+        self.association_ids = association_ids
+        self.completed_tasks = completed_tasks
+        self.saved = False
 
     @discord.ui.button(label="Submission", style=discord.ButtonStyle.primary)
     async def open_modal(
@@ -610,123 +737,173 @@ class ModalButtonView(discord.ui.View):
         Function to open the modal for entering the player game days and survival status.
         This function is called when the button is clicked.
         """
-        game_input = PlayerGameDaysInput(self.config, self.player_list, self.game)
+        game_input = PlayerGameDaysInput(
+            self.config,
+            self.player_list,
+            self.game,
+            self.association_ids,
+            self.completed_tasks,
+        )
         await interaction.response.send_modal(game_input)
         await game_input.wait()
+        self.saved = game_input.saved
         self.stop()
 
 
-async def finish_game_1(
-    config: Configuration, game: Game, interaction: discord.Interaction
-): # pylint: disable=too-many-locals, too-many-statements
+def rank_results_game_1(
+    config: Configuration, results: list[Game1PlayerResult]
+) -> list[tuple[Game1PlayerResult, Rank]]:
     """
-    Function to finish the game and update the game status.
+    Function to rank the player results of one or more games with the configured
+    weights. Players with the same score in a game get the same placement, the first
+    placement gets 6 points and every following placement one point less.
 
     Args:
         config (Configuration): App configuration
-        game (Game): Game object to finish the game
+        results (list[Game1PlayerResult]): Results of all players of the games
+
+    Returns:
+        list[tuple[Game1PlayerResult, Rank]]: Results with their rank, sorted by game
+            and placement
     """
-    try:
-        player_scores = {}
-        game_x_player = await get_all_game_x_player_from_message_id(
-            config, game.message_id
+    game_scores = score_games(
+        [result.gameplayerassociation.game_id for result in results],
+        [result.completed_tasks for result in results],
+        [result.survived == "yes" for result in results],
+        [result.player_days for result in results],
+        ScoreWeights.from_config(config),
+    )
+    timestamp = datetime.now()
+    ranked = []
+    for index in game_scores.order:
+        result = results[index]
+        association = result.gameplayerassociation
+        config.watcher.logger.debug(
+            f"Player: {association.player.name}, Game: {association.game_id}, "
+            + f"Association ID: {association.id}, "
+            + f"Completed Tasks: {result.completed_tasks}, Survived: {result.survived}, "
+            + f"Player Days: {result.player_days}, Score: {game_scores.scores[index]}"
         )
-        player = await get_all_db_obj_from_id(
-            config,
-            Player,
-            [player.player_id for player in game_x_player.players],
+        ranked.append(
+            (
+                result,
+                Rank(
+                    placement=int(game_scores.placements[index]),
+                    points=int(game_scores.points[index]),
+                    timestamp=timestamp,
+                    game_player_association_id=result.game_player_association_id,
+                    survived=result.player_days,
+                ),
+            )
         )
+    return ranked
 
-        player_dc_ids = [int(player.dc_id) for player in player]
-        game_emojis = game_configs.get(game_x_player.name, []).game_emojis
-        config.watcher.logger.debug(f"Game: {game.id} with players: {player_dc_ids}")
-        config.watcher.logger.debug(f"Game emojis: {game_emojis}")
-        for player_id in player_dc_ids:
-            reactions = await get_reaction(
-                config, game.message_id, player_id, ReactionStatus.REGISTERED
-            )
-            config.watcher.logger.debug(
-                f"Reactions for DC_ID: {player_id}: {[reaction.id for reaction in reactions]}"
-            )
-        view = ModalButtonView(config, player, game)
-        await interaction.followup.send(
-            "The game is now evaluated using the key data of the game and the players.",
-            view=view,
-            ephemeral=True,
+
+def ranking_message_game_1(
+    game: Game, ranked: list[tuple[Game1PlayerResult, Rank]]
+) -> str:
+    """
+    Function to create the message with the player rankings of a finished game.
+
+    Args:
+        game (Game): Finished game
+        ranked (list[tuple[Game1PlayerResult, Rank]]): Results with their rank
+
+    Returns:
+        str: Ranking message
+    """
+    response_message = f"Player rankings in game (ID: {game.id}):\n"
+    for result, rank in ranked:
+        dc_name = f"<@{result.gameplayerassociation.player.dc_id}>"
+        survived_icon = ":olive:" if result.survived == "yes" else ":skull:"
+        response_message += (
+            f"{game_positions[rank.placement-1]} {dc_name:<20} {survived_icon} - "
+            + f"Points: {rank.points}, "
+            + f"Survived: {result.player_days} / {game.playing_days} days"
+            + "\n"
         )
-        await view.wait()
-        results = await merging_calc_base_game_1(config, [game.id])
+    response_message += (
+        "The league table has been recalculated with the new rankings. "
+        + "Thank you all for participating. We hope you enjoyed it and "
+        + "will join us again next season."
+    )
+    return response_message
 
-        for result in results:
-            score = 0
-            player = result.gameplayerassociation.player
-            game = result.gameplayerassociation.game
-            association_id = result.gameplayerassociation.id
-            config.watcher.logger.debug(
-                f"Processing Player ID: {player.id}, Game ID: {game.id}, "
-                + f"Association ID: {association_id}"
-            )
-            config.watcher.logger.debug(
-                f"Player: {player.name}, Game: {game.id}, "
-                + f"Completed Tasks: {result.completed_tasks}, Survived: {result.survived}, "
-                + f"Player Days: {result.player_days}"
-            )
-            value_tasks = result.completed_tasks * config.game.weighted_rank_task_g1
-            value_survived = (
-                1 if result.survived == "yes" else 0
-            ) * config.game.weighted_rank_surv_g1
-            value_days = result.player_days * config.game.weighted_rank_days_g1
-            score = value_tasks + value_survived + value_days
-            config.watcher.logger.debug(
-                f"Score: {score} - Tasks: {value_tasks}, Survived: {value_survived}, "
-                + f"Days: {value_days}"
-            )
-            config.watcher.logger.debug(f"Total Score for {player.name}: {score}")
-            player_scores[association_id] = (
-                player.name,
-                score,
-                result.player_days,
-                player.dc_id,
-                result.survived,
-            )
-        sorted_scores = sorted(
-            player_scores.items(), key=lambda x: x[1][1], reverse=True
+
+async def enter_results_game_1(
+    config: Configuration, game: Game, interaction: discord.Interaction
+) -> bool:
+    """
+    Function to enter the game days and the results of all players of a stopped game.
+    The completed tasks are taken from the reactions. The game stays stopped, so it
+    can be finished on its own or together with other games.
+
+    Args:
+        config (Configuration): App configuration
+        game (Game): Stopped game to enter the results for
+        interaction (discord.Interaction): Interaction object from Discord
+
+    Returns:
+        bool: True if the results are saved
+    """
+    game_x_player = await get_all_game_x_player_from_message_id(
+        config, game.message_id
+    )
+    completed_tasks = await get_completed_tasks(config, game.message_id)
+    if completed_tasks is None:
+        await interaction.followup.send(
+            "The reactions of the game could not be loaded.", ephemeral=True
         )
-        ranks = []
-        rank = 1
-        points = 6
-        last_score = 0
-        response_message = f"Player rankings in game (ID: {game.id}):\n"
-        for player in sorted_scores:
-            if player[1][1] < last_score:
-                rank += 1
-                points -= 1
-            temp = Rank(
-                placement=rank,
-                points=points,
-                timestamp=datetime.now(),
-                game_player_association_id=player[0],
-                survived=player[1][2],
+        return False
+    player = [association.player for association in game_x_player.players]
+    association_ids = {
+        association.player_id: association.id
+        for association in game_x_player.players
+    }
+    player_dc_ids = [int(player.dc_id) for player in player]
+    game_emojis = game_configs.get(game_x_player.name, []).game_emojis
+    config.watcher.logger.debug(f"Game: {game.id} with players: {player_dc_ids}")
+    config.watcher.logger.debug(f"Game emojis: {game_emojis}")
+    for player_id in player_dc_ids:
+        config.watcher.logger.debug(
+            f"Completed tasks for DC_ID: {player_id}: "
+            f"{completed_tasks.get(str(player_id), [])}"
+        )
+    view = ModalButtonView(config, player, game, association_ids, completed_tasks)
+    await interaction.followup.send(
+        "Enter the key data of the game and the players.",
+        view=view,
+        ephemeral=True,
+    )
+    await view.wait()
+    return view.saved
+
+
+async def finish_game_1(
+    config: Configuration, game: Game, interaction: discord.Interaction
+):
+    """
+    Function to enter the results of a stopped game and finish it right away.
+
+    Args:
+        config (Configuration): App configuration
+        game (Game): Game object to finish the game
+    """
+    try:
+        if not await enter_results_game_1(config, game, interaction):
+            await interaction.followup.send(
+                f"No results were saved, the game with ID: {game.id} stays stopped.",
+                ephemeral=True,
             )
-            last_score = player[1][1]
-            ranks.append(temp)
-            dc_name = f"<@{player[1][3]}>"
-            survived_icon = ":olive:" if player[1][4] == "yes" else ":skull:"
-            response_message += (
-                f"{game_positions[rank-1]} {dc_name:<20} {survived_icon} - Points: {points}, "
-                + f"Survived: {player[1][2]} / {game.playing_days} days"
-                + "\n"
+            return
+        results = await merging_calc_base_game_1(config, [game.id])
+        ranked = rank_results_game_1(config, results)
+        if not await finish_games(config, [game], [rank for _, rank in ranked]):
+            await interaction.followup.send(
+                f"The game with ID: {game.id} could not be finished.", ephemeral=True
             )
-        response_message += (
-            "The league table has been recalculated with the new rankings. "
-            + "Thank you all for participating. We hope you enjoyed it and "
-            + "will join us again next season."
-        )
-        await update_db_objs(config, ranks)
-        game.status = GameStatus.FINISHED
-        _ = await update_db_obj(config, game)
-        await generate_league_table(config)
-        await interaction.followup.send(response_message)
+            return
+        await interaction.followup.send(ranking_message_game_1(game, ranked))
 
     except (
         asyncio.TimeoutError,
@@ -739,3 +916,33 @@ async def finish_game_1(
         config.watcher.logger.error(
             f"An error occurred while finishing the game: {err}"
         )
+
+
+async def finish_games_1(config: Configuration, games: list[Game]) -> dict[int, str] | None:
+    """
+    Function to evaluate several stopped games at once. The results of all games are
+    loaded with one query and scored together, all ranks are written with a
+    single league update in one transaction. Games without entered player results
+    are skipped.
+
+    Args:
+        config (Configuration): App configuration
+        games (list[Game]): Stopped games to evaluate
+
+    Returns:
+        dict[int, str] | None: Ranking message for each finished game ID or None if
+            the games could not be finished
+    """
+    results = await merging_calc_base_game_1(config, [game.id for game in games])
+    ranked = {}
+    for result, rank in rank_results_game_1(config, results):
+        ranked.setdefault(result.gameplayerassociation.game_id, []).append(
+            (result, rank)
+        )
+    evaluated = [game for game in games if game.id in ranked]
+    if not evaluated:
+        return {}
+    ranks = [rank for game in evaluated for _, rank in ranked[game.id]]
+    if not await finish_games(config, evaluated, ranks):
+        return None
+    return {game.id: ranking_message_game_1(game, ranked[game.id]) for game in evaluated}
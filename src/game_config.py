@@ -0,0 +1,20 @@
+"""
+Static configuration of all available games like name and game emojis.
+"""
+
+
+class GameConfig:
+    """
+    General GameConfig class to store the configuration for a game.
+    """
+
+    def __init__(self, name, game_emojis):
+        self.name: str = name
+        self.game_emojis: list = game_emojis
+
+
+game_configs = {
+    "Fast and hungry, task hunt": GameConfig(
+        name="Fast and hungry, task hunt", game_emojis=["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "🇭"]
+    )
+}
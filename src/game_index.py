@@ -0,0 +1,133 @@
+"""
+Process-wide in-memory index of all games that are relevant for reaction tracking.
+The index maps the Discord message ID of a game message to the game state, so that
+the reaction hot path can decide without any database query whether a reaction
+belongs to a game.
+"""
+
+from dataclasses import dataclass, field
+from .game_config import game_configs
+
+
+@dataclass
+class GameIndexEntry:
+    """
+    Snapshot of a game with all information needed to classify a reaction.
+    """
+
+    game_id: int
+    name: str
+    status: object
+    emojis: frozenset[str] = field(default_factory=frozenset)
+    player_dc_ids: frozenset[int] = field(default_factory=frozenset)
+    message_id: int | None = None
+    channel_id: int | None = None
+
+
+class ActiveGameIndex:
+    """
+    Index of all games with their message ID, status, game emojis and players. The index
+    is loaded once at startup and then updated in place on every game state change.
+    """
+
+    def __init__(self, untracked_status: set):
+        self.untracked_status = frozenset(untracked_status)
+        self._games: dict[int, GameIndexEntry] = {}
+        self._messages: dict[int, GameIndexEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def clear(self) -> None:
+        """
+        Function to remove all games from the index.
+        """
+        self._games.clear()
+        self._messages.clear()
+
+    def register(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        game_id: int,
+        name: str,
+        status,
+        player_dc_ids: list[int],
+        message_id: int | None = None,
+        channel_id: int | None = None,
+    ) -> GameIndexEntry:
+        """
+        Function to add a game to the index or replace an existing entry.
+
+        Args:
+            game_id (int): Game ID from DB
+            name (str): Game name to determine the game emojis
+            status (GameStatus): Current status of the game
+            player_dc_ids (list[int]): Discord IDs of all players in the game
+            message_id (int | None, optional): Message ID of the game message. Defaults to None.
+            channel_id (int | None, optional): Channel ID of the game message. Defaults to None.
+
+        Returns:
+            GameIndexEntry: Registered entry
+        """
+        self.remove(game_id)
+        game_config = game_configs.get(name)
+        entry = GameIndexEntry(
+            game_id=game_id,
+            name=name,
+            status=status,
+            emojis=frozenset(game_config.game_emojis if game_config else []),
+            player_dc_ids=frozenset(int(dc_id) for dc_id in player_dc_ids),
+        )
+        self._games[game_id] = entry
+        self._set_message(entry, message_id, channel_id)
+        return entry
+
+    def update(self, game) -> None:
+        """
+        Function to take over status, message ID and channel ID of a changed game. Games
+        that reached an untracked status are removed from the index.
+
+        Args:
+            game (Game): Changed game object
+        """
+        entry = self._games.get(game.id)
+        if entry is None:
+            return
+        if game.status in self.untracked_status:
+            self.remove(game.id)
+            return
+        entry.status = game.status
+        self._set_message(entry, game.message_id, game.channel_id)
+
+    def remove(self, game_id: int) -> None:
+        """
+        Function to remove a game from the index.
+
+        Args:
+            game_id (int): Game ID from DB
+        """
+        entry = self._games.pop(game_id, None)
+        if entry is not None and entry.message_id is not None:
+            self._messages.pop(entry.message_id, None)
+
+    def lookup(self, message_id: int) -> GameIndexEntry | None:
+        """
+        Function to get the game for a message ID. Only games with a game message
+        in a channel are returned.
+
+        Args:
+            message_id (int): Message ID from the reaction event
+
+        Returns:
+            GameIndexEntry | None: Entry of the game or None if the message is not tracked
+        """
+        return self._messages.get(message_id)
+
+    def _set_message(
+        self, entry: GameIndexEntry, message_id: int | None, channel_id: int | None
+    ) -> None:
+        if entry.message_id is not None:
+            self._messages.pop(entry.message_id, None)
+        entry.message_id = int(message_id) if message_id is not None else None
+        entry.channel_id = int(channel_id) if channel_id is not None else None
+        if entry.message_id is not None and entry.channel_id is not None:
+            self._messages[entry.message_id] = entry
@@ -13,8 +13,8 @@ from discord.errors import (
 )
 from .configuration import Configuration
 from .db import get_games_w_status, get_game_from_id, update_db_obj
-from .db import GameStatus, Game
-from .game_1 import finish_game_1
+from .db import GameStatus, Game, active_games
+from .game_1 import enter_results_game_1, finish_game_1, finish_games_1
 
 
 class StatusSelect(discord.ui.Select):
@@ -60,6 +60,7 @@ class StatusSelect(discord.ui.Select):
             self.game.status = GameStatus(int(self.values[0]))
             new_status_name = self.game.status.name
             await update_db_obj(self.config, self.game)
+            active_games.update(self.game)
             await interaction.response.edit_message(
                 content=(
                     f"You have changed the status of game {self.game.id} from {old_status_name} "
@@ -241,11 +242,12 @@ class ConfirmationView(discord.ui.View):
     This view is used to confirm the game setup.
     """
 
-    def __init__(self, config: Configuration, game: Game):
+    def __init__(self, config: Configuration, game: Game, started_message: str = None):
         super().__init__(timeout=60)
         self.game = game
         self.config = config
         self.result = None
+        self.started_message = started_message
 
     @discord.ui.button(label="Im sure!", style=discord.ButtonStyle.danger)
     async def button_callback(
@@ -257,7 +259,8 @@ class ConfirmationView(discord.ui.View):
         # await asyncio.sleep(2)
         self.result = True
         await interaction.response.edit_message(
-            content=f"Evaluation of the game with ID: {self.game.id} started",
+            content=self.started_message
+            or f"Evaluation of the game with ID: {self.game.id} started",
             view=None,
         )
         self.stop()
@@ -324,3 +327,127 @@ async def evaluate_game(interaction: discord.Interaction, config: Configuration)
         NotFound,
     ) as err:
         config.watcher.logger.error(f"Error during evaluate_game: {err}")
+
+
+async def enter_game_results(interaction: discord.Interaction, config: Configuration):
+    """
+    Function to enter the results of a stopped game without finishing it. The game
+    stays stopped and can be finished later together with other games.
+
+    Args:
+        interaction (discord.Interaction): Interaction object from Discord
+        config (Configuration): App configuration
+    """
+    config.watcher.logger.trace("enter_game_results called")
+    try:
+        games = [
+            game
+            for game in await get_games_w_status(config, [GameStatus.STOPPED])
+            if game.name == "Fast and hungry, task hunt"
+        ]
+        if not games:
+            await interaction.response.send_message(
+                "No stopped games available to enter results.", ephemeral=True
+            )
+            return
+        select_view = GenGameSelectView(config, games)
+        await interaction.response.send_message(
+            "For which game would you like to enter the results?",
+            view=select_view,
+            ephemeral=True,
+        )
+        chosen_game_id = await select_view.wait_for_selection()
+        if chosen_game_id is None:
+            await interaction.followup.send("No game selected.", ephemeral=True)
+            return
+        game = await get_game_from_id(config, chosen_game_id)
+        if await enter_results_game_1(config, game, interaction):
+            await interaction.followup.send(
+                f"The results of the game with ID: {game.id} are saved. The game stays "
+                + "stopped until it is finished with /evaluate_stopped_games.",
+                ephemeral=True,
+            )
+    except (
+        asyncio.TimeoutError,
+        asyncio.CancelledError,
+        DiscordException,
+        HTTPException,
+        Forbidden,
+        NotFound,
+    ) as err:
+        config.watcher.logger.error(f"Error during enter_game_results: {err}")
+
+
+async def evaluate_stopped_games(
+    interaction: discord.Interaction, config: Configuration, game_ids: str = ""
+):
+    """
+    Function to evaluate and finish all stopped games or the selected ones in one
+    step. The player results must already be entered with enter_game_results, games
+    without results are skipped. The ranks of all games are written with a single league update.
+
+    Args:
+        interaction (discord.Interaction): Interaction object from Discord
+        config (Configuration): App configuration
+        game_ids (str, optional): Comma separated game IDs. Defaults to all stopped games.
+    """
+    config.watcher.logger.trace(f"evaluate_stopped_games called with {game_ids!r}")
+    try:
+        selected = {int(game_id) for game_id in game_ids.split(",") if game_id.strip()}
+    except ValueError:
+        await interaction.response.send_message(
+            "Please enter the game IDs as numbers separated by commas.", ephemeral=True
+        )
+        return
+    try:
+        games = [
+            game
+            for game in await get_games_w_status(config, [GameStatus.STOPPED])
+            if game.name == "Fast and hungry, task hunt"
+            and (not selected or game.id in selected)
+        ]
+        if not games:
+            await interaction.response.send_message(
+                "No games available to evaluate and finish.", ephemeral=True
+            )
+            return
+        confirmation_view = ConfirmationView(
+            config,
+            None,
+            started_message=f"Evaluation of {len(games)} games started",
+        )
+        await interaction.response.send_message(
+            content="You are sure to evaluate and finish the games with IDs: "
+            + ", ".join(str(game.id) for game in games)
+            + "? This is not reversible!",
+            view=confirmation_view,
+            ephemeral=True,
+        )
+        await confirmation_view.wait()
+        if not confirmation_view.result:
+            return
+        messages = await finish_games_1(config, games)
+        if messages is None:
+            await interaction.followup.send(
+                "The games could not be finished.", ephemeral=True
+            )
+            return
+        skipped = [str(game.id) for game in games if game.id not in messages]
+        if skipped:
+            await interaction.followup.send(
+                "Games without entered player results were skipped, "
+                + "enter them with /enter_game_results: "
+                + ", ".join(skipped),
+                ephemeral=True,
+            )
+        for message in messages.values():
+            await interaction.followup.send(message)
+    except (
+        asyncio.TimeoutError,
+        asyncio.CancelledError,
+        DiscordException,
+        HTTPException,
+        Forbidden,
+        NotFound,
+    ) as err:
+        config.watcher.logger.error(f"Error during evaluate_stopped_games: {err}")
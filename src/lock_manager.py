@@ -0,0 +1,124 @@
+"""
+Lock manager for database writes. Instead of one global write lock every writer only
+takes the locks of the aggregates it changes, e.g. a game, a player or the league.
+Wait times and current holders are recorded to see where writers queue up.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+
+@dataclass
+class LockStats:
+    """
+    Contention metrics of one aggregate type
+    """
+
+    acquisitions: int = 0
+    contended: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class LockManager:
+    """
+    Manager for asyncio locks keyed by aggregate, e.g. ("game", 1), ("player", "123")
+    or ("league",). Multiple locks are always acquired in the same order to avoid
+    deadlocks between writers. A lock only exists while a task holds or waits for it.
+    """
+
+    def __init__(self):
+        self._locks: dict[tuple, asyncio.Lock] = {}
+        self._users: dict[tuple, int] = {}
+        self._holders: dict[tuple, str] = {}
+        self._stats: dict[str, LockStats] = defaultdict(LockStats)
+
+    @asynccontextmanager
+    async def acquire(self, *keys: tuple):
+        """
+        Context manager to acquire the locks of all given aggregates.
+
+        Args:
+            keys (tuple): Aggregate keys, the first element is the aggregate type
+        """
+        entered = []
+        acquired = []
+        try:
+            for key in sorted(set(keys), key=repr):
+                lock = self._locks.setdefault(key, asyncio.Lock())
+                self._users[key] = self._users.get(key, 0) + 1
+                entered.append(key)
+                stats = self._stats[key[0]]
+                if lock.locked():
+                    stats.contended += 1
+                start = time.perf_counter()
+                await lock.acquire()
+                wait = time.perf_counter() - start
+                acquired.append(key)
+                stats.acquisitions += 1
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+                task = asyncio.current_task()
+                self._holders[key] = task.get_name() if task else "unknown"
+            yield
+        finally:
+            for key in reversed(acquired):
+                self._holders.pop(key, None)
+                self._locks[key].release()
+            for key in entered:
+                self._users[key] -= 1
+                if not self._users[key]:
+                    del self._users[key]
+                    del self._locks[key]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Function to get the contention metrics for each aggregate type.
+
+        Returns:
+            dict[str, dict[str, float]]: Metrics with wait times in milliseconds
+        """
+        return {
+            aggregate: {
+                "acquisitions": stats.acquisitions,
+                "contended": stats.contended,
+                "avg_wait_ms": (
+                    stats.total_wait * 1000 / stats.acquisitions
+                    if stats.acquisitions
+                    else 0.0
+                ),
+                "max_wait_ms": stats.max_wait * 1000,
+            }
+            for aggregate, stats in self._stats.items()
+        }
+
+    def holders(self) -> dict[tuple, str]:
+        """
+        Function to get all currently held locks with the name of the holding task.
+
+        Returns:
+            dict[tuple, str]: Aggregate key and task name
+        """
+        return dict(self._holders)
+
+    def log_contention(self, logger) -> None:
+        """
+        Function to log the contention metrics and current holders.
+
+        Args:
+            logger (loguru.Logger): Logger for the output
+        """
+        for aggregate, stats in self.stats().items():
+            logger.debug(
+                f"Lock {aggregate}: acquisitions={stats['acquisitions']}, "
+                f"contended={stats['contended']}, avg_wait={stats['avg_wait_ms']:.2f}ms, "
+                f"max_wait={stats['max_wait_ms']:.2f}ms"
+            )
+        if self._holders:
+            logger.debug(f"Current lock holders: {self.holders()}")
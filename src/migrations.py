@@ -0,0 +1,319 @@
+"""
+Versioned schema migrations for the SQLite database. All migrations are executed in
+order at startup and each applied version is stored in the schema_version table.
+Table rebuilds copy the rows in batches so that the database is only locked shortly.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.schema import CreateTable
+from .configuration import Configuration
+from .db import Base
+
+schema_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    schema_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class MigrationContext:
+    """
+    Helper functions for migration steps. Every helper runs in its own transaction.
+    """
+
+    def __init__(self, config: Configuration):
+        self.config = config
+        self.engine = config.db.engine
+        self.logger = config.watcher.logger
+        self.batch_size = config.db.migration_batch_size
+
+    async def create_all(self) -> None:
+        """
+        Function to create all missing tables of the ORM models.
+        """
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def get_columns(self, table_name: str) -> list[str]:
+        """
+        Function to get the column names of an existing table.
+
+        Args:
+            table_name (str): Name of the table
+
+        Returns:
+            list[str]: Column names in table order
+        """
+        async with self.engine.connect() as conn:
+            rows = (
+                await conn.exec_driver_sql(f'PRAGMA table_info("{table_name}")')
+            ).all()
+        return [row[1] for row in rows]
+
+    async def execute(self, statement: str) -> None:
+        """
+        Function to execute a fixed SQL statement of a migration step.
+
+        Args:
+            statement (str): SQL statement
+        """
+        async with self.engine.begin() as conn:
+            await conn.exec_driver_sql(statement)
+
+    async def add_column(self, table_name: str, column_name: str, column_type: str) -> bool:
+        """
+        Function to add a column to an existing table. The column is defined by the
+        migration step and not by the current model, so the step stays the same when
+        the model changes later.
+
+        Args:
+            table_name (str): Name of the table
+            column_name (str): Name of the new column
+            column_type (str): SQL type of the new column
+
+        Returns:
+            bool: True if the column was added, False if it already exists
+        """
+        if column_name in await self.get_columns(table_name):
+            return False
+        await self.execute(
+            f'ALTER TABLE "{table_name}" ADD COLUMN "{column_name}" {column_type}'
+        )
+        self.logger.info(f"Column {column_name} added to table {table_name}")
+        return True
+
+    async def create_index(
+        self, name: str, table_name: str, columns: list[str], unique: bool = False
+    ) -> bool:
+        """
+        Function to create an index if it does not exist yet. The index is only created
+        if all columns exist. Unique indexes that fail because of duplicate rows and
+        other database errors are logged and skipped.
+
+        Args:
+            name (str): Name of the index
+            table_name (str): Name of the table
+            columns (list[str]): Indexed columns in order
+            unique (bool, optional): Create a unique index. Defaults to False.
+
+        Returns:
+            bool: True if the index exists after the call
+        """
+        missing = set(columns) - set(await self.get_columns(table_name))
+        if missing:
+            self.logger.error(
+                f"Index {name} could not be created, "
+                f"columns {sorted(missing)} are missing in table {table_name}"
+            )
+            return False
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        try:
+            await self.execute(
+                f'CREATE {"UNIQUE " if unique else ""}INDEX IF NOT EXISTS "{name}" '
+                f'ON "{table_name}" ({column_list})'
+            )
+        except IntegrityError as err:
+            self.logger.error(
+                f"Index {name} could not be created, "
+                f"duplicate entries in table {table_name}: {str(err)}"
+            )
+            return False
+        except OperationalError as err:
+            self.logger.error(f"Index {name} could not be created: {str(err)}")
+            return False
+        return True
+
+    async def create_indexes(self, table: Table) -> None:
+        """
+        Function to create all indexes of a table definition, e.g. after a rebuild of
+        the table with this definition.
+
+        Args:
+            table (Table): Table definition with indexes
+        """
+        for index in table.indexes:
+            await self.create_index(
+                index.name,
+                table.name,
+                [column.name for column in index.columns],
+                index.unique,
+            )
+
+    async def rebuild_table(self, table: Table) -> None:
+        """
+        Function to rebuild an existing table with the current model definition. SQLite
+        can not change constraints or column types of a table, so a new table is created
+        and the rows are copied in batches by rowid with one transaction per batch. Only
+        the final swap of the tables runs in one longer transaction.
+
+        Args:
+            table (Table): Target definition of the table
+        """
+        new_name = f"{table.name}__rebuild"
+        existing_columns = await self.get_columns(table.name)
+        columns = ", ".join(
+            f'"{column.name}"' for column in table.columns if column.name in existing_columns
+        )
+        copy_sql = (
+            f'INSERT INTO "{new_name}" ({columns}) SELECT {columns} FROM "{table.name}" '
+            "WHERE rowid > ? AND rowid <= ?"
+        )
+        metadata = MetaData()
+        for referred_table in table.metadata.sorted_tables:
+            referred_table.to_metadata(metadata)
+        new_table = table.to_metadata(metadata, name=new_name)
+        async with self.engine.begin() as conn:
+            await conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{new_name}"')
+            await conn.execute(CreateTable(new_table))
+            max_rowid = (
+                await conn.exec_driver_sql(f'SELECT MAX(rowid) FROM "{table.name}"')
+            ).scalar() or 0
+        last_rowid = 0
+        while last_rowid < max_rowid:
+            async with self.engine.begin() as conn:
+                await conn.exec_driver_sql(
+                    copy_sql, (last_rowid, last_rowid + self.batch_size)
+                )
+            last_rowid += self.batch_size
+            self.logger.debug(
+                f"Rebuild of table {table.name}: {min(last_rowid, max_rowid)}/{max_rowid}"
+            )
+        async with self.engine.begin() as conn:
+            await conn.exec_driver_sql(
+                copy_sql.replace("AND rowid <= ?", ""), (last_rowid,)
+            )
+            await conn.exec_driver_sql(f'DROP TABLE "{table.name}"')
+            await conn.exec_driver_sql(
+                f'ALTER TABLE "{new_name}" RENAME TO "{table.name}"'
+            )
+        await self.create_indexes(table)
+        self.logger.info(f"Table {table.name} rebuilt")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Single migration step with a unique and ascending version.
+    """
+
+    version: int
+    description: str
+    upgrade: Callable[[MigrationContext], Awaitable[None]]
+
+
+# Migration steps name their columns and indexes explicitly. Only the initial schema
+# uses the current models, the following steps check what already exists.
+
+LOOKUP_INDEXES = [
+    ("ix_games_status", "games", ["status"], False),
+    ("ix_games_message_id", "games", ["message_id"], False),
+    ("ux_players_dc_id", "players", ["dc_id"], True),
+    (
+        "ux_game_player_association_game_player",
+        "game_player_association",
+        ["game_id", "player_id"],
+        True,
+    ),
+    ("ix_tasks_type_rating", "tasks", ["type", "rating"], False),
+    ("ux_tasks_name", "tasks", ["name"], True),
+    ("ix_reactions_message_dc_status", "reactions", ["message_id", "dc_id", "status"], False),
+    ("ix_reactions_message_dc_emoji", "reactions", ["message_id", "dc_id", "emoji"], False),
+]
+
+
+async def _initial_schema(context: MigrationContext) -> None:
+    await context.create_all()
+
+
+async def _lookup_indexes(context: MigrationContext) -> None:
+    for name, table_name, columns, unique in LOOKUP_INDEXES:
+        await context.create_index(name, table_name, columns, unique)
+
+
+async def _league_position(context: MigrationContext) -> None:
+    if await context.add_column("league", "position", "INTEGER"):
+        await context.execute("UPDATE league SET position = id")
+    await context.create_index("ix_league_position", "league", ["position"])
+
+
+async def _task_fingerprint(context: MigrationContext) -> None:
+    await context.execute(
+        "CREATE TABLE IF NOT EXISTS task_imports ("
+        "id INTEGER NOT NULL, file_hash VARCHAR NOT NULL, path VARCHAR NOT NULL, "
+        "timestamp DATETIME NOT NULL, inserted INTEGER NOT NULL, "
+        "updated INTEGER NOT NULL, unchanged INTEGER NOT NULL, "
+        "failed INTEGER NOT NULL, PRIMARY KEY (id))"
+    )
+    await context.add_column("tasks", "fingerprint", "VARCHAR")
+
+
+migrations = [
+    Migration(1, "Create initial schema", _initial_schema),
+    Migration(2, "Secondary indexes for lookup columns", _lookup_indexes),
+    Migration(3, "Persisted league position", _league_position),
+    Migration(4, "Task fingerprint and import history", _task_fingerprint),
+]
+
+
+async def get_schema_version(config: Configuration) -> int:
+    """
+    Function to get the latest applied schema version.
+
+    Args:
+        config (Configuration): App configuration
+
+    Returns:
+        int: Latest applied version or 0 for a new database
+    """
+    async with config.db.engine.begin() as conn:
+        await conn.run_sync(schema_metadata.create_all)
+        version = (
+            await conn.execute(select(func.max(schema_version.c.version)))
+        ).scalar()
+    return version or 0
+
+
+async def run_migrations(
+    config: Configuration, steps: list[Migration] | None = None
+) -> int:
+    """
+    Function to run all migrations that are not applied yet in order of the version.
+    Every applied migration is stored in the schema_version table.
+
+    Args:
+        config (Configuration): App configuration
+        steps (list[Migration] | None, optional): Migrations to run. Defaults to all.
+
+    Returns:
+        int: Schema version after the migration
+    """
+    steps = sorted(migrations if steps is None else steps, key=lambda x: x.version)
+    current_version = await get_schema_version(config)
+    config.watcher.logger.debug(f"Current schema version: {current_version}")
+    for migration in steps:
+        if migration.version <= current_version:
+            continue
+        config.watcher.logger.info(
+            f"Run migration {migration.version}: {migration.description}"
+        )
+        await migration.upgrade(MigrationContext(config))
+        async with config.db.engine.begin() as conn:
+            await conn.execute(
+                insert(schema_version).values(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=datetime.now(),
+                )
+            )
+        current_version = migration.version
+    config.watcher.logger.info(f"Database schema is on version {current_version}")
+    return current_version
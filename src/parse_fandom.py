@@ -1,37 +1,146 @@
 """
-Module to parse the items from Fandom wiki with given url and process items
+Module to parse the items from Fandom wiki with given url and process items. The wiki
+page is requested with the validators of the last download, so an unchanged page costs
+only one 304 response and is not parsed again. New and changed items are merged into
+the item list, the manually maintained ratings are kept.
 """
+from io import StringIO
+from pathlib import Path
 import pandas as pd
 from .configuration import Configuration
-from .tetue_generic.generic_requests import generic_http_request
+from .executor import executor_service
+from .tetue_generic.generic_requests import HttpCache, HttpClient, conditional_http_request
 
-#url_ = "https://dontstarve.fandom.com/wiki/Items_Don't_Starve_Together"
+FANDOM_ITEMS_URL = "https://dontstarve.fandom.com/wiki/Items_Don't_Starve_Together"
+ITEM_LIST_PATH = Path(__file__).parent / "item_list.csv"
+HTTP_CACHE_PATH = Path("files") / "http_cache"
+ITEM_COLUMNS = ["Name", "Type", "Stack", "Floatable?", "Acquisition"]
 
 
+def parse_item_table(html: str) -> pd.DataFrame:
+    """
+    Function to parse only the item table of the wiki page. Only tables that contain
+    the text "Acquisition" are converted and the first one with all item columns is used.
+
+    Args:
+        html (str): Wiki page
+
+    Raises:
+        ValueError: If the page has no item table
+
+    Returns:
+        pd.DataFrame: Items with the columns of ITEM_COLUMNS
+    """
+    for table in pd.read_html(StringIO(html), match="Acquisition"):
+        if set(ITEM_COLUMNS) <= set(table.columns):
+            return table[ITEM_COLUMNS].drop_duplicates("Name", keep="last")
+    raise ValueError("No item table found on the wiki page.")
+
 
-async def parse_items(config: Configuration, url: str, save_path_name: str) -> bool:
+def merge_items(items: pd.DataFrame, save_path_name: str | Path) -> tuple[int, int]:
     """
-    Function to parse the items from the given url and save them to a csv file.
+    Function to merge the parsed items into the item list. Existing items are updated
+    in place, new items are appended without rating and items that are no longer in
+    the wiki are kept.
 
     Args:
-        config (Configuration): App configuration
-        url (str): Url to parse the items from
-        save_path_name (str): Path and name to save the csv file
+        items (pd.DataFrame): Parsed items
+        save_path_name (str | Path): Path and name of the csv file
 
     Returns:
-        bool: If csv file was created successfully
+        tuple[int, int]: Number of added and updated items
+    """
+    items = items.astype(str).drop_duplicates("Name", keep="last")
+    path = Path(save_path_name)
+    if path.exists():
+        existing = pd.read_csv(path, dtype=str, keep_default_na=False)
+    else:
+        existing = pd.DataFrame(columns=ITEM_COLUMNS + ["Rating"], dtype=str)
+    merged = existing.merge(items, on="Name", how="left", suffixes=("", "_wiki"))
+    updated = pd.Series(False, index=merged.index)
+    for column in ITEM_COLUMNS[1:]:
+        changed = merged[f"{column}_wiki"].notna() & merged[column].ne(
+            merged[f"{column}_wiki"]
+        )
+        updated |= changed
+        merged.loc[changed, column] = merged.loc[changed, f"{column}_wiki"]
+    new_items = items[~items["Name"].isin(existing["Name"])].assign(Rating="")
+    added = len(new_items)
+    merged = pd.concat(
+        [merged[existing.columns.tolist()], new_items], ignore_index=True
+    )[existing.columns.tolist()]
+    merged.to_csv(path, index=False)
+    return added, int(updated.sum())
+
+
+def update_item_list(html: str, save_path_name: str | Path) -> tuple[int, int]:
     """
+    Function to parse the wiki page and merge the items into the item list.
+    Runs in the worker pool.
 
-    response = generic_http_request(
+    Args:
+        html (str): Wiki page
+        save_path_name (str | Path): Path and name of the csv file
+
+    Returns:
+        tuple[int, int]: Number of added and updated items
+    """
+    return merge_items(parse_item_table(html), save_path_name)
+
+
+async def parse_items(
+    config: Configuration,
+    url: str = FANDOM_ITEMS_URL,
+    save_path_name: str | Path = ITEM_LIST_PATH,
+    cache_dir: str | Path = HTTP_CACHE_PATH,
+    client: HttpClient = None,
+) -> bool:
+    """
+    Function to parse the items from the given url and merge them into the csv file.
+    If the page is unchanged since the last download, nothing is parsed. The page is
+    only stored in the HTTP cache after the merge, so a failed merge is repeated with
+    the next run.
+
+    Args:
+        config (Configuration): App configuration
+        url (str, optional): Url to parse the items from. Defaults to the DST item page.
+        save_path_name (str | Path, optional): Path and name of the csv file.
+            Defaults to the item list of the app.
+        cache_dir (str | Path, optional): Directory of the HTTP cache.
+            Defaults to files/http_cache.
+        client (HttpClient, optional): Client for the request. Defaults to the shared client.
+
+    Returns:
+        bool: If csv file is up to date
+    """
+    cache = HttpCache(cache_dir)
+    response = await conditional_http_request(
         url,
         header={},
+        cache=cache,
         req_timeout=config.gen_req.request_timeout,
         logger=config.watcher.logger,
+        client=client,
     )
     if response is None:
         return False
-
-    df_list = pd.read_html(response.content)
-    df = df_list[-1]
-    df.to_csv(save_path_name)
+    if response.status_code == 304:
+        config.watcher.logger.info(f"Items on {url} are unchanged, nothing to parse.")
+        return True
+    if response.status_code != 200:
+        config.watcher.logger.error(
+            f"Items could not be loaded from {url}, status: {response.status_code}"
+        )
+        return False
+    try:
+        added, updated = await executor_service.run(
+            update_item_list, response.text, save_path_name
+        )
+    except (ValueError, OSError) as err:
+        config.watcher.logger.error(f"Error parsing the items from {url}: {err}")
+        return False
+    cache.store(url, response)
+    config.watcher.logger.info(
+        f"Item list {save_path_name} merged: {added} added, {updated} updated"
+    )
     return True
@@ -1,25 +1,64 @@
 """All functions related to track reactions for each game"""
 
 import datetime
+from typing import NamedTuple
+from discord import errors
 from discord.raw_models import RawReactionActionEvent
 from discord.ext.commands.bot import Bot as DiscordBot
-from .db import (
-    get_games_f_reaction,
-    get_all_game_x_player_from_message_id,
-    insert_db_obj,
-    get_all_db_obj_from_id,
-    update_db_obj,
-    get_reaction_for_remove,
-    set_reaction_status,
-)
-from .db import Reaction, Player, GameStatus, ReactionStatus
+from .db import get_reaction_for_remove, set_reaction_status
+from .db import Reaction, GameStatus, ReactionStatus, active_games
 from .configuration import Configuration
-from .game import game_configs
+from .game_index import GameIndexEntry
+from .reaction_writer import reaction_writer
 
 # reaction_lock = asyncio.Lock()
 # allowed_game_messages = []
 
 
+class ReactionClassification(NamedTuple):
+    """
+    Result of the reaction classification with final status and game ID. If remove
+    is set, the reaction has to be removed from the game message.
+    """
+
+    status: ReactionStatus
+    game_id: int
+    remove: bool = False
+
+
+def classify_reaction(
+    game: GameIndexEntry, emoji_name: str, user_id: int
+) -> ReactionClassification:
+    """
+    Function to classify a reaction on a game message based on the cached game state.
+    The function has no side effects and needs neither Discord nor the database.
+
+    Args:
+        game (GameIndexEntry): Cached game state of the reacted message
+        emoji_name (str): Name of the emoji from the reaction event
+        user_id (int): Discord user ID from the reaction event
+
+    Returns:
+        ReactionClassification: Final status and game ID for the reaction
+    """
+    is_game_emoji = emoji_name in game.emojis
+    match game.status:
+        case GameStatus.CREATED | GameStatus.PAUSED if is_game_emoji:
+            return ReactionClassification(
+                ReactionStatus.DELETED_STATUS, game.game_id, remove=True
+            )
+        case GameStatus.RUNNING if is_game_emoji and user_id in game.player_dc_ids:
+            return ReactionClassification(ReactionStatus.REGISTERED, game.game_id)
+        case GameStatus.RUNNING if is_game_emoji:
+            return ReactionClassification(
+                ReactionStatus.DELETED_PLAYER, game.game_id, remove=True
+            )
+        case _ if not is_game_emoji:
+            return ReactionClassification(ReactionStatus.SUPPORTER, game.game_id)
+        case _:
+            return ReactionClassification(ReactionStatus.REVIEW, game.game_id)
+
+
 async def remove_reaction(
     bot: DiscordBot, config: Configuration, payload: RawReactionActionEvent
 ) -> None:
@@ -44,6 +83,40 @@ async def remove_reaction(
         config.watcher.logger.error(f"TypeError during reaction tracker: {err}")
 
 
+async def report_lost_reaction(
+    bot: DiscordBot,
+    config: Configuration,
+    payload: RawReactionActionEvent,
+    game: GameIndexEntry,
+) -> None:
+    """
+    Function to handle a registered reaction that could not be stored. The reaction
+    is removed from the message and the user is asked to react again, so that the
+    message does not show a reaction the game does not know.
+
+    Args:
+        bot (DiscordBot): Discord bot instance
+        config (Configuration): App configuration
+        payload (RawReactionActionEvent): payload information from reaction event
+        game (GameIndexEntry): Cached game state of the reacted message
+    """
+    config.watcher.logger.error(
+        f"Registered reaction {payload.emoji.name} from user {payload.user_id} on game "
+        f"{game.game_id} could not be stored"
+    )
+    await remove_reaction(bot, config, payload)
+    try:
+        member = await bot.fetch_user(payload.user_id)
+        await member.send(
+            f"Your reaction {payload.emoji.name} for the game {game.name} could not "
+            "be saved. Please react again."
+        )
+    except errors.HTTPException as err:
+        config.watcher.logger.error(
+            f"Error sending message to user with dc_id: {payload.user_id}. Error: {err}"
+        )
+
+
 async def schedule_reaction_tracker_add(
     bot: DiscordBot, config: Configuration, payload: RawReactionActionEvent
 ):
@@ -62,92 +135,33 @@ async def schedule_reaction_tracker_add(
             + f"User: {payload.member} / {payload.user_id}, Message ID: {payload.message_id} "
             + f"Channel ID {payload.channel_id}"
         )
-        games = await get_games_f_reaction(config)
-        reaction = await insert_db_obj(
+        game = active_games.lookup(payload.message_id)
+        if game is None:
+            config.watcher.logger.trace(
+                f"Reaction on untracked message: {payload.message_id}"
+            )
+            return
+        classification = classify_reaction(game, payload.emoji.name, payload.user_id)
+        config.watcher.logger.debug(
+            f"Reaction classified as {classification.status.name}. Game-ID: {game.game_id}"
+        )
+        stored = await reaction_writer.submit(
             config,
             Reaction(
                 dc_id=payload.user_id,
-                status=ReactionStatus.NEW,
+                status=classification.status,
                 timestamp=datetime.datetime.now(),
                 message_id=payload.message_id,
                 channel_id=payload.channel_id,
                 emoji=payload.emoji.name,
+                game_id=classification.game_id,
             ),
+            durable=classification.status == ReactionStatus.REGISTERED,
         )
-        config.watcher.logger.debug(f"Reaction inserted: {reaction}")
-
-        allowed_message_ids = [
-            int(game.message_id) for game in games if game.message_id
-        ]
-        config.watcher.logger.trace(
-            f"Allowed messages for reactions: {allowed_message_ids}"
-        )
-        if payload.message_id in allowed_message_ids:
-            game_x_player = await get_all_game_x_player_from_message_id(
-                config, payload.message_id
-            )
-            if game_x_player:
-                game_emojis = game_configs.get(game_x_player.name, []).game_emojis
-                player = await get_all_db_obj_from_id(
-                    config,
-                    Player,
-                    [player.player_id for player in game_x_player.players],
-                )
-                player_dc_ids = [int(player.dc_id) for player in player]
-                game_status = game_x_player.status
-                game_id = game_x_player.id
-
-                match game_status:
-                    case GameStatus.CREATED | GameStatus.PAUSED if (
-                        payload.emoji.name in game_emojis
-                    ):
-                        config.watcher.logger.debug(
-                            "Delete reaction because of status. "
-                            + f"Reaction-ID:{reaction.id}, Game-ID: {game_x_player.id}"
-                        )
-                        reaction.status = ReactionStatus.DELETED_STATUS
-                        reaction.game_id = game_id
-                        await update_db_obj(config, reaction)
-                        await remove_reaction(bot, config, payload)
-                    case GameStatus.RUNNING if (
-                        payload.emoji.name in game_emojis
-                        and payload.user_id in player_dc_ids
-                    ):
-                        config.watcher.logger.debug(
-                            "Reaction registered. "
-                            + f"Reaction-ID:{reaction.id}, Game-ID: {game_x_player.id}"
-                        )
-                        reaction.status = ReactionStatus.REGISTERED
-                        reaction.game_id = game_id
-                        await update_db_obj(config, reaction)
-                    case GameStatus.RUNNING if (
-                        payload.emoji.name in game_emojis
-                        and payload.user_id not in player_dc_ids
-                    ):
-                        config.watcher.logger.debug(
-                            "Delete reaction because of player. "
-                            + f"Reaction-ID:{reaction.id}, Game-ID: {game_x_player.id}."
-                        )
-                        reaction.status = ReactionStatus.DELETED_PLAYER
-                        reaction.game_id = game_id
-                        await update_db_obj(config, reaction)
-                        await remove_reaction(bot, config, payload)
-                    case _ if payload.emoji.name not in game_emojis:
-                        config.watcher.logger.debug(
-                            "Support reaction. "
-                            + f"Reaction-ID:{reaction.id}, Game-ID: {game_x_player.id}."
-                        )
-                        reaction.status = ReactionStatus.SUPPORTER
-                        reaction.game_id = game_id
-                        await update_db_obj(config, reaction)
-                    case _:
-                        config.watcher.logger.debug(
-                            "Reaction not matching game status or emoji. "
-                            + f"Reaction-ID:{reaction.id}, Game-ID: {game_x_player.id}"
-                        )
-                        reaction.status = ReactionStatus.REVIEW
-                        reaction.game_id = game_id
-                        await update_db_obj(config, reaction)
+        if not stored and classification.status == ReactionStatus.REGISTERED:
+            await report_lost_reaction(bot, config, payload, game)
+        elif classification.remove:
+            await remove_reaction(bot, config, payload)
 
     except TypeError as err:
         config.watcher.logger.error(f"TypeError during reaction tracker: {err}")
@@ -168,6 +182,8 @@ async def schedule_reaction_tracker_remove(
         + f"from user: {payload.user_id}, Message ID: {payload.message_id} "
         + f"Channel ID {payload.channel_id}"
     )
+    if active_games.lookup(payload.message_id) is not None:
+        await reaction_writer.flush()
     reactions = await get_reaction_for_remove(
         config, payload.message_id, payload.user_id, payload.emoji.name
     )
@@ -0,0 +1,194 @@
+"""
+Write-behind pipeline for reactions. Classified reactions are collected in a queue
+for a few milliseconds or until the batch is full and then written to the database
+in one transaction.
+"""
+
+import asyncio
+from sqlalchemy.exc import SQLAlchemyError
+from .configuration import Configuration
+from .db import Reaction, insert_db_obj, lock_key
+
+
+class ReactionWriter:
+    """
+    Queue based writer for reaction rows. Normal reactions are acknowledged as soon as
+    they are queued, durable reactions only after the batch with the reaction is committed.
+    """
+
+    def __init__(self):
+        self.config: Configuration = None
+        self._queue: asyncio.Queue = None
+        self._task: asyncio.Task = None
+
+    @property
+    def running(self) -> bool:
+        """
+        Status of the writer task
+
+        Returns:
+            bool: True if the writer task is running
+        """
+        return self._task is not None and not self._task.done()
+
+    def start(self, config: Configuration) -> None:
+        """
+        Function to start the writer task in the running event loop.
+
+        Args:
+            config (Configuration): App configuration
+        """
+        if self.running:
+            return
+        self.config = config
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name="reaction_writer")
+
+    async def stop(self) -> None:
+        """
+        Function to flush all queued reactions and stop the writer task. Called on
+        shutdown so that no queued reaction is lost.
+        """
+        if self._task is None:
+            return
+        if self.running:
+            await self.flush()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        elif not self._task.cancelled() and self._task.exception() is not None:
+            self.config.watcher.logger.error(
+                f"Reaction writer ended with error: {self._task.exception()}"
+            )
+        self._task = None
+        self._drain()
+        self.config.watcher.logger.info("Reaction writer stopped")
+
+    def _drain(self) -> None:
+        """
+        Function to resolve the reactions that are still queued after the writer task
+        ended, so that no caller waits forever.
+        """
+        lost = 0
+        while not self._queue.empty():
+            reaction, future = self._queue.get_nowait()
+            lost += reaction is not None
+            if not future.done():
+                future.set_result(False)
+        if lost:
+            self.config.watcher.logger.error(
+                f"{lost} queued reactions lost, the reaction writer was not running"
+            )
+
+    async def submit(
+        self, config: Configuration, reaction: Reaction, durable: bool = False
+    ) -> bool:
+        """
+        Function to queue a classified reaction for writing. If the writer is not
+        started, the reaction is inserted directly.
+
+        Args:
+            config (Configuration): App configuration
+            reaction (Reaction): Reaction with final status and game ID
+            durable (bool, optional): Wait until the reaction is committed. Defaults to False.
+
+        Returns:
+            bool: True if the reaction is queued or, in durable mode, committed
+        """
+        if not self.running:
+            return await insert_db_obj(config, reaction) is not None
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((reaction, future))
+        if durable:
+            return await future
+        return True
+
+    async def flush(self) -> None:
+        """
+        Function to wait until all reactions queued before the call are committed.
+        """
+        if not self.running:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((None, future))
+        await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        batch_size = self.config.db.reaction_batch_size
+        flush_interval = self.config.db.reaction_flush_ms / 1000
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + flush_interval
+            while len(batch) < batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write(batch)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                self.config.watcher.logger.error(
+                    f"Error while writing a batch of {len(batch)} reactions: {str(err)}",
+                    exc_info=True,
+                )
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(False)
+
+    async def _insert(self, reactions: list[Reaction]) -> None:
+        async with self.config.db.locks.acquire(
+            *(lock_key(reaction) for reaction in reactions)
+        ):
+            async with self.config.db.session() as session:
+                async with session.begin():
+                    session.add_all(reactions)
+
+    async def _write(self, batch: list[tuple[Reaction | None, asyncio.Future]]) -> None:
+        reactions = [reaction for reaction, _ in batch if reaction is not None]
+        results = {}
+        try:
+            if reactions:
+                await self._insert(reactions)
+                self.config.watcher.logger.trace(
+                    f"Reaction batch written with {len(reactions)} reactions"
+                )
+        except SQLAlchemyError as err:
+            self.config.watcher.logger.warning(
+                f"Database error while writing {len(reactions)} reactions, "
+                f"retry row by row: {str(err)}"
+            )
+            results = {id(reaction): await self._write_one(reaction) for reaction in reactions}
+        for reaction, future in batch:
+            if not future.done():
+                future.set_result(results.get(id(reaction), True))
+
+    async def _write_one(self, reaction: Reaction) -> bool:
+        """
+        Function to write a single reaction after its batch failed, so that one faulty
+        row does not drop the other reactions of the batch.
+
+        Args:
+            reaction (Reaction): Reaction to write
+
+        Returns:
+            bool: True if the reaction is committed
+        """
+        try:
+            await self._insert([reaction])
+            return True
+        except SQLAlchemyError as err:
+            self.config.watcher.logger.error(
+                f"Reaction lost: {reaction.emoji} from user {reaction.dc_id} on message "
+                f"{reaction.message_id} of game {reaction.game_id}: {str(err)}",
+                exc_info=True,
+            )
+            return False
+
+
+reaction_writer = ReactionWriter()
@@ -0,0 +1,175 @@
+"""
+Offline re-scoring of all finished games of 'Fast and hungry, task hunt' with other
+weights. The player results are loaded once from the database, every weight profile
+is scored in memory and the resulting league table is compared with the stored one.
+The database is only read, so the tool can run next to the bot.
+
+Usage: python -m src.rescore --db-url sqlite:///files/DstGame.db --profile 10000,1000,1 5000,2000,1
+"""
+
+import argparse
+import numpy as np
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import make_url
+from .db import (
+    Game,
+    Game1PlayerResult,
+    GamePlayerAssociation,
+    GameStatus,
+    League,
+    LeagueChange,
+    diff_league,
+)
+from .scoring import ScoreWeights, score_games
+
+RESULT_COLUMNS = ["game_id", "player_id", "completed_tasks", "survived", "player_days"]
+
+
+def load_results(db_url: str) -> tuple[dict[str, np.ndarray], list[tuple]]:
+    """
+    Function to load the player results of all finished games as columns and the
+    stored league table.
+
+    Args:
+        db_url (str): Database URL, async drivers are replaced by the sync driver
+
+    Returns:
+        tuple[dict[str, np.ndarray], list[tuple]]: Column for each name of
+            RESULT_COLUMNS and player_id, points and survived of the league table
+    """
+    engine = create_engine(make_url(db_url).set(drivername="sqlite"))
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(
+                    GamePlayerAssociation.game_id,
+                    GamePlayerAssociation.player_id,
+                    Game1PlayerResult.completed_tasks,
+                    Game1PlayerResult.survived == "yes",
+                    Game1PlayerResult.player_days,
+                )
+                .join(GamePlayerAssociation, Game1PlayerResult.gameplayerassociation)
+                .join(Game, GamePlayerAssociation.game)
+                .where(Game.status == GameStatus.FINISHED)
+                .order_by(GamePlayerAssociation.game_id, Game1PlayerResult.id)
+            ).all()
+            league = conn.execute(
+                select(League.player_id, League.points, League.survived).order_by(
+                    League.position
+                )
+            ).all()
+    finally:
+        engine.dispose()
+    if not rows:
+        return {name: np.array([], dtype=np.int64) for name in RESULT_COLUMNS}, league
+    return dict(zip(RESULT_COLUMNS, (np.array(column) for column in zip(*rows)))), league
+
+
+def rescore_league(results: dict[str, np.ndarray], weights: ScoreWeights) -> list[tuple]:
+    """
+    Function to score all results with the weights and aggregate the points and
+    survived days per player in the order of the league table.
+
+    Args:
+        results (dict[str, np.ndarray]): Columns of the player results
+        weights (ScoreWeights): Weights of the score
+
+    Returns:
+        list[tuple]: player_id, points and survived for each player in league order
+    """
+    game_scores = score_games(
+        results["game_id"],
+        results["completed_tasks"],
+        results["survived"],
+        results["player_days"],
+        weights,
+    )
+    player_ids, player_index = np.unique(results["player_id"], return_inverse=True)
+    points = np.bincount(player_index, weights=game_scores.points).astype(np.int64)
+    survived = np.bincount(player_index, weights=results["player_days"]).astype(np.int64)
+    order = np.lexsort((player_ids, -survived, -points))
+    return list(
+        zip(
+            player_ids[order].tolist(),
+            points[order].tolist(),
+            survived[order].tolist(),
+        )
+    )
+
+
+def rescore_profiles(
+    results: dict[str, np.ndarray], league: list[tuple], profiles: list[ScoreWeights]
+) -> dict[ScoreWeights, list[LeagueChange]]:
+    """
+    Function to re-score the results with every weight profile and compare the league
+    tables with the stored one.
+
+    Args:
+        results (dict[str, np.ndarray]): Columns of the player results
+        league (list[tuple]): player_id, points and survived of the stored league table
+        profiles (list[ScoreWeights]): Weight profiles to test
+
+    Returns:
+        dict[ScoreWeights, list[LeagueChange]]: Differences to the stored league table
+            for each profile
+    """
+    return {
+        weights: diff_league(league, rescore_league(results, weights))
+        for weights in profiles
+    }
+
+
+def parse_profile(value: str) -> ScoreWeights:
+    """
+    Function to parse a weight profile of the command line.
+
+    Args:
+        value (str): Weights of tasks, survived and days separated by commas
+
+    Raises:
+        argparse.ArgumentTypeError: If the profile has not three numbers
+
+    Returns:
+        ScoreWeights: Parsed weights
+    """
+    try:
+        return ScoreWeights(*(float(weight) for weight in value.split(",")))
+    except (TypeError, ValueError) as err:
+        raise argparse.ArgumentTypeError(
+            f"Profile {value!r} must have the form TASKS,SURVIVED,DAYS"
+        ) from err
+
+
+def main() -> None:
+    """
+    Entry point of the re-scoring tool.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default="sqlite:///files/DstGame.db")
+    parser.add_argument("--profile", type=parse_profile, nargs="+", required=True)
+    parser.add_argument(
+        "--details", action="store_true", help="Print every changed player"
+    )
+    args = parser.parse_args()
+    results, league = load_results(args.db_url)
+    print(
+        f"{len(results['game_id'])} results in {len(np.unique(results['game_id']))} "
+        f"finished games, {len(league)} players in the league table"
+    )
+    for weights, changes in rescore_profiles(results, league, args.profile).items():
+        moved = sum(change.old_position != change.new_position for change in changes)
+        print(
+            f"tasks={weights.tasks:g} survived={weights.survived:g} days={weights.days:g}: "
+            f"{len(changes)} changed players, {moved} with a new position"
+        )
+        if args.details:
+            for change in changes:
+                print(
+                    f"  player {change.player_id}: position {change.old_position} -> "
+                    f"{change.new_position}, points {change.old_points} -> "
+                    f"{change.new_points}"
+                )
+
+
+if __name__ == "__main__":
+    main()
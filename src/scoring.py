@@ -0,0 +1,148 @@
+"""
+Vectorised scoring of game 1 results. The results of any number of games are passed
+as columns, so that all scores, placements and points are calculated with a few
+array operations instead of a loop per player. The module does not access the
+database and can also be used to score historical results with other weights.
+"""
+
+from typing import NamedTuple
+import numpy as np
+
+MAX_POINTS = 6
+
+
+class ScoreWeights(NamedTuple):
+    """
+    Weights of the completed tasks, the survival and the player days for the score.
+    """
+
+    tasks: float
+    survived: float
+    days: float
+
+    @classmethod
+    def from_config(cls, config) -> "ScoreWeights":
+        """
+        Function to take over the configured weights of game 1.
+
+        Args:
+            config (Configuration): App configuration
+
+        Returns:
+            ScoreWeights: Configured weights
+        """
+        return cls(
+            config.game.weighted_rank_task_g1,
+            config.game.weighted_rank_surv_g1,
+            config.game.weighted_rank_days_g1,
+        )
+
+
+class GameScores(NamedTuple):
+    """
+    Scores of all results. All arrays are in the order of the results, order sorts
+    the results by game and placement.
+    """
+
+    scores: np.ndarray
+    placements: np.ndarray
+    points: np.ndarray
+    order: np.ndarray
+
+
+def calculate_scores(
+    completed_tasks: np.ndarray,
+    survived: np.ndarray,
+    player_days: np.ndarray,
+    weights: ScoreWeights,
+) -> np.ndarray:
+    """
+    Function to calculate the score of every result.
+
+    Args:
+        completed_tasks (np.ndarray): Number of completed tasks
+        survived (np.ndarray): True if the player survived
+        player_days (np.ndarray): Days the player survived
+        weights (ScoreWeights): Weights of the score
+
+    Returns:
+        np.ndarray: Score of every result
+    """
+    return (
+        np.asarray(completed_tasks) * weights.tasks
+        + np.asarray(survived, dtype=bool) * weights.survived
+        + np.asarray(player_days) * weights.days
+    )
+
+
+def dense_placements(
+    game_ids: np.ndarray, scores: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Function to calculate the placement of every result within its game. The best
+    score gets placement 1, equal scores share a placement and the next lower score
+    gets the following placement without gaps. Results with equal scores keep their
+    input order.
+
+    Args:
+        game_ids (np.ndarray): Game ID of every result
+        scores (np.ndarray): Score of every result
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Placement of every result and the order that
+            sorts the results by game and placement
+    """
+    game_ids = np.asarray(game_ids)
+    scores = np.asarray(scores)
+    order = np.lexsort((-scores, game_ids))
+    sorted_games = game_ids[order]
+    sorted_scores = scores[order]
+    game_start = np.ones(len(order), dtype=bool)
+    game_start[1:] = sorted_games[1:] != sorted_games[:-1]
+    new_placement = game_start.copy()
+    new_placement[1:] |= sorted_scores[1:] < sorted_scores[:-1]
+    counter = np.cumsum(new_placement)
+    start_counter = np.maximum.accumulate(np.where(game_start, counter, 0))
+    placements = np.empty(len(order), dtype=np.int64)
+    placements[order] = counter - start_counter + 1
+    return placements, order
+
+
+def placement_points(placements: np.ndarray) -> np.ndarray:
+    """
+    Function to calculate the league points of the placements. The first placement
+    gets MAX_POINTS and every following placement one point less.
+
+    Args:
+        placements (np.ndarray): Placement of every result
+
+    Returns:
+        np.ndarray: Points of every result
+    """
+    return MAX_POINTS - (np.asarray(placements) - 1)
+
+
+def score_games(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    game_ids: np.ndarray,
+    completed_tasks: np.ndarray,
+    survived: np.ndarray,
+    player_days: np.ndarray,
+    weights: ScoreWeights,
+) -> GameScores:
+    """
+    Function to calculate scores, placements and points of the results of any number
+    of games.
+
+    Args:
+        game_ids (np.ndarray): Game ID of every result
+        completed_tasks (np.ndarray): Number of completed tasks
+        survived (np.ndarray): True if the player survived
+        player_days (np.ndarray): Days the player survived
+        weights (ScoreWeights): Weights of the score
+
+    Returns:
+        GameScores: Scores, placements, points and sort order of the results
+    """
+    scores = calculate_scores(completed_tasks, survived, player_days, weights)
+    placements, order = dense_placements(game_ids, scores)
+    return GameScores(scores, placements, placement_points(placements), order)
@@ -0,0 +1,128 @@
+"""
+Cached snapshot of the inputs for the player rank calculation. The league positions,
+the number of league participants and the maximum playing hours only change when
+the league table or the hours of a player change, so the snapshot is loaded once and
+reused for every game start until it is invalidated.
+"""
+
+from typing import NamedTuple
+import numpy as np
+
+
+class StatsSnapshot(NamedTuple):
+    """
+    League positions of all players in the league table, the number of league
+    participants and the maximum playing hours of all players.
+    """
+
+    positions: dict[int, int]
+    count_league_participants: int
+    max_hours: int
+
+
+class GameStatsCache:
+    """
+    Holder of the current snapshot. Every invalidation increases the generation, so a
+    snapshot loaded before a change is not stored afterwards.
+    """
+
+    def __init__(self):
+        self._snapshot: StatsSnapshot = None
+        self._generation = 0
+
+    @property
+    def valid(self) -> bool:
+        """
+        Status of the snapshot
+
+        Returns:
+            bool: True if a current snapshot is stored
+        """
+        return self._snapshot is not None
+
+    @property
+    def generation(self) -> int:
+        """
+        Number of invalidations, read before a snapshot is loaded
+
+        Returns:
+            int: Current generation
+        """
+        return self._generation
+
+    @property
+    def snapshot(self) -> StatsSnapshot | None:
+        """
+        Current snapshot
+
+        Returns:
+            StatsSnapshot | None: Stored snapshot or None if it is invalidated
+        """
+        return self._snapshot
+
+    def store(self, snapshot: StatsSnapshot, generation: int) -> bool:
+        """
+        Function to store a loaded snapshot if nothing changed while loading.
+
+        Args:
+            snapshot (StatsSnapshot): Loaded snapshot
+            generation (int): Generation read before loading
+
+        Returns:
+            bool: True if the snapshot is stored
+        """
+        if generation != self._generation:
+            return False
+        self._snapshot = snapshot
+        return True
+
+    def invalidate(self) -> None:
+        """
+        Function to drop the snapshot after a change of the league or the player hours.
+        """
+        self._generation += 1
+        self._snapshot = None
+
+
+def player_ranks(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    hours: np.ndarray,
+    league_positions: np.ndarray,
+    snapshot: StatsSnapshot,
+    weighted_hours: float,
+    weighted_league_pos: float,
+) -> np.ndarray:
+    """
+    Function to calculate the rank of several players at once. The rank is the weighted
+    share of the maximum playing hours plus the weighted league position, where the
+    first position counts 1 and the last position 0. Players without league position
+    get no league score.
+
+    Args:
+        hours (np.ndarray): Playing hours of every player
+        league_positions (np.ndarray): League position of every player, 0 if not in the league
+        snapshot (StatsSnapshot): Rank inputs
+        weighted_hours (float): Weight of the playing hours
+        weighted_league_pos (float): Weight of the league position
+
+    Returns:
+        np.ndarray: Rank of every player, all 0 if no rank calculation is possible
+    """
+    hours = np.asarray(hours, dtype=float)
+    league_positions = np.asarray(league_positions, dtype=float)
+    if snapshot.count_league_participants <= 0 or snapshot.max_hours <= 0:
+        return np.zeros(len(hours))
+    game_score = weighted_hours * (hours / snapshot.max_hours)
+    league_score = np.zeros(len(hours))
+    in_league = league_positions >= 1
+    if snapshot.count_league_participants > 1:
+        league_score[in_league] = weighted_league_pos * (
+            1
+            - (league_positions[in_league] - 1)
+            / (snapshot.count_league_participants - 1)
+        )
+    else:
+        league_score[in_league] = weighted_league_pos
+    return game_score + league_score
+
+
+game_stats_cache = GameStatsCache()
@@ -0,0 +1,279 @@
+"""
+Process-wide in-memory pool of all active tasks. The tasks are kept sorted by rating
+for each task type, so that rating range queries are answered with a binary search
+instead of a database query. The pool is loaded on first use and invalidated
+whenever the tasks in the database are changed. Random tasks are drawn from the
+candidates of the pool by the task sampler instead of ORDER BY random() in SQLite.
+"""
+
+import heapq
+import random
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate
+
+RATING_GROUP_BOUNDS = (20, 40, 60, 80)
+
+
+def rating_weight(rating: float) -> float:
+    """
+    Function to get the sampling weight of a task for the rating weighted selection.
+
+    Args:
+        rating (float): Rating of the task
+
+    Returns:
+        float: Weight, at least 1 so that easy tasks can still be drawn
+    """
+    return max(rating, 0) + 1
+
+
+@dataclass
+class TaskBucket:
+    """
+    All tasks of one type sorted by rating with the start index of each rating group
+    and the cumulative rating weights for weighted sampling.
+    """
+
+    tasks: list = field(default_factory=list)
+    ratings: list = field(default_factory=list)
+    group_starts: tuple[int, ...] = ()
+    cum_weights: list = field(default_factory=list)
+
+
+class TaskPool:
+    """
+    Pool of active tasks bucketed by task type and rating.
+    """
+
+    def __init__(self):
+        self._buckets: dict[str, TaskBucket] = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return sum(len(bucket.tasks) for bucket in self._buckets.values())
+
+    def load(self, tasks: list) -> None:
+        """
+        Function to replace the content of the pool with the given tasks.
+
+        Args:
+            tasks (list[Task]): All active tasks
+        """
+        buckets: dict[str, list] = {}
+        for task in tasks:
+            buckets.setdefault(task.type, []).append(task)
+        self._buckets = {}
+        for task_type, typed_tasks in buckets.items():
+            typed_tasks.sort(key=lambda x: (x.rating, x.id))
+            ratings = [task.rating for task in typed_tasks]
+            self._buckets[task_type] = TaskBucket(
+                tasks=typed_tasks,
+                ratings=ratings,
+                group_starts=(0,)
+                + tuple(bisect_left(ratings, bound) for bound in RATING_GROUP_BOUNDS),
+                cum_weights=list(accumulate(rating_weight(rating) for rating in ratings)),
+            )
+        self.loaded = True
+
+    def invalidate(self) -> None:
+        """
+        Function to mark the pool as outdated, the next access loads all tasks again.
+        """
+        self._buckets = {}
+        self.loaded = False
+
+    def tasks(
+        self,
+        task_type: str | None,
+        rating_min: float = 0,
+        rating_max: float | None = None,
+    ) -> list:
+        """
+        Function to get all tasks of a type with rating_min <= rating < rating_max.
+
+        Args:
+            task_type (str | None): Type of the tasks, e.g. task or main. None for
+                the tasks of all types.
+            rating_min (float, optional): Lowest rating. Defaults to 0.
+            rating_max (float | None, optional): Upper bound of the rating (excluded).
+                Defaults to no limit.
+
+        Returns:
+            list[Task]: Tasks sorted by rating in ascending order
+        """
+        if task_type is None:
+            return sorted(
+                (
+                    task
+                    for bucket_type in self._buckets
+                    for task in self.tasks(bucket_type, rating_min, rating_max)
+                ),
+                key=lambda x: (x.rating, x.id),
+            )
+        bucket, start, end = self.range(task_type, rating_min, rating_max)
+        return bucket.tasks[start:end]
+
+    def range(
+        self, task_type: str, rating_min: float = 0, rating_max: float | None = None
+    ) -> tuple[TaskBucket, int, int]:
+        """
+        Function to get the index range of all tasks of a type with
+        rating_min <= rating < rating_max without copying the tasks.
+
+        Args:
+            task_type (str): Type of the tasks, e.g. task or main
+            rating_min (float, optional): Lowest rating. Defaults to 0.
+            rating_max (float | None, optional): Upper bound of the rating (excluded).
+                Defaults to no limit.
+
+        Returns:
+            tuple[TaskBucket, int, int]: Bucket of the type, start and end index
+        """
+        bucket = self._buckets.get(task_type, TaskBucket())
+        start = bisect_left(bucket.ratings, rating_min)
+        end = (
+            len(bucket.ratings)
+            if rating_max is None
+            else bisect_left(bucket.ratings, rating_max)
+        )
+        return bucket, start, max(start, end)
+
+    def widened_rating(
+        self,
+        task_type: str,
+        rating: float,
+        min_count: int = 5,
+        step: int = 5,
+        attempts: int = 6,
+    ) -> float | None:
+        """
+        Function to find the rating limit for a search that starts at the given rating
+        and widens it by step until at least min_count tasks have a rating <= limit.
+
+        Args:
+            task_type (str): Type of the tasks
+            rating (float): Start rating of the search
+            min_count (int, optional): Minimum number of tasks. Defaults to 5.
+            step (int, optional): Rating increase per attempt. Defaults to 5.
+            attempts (int, optional): Maximum number of attempts. Defaults to 6.
+
+        Returns:
+            float | None: Rating limit or None if there are not enough tasks
+        """
+        bucket = self._buckets.get(task_type)
+        if bucket is None or len(bucket.ratings) < min_count:
+            return None
+        needed = bucket.ratings[min_count - 1]
+        widening = max(0, -(-(needed - rating) // step))
+        if widening >= attempts:
+            return None
+        return rating + widening * step
+
+    def rating_groups(self, task_type: str, rating_max: float) -> list[list]:
+        """
+        Function to get all tasks of a type with a rating <= rating_max divided into
+        the five rating groups 0-19, 20-39, 40-59, 60-79 and 80+.
+
+        Args:
+            task_type (str): Type of the tasks
+            rating_max (float): Highest rating (included)
+
+        Returns:
+            list[list[Task]]: Tasks per rating group from easy to hard
+        """
+        bucket = self._buckets.get(task_type)
+        if bucket is None:
+            return [[] for _ in range(len(RATING_GROUP_BOUNDS) + 1)]
+        end = bisect_right(bucket.ratings, rating_max)
+        bounds = bucket.group_starts + (len(bucket.tasks),)
+        return [
+            bucket.tasks[min(start, end) : min(stop, end)]
+            for start, stop in zip(bounds, bounds[1:])
+        ]
+
+
+class TaskSampler:
+    """
+    Random selection of tasks from a list of candidates. The tasks are drawn uniformly
+    or weighted by rating, so that harder tasks are drawn more often. With a seed the
+    selection is reproducible.
+    """
+
+    def __init__(self, seed: int | None = None):
+        self.rng = random.Random(seed)
+
+    def seed(self, seed: int | None) -> None:
+        """
+        Function to reset the random generator with a seed.
+
+        Args:
+            seed (int | None): Seed for a reproducible selection or None for a random seed
+        """
+        self.rng.seed(seed)
+
+    def sample(self, candidates: list, k: int, weighting: str = "uniform") -> list:
+        """
+        Function to draw k different tasks from the candidates.
+
+        Args:
+            candidates (list[Task]): Tasks to draw from
+            k (int): Number of tasks, limited by the number of candidates
+            weighting (str, optional): "uniform" or "rating". Defaults to "uniform".
+
+        Returns:
+            list[Task]: Drawn tasks
+        """
+        k = min(k, len(candidates))
+        if weighting == "rating":
+            keys = (
+                (self.rng.random() ** (1 / rating_weight(task.rating)), index)
+                for index, task in enumerate(candidates)
+            )
+            return [candidates[index] for _, index in heapq.nlargest(k, keys)]
+        return self.rng.sample(candidates, k)
+
+    def draw(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        pool: TaskPool,
+        task_type: str,
+        k: int,
+        rating_min: float = 0,
+        rating_max: float | None = None,
+        weighting: str = "uniform",
+    ) -> list:
+        """
+        Function to draw k different tasks of a type and rating range from the pool.
+        Only the drawn positions are computed, so a draw costs O(k log n) instead of
+        a scan of all candidates.
+
+        Args:
+            pool (TaskPool): Loaded task pool
+            task_type (str): Type of the tasks
+            k (int): Number of tasks, limited by the number of candidates
+            rating_min (float, optional): Lowest rating. Defaults to 0.
+            rating_max (float | None, optional): Upper bound of the rating (excluded).
+                Defaults to no limit.
+            weighting (str, optional): "uniform" or "rating". Defaults to "uniform".
+
+        Returns:
+            list[Task]: Drawn tasks
+        """
+        bucket, start, end = pool.range(task_type, rating_min, rating_max)
+        k = min(k, end - start)
+        if weighting != "rating":
+            return [bucket.tasks[i] for i in self.rng.sample(range(start, end), k)]
+        if 2 * k > end - start:
+            return self.sample(bucket.tasks[start:end], k, weighting)
+        low = bucket.cum_weights[start - 1] if start else 0
+        high = bucket.cum_weights[end - 1] if end else 0
+        drawn = {}
+        while len(drawn) < k:
+            value = low + self.rng.random() * (high - low)
+            index = min(bisect_right(bucket.cum_weights, value, start, end), end - 1)
+            drawn.setdefault(index, bucket.tasks[index])
+        return list(drawn.values())
+
+
+task_pool = TaskPool()
+task_sampler = TaskSampler()
@@ -1,11 +1,18 @@
 """Implement generic request function with own logging and return functionality"""
 
 from __future__ import annotations
-import requests
-from pydantic import BaseModel, PositiveInt, field_validator, Field
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+import aiohttp
+from pydantic import BaseModel, NonNegativeInt, PositiveInt, field_validator, Field
 from . import watcher
 from . import GENERIC_REQUEST_TIMEOUT_THR
 
+RETRY_STATUS = frozenset([429, 500, 502, 503, 504])
+
 
 class GenReqConfiguration(BaseModel):
     """
@@ -15,6 +22,19 @@ class GenReqConfiguration(BaseModel):
     request_timeout: PositiveInt = Field(
         10, description="Timeout for requests in seconds"
     )
+    limit: PositiveInt = Field(100, description="Max. open connections of the session")
+    limit_per_host: PositiveInt = Field(
+        4, description="Max. open connections per host"
+    )
+    keepalive_timeout: PositiveInt = Field(
+        30, description="Time in seconds to keep idle connections open"
+    )
+    retries: NonNegativeInt = Field(
+        3, description="Number of retries for failed requests"
+    )
+    backoff: float = Field(
+        0.5, ge=0, description="Wait time in seconds before the first retry"
+    )
 
     @field_validator("request_timeout")
     @classmethod
@@ -38,41 +58,268 @@ class GenReqConfiguration(BaseModel):
         return value
 
 
+@dataclass
+class HttpResponse:
+    """
+    Response of a http request with the complete body, independent of the connection
+    """
+
+    status_code: int
+    url: str
+    headers: dict = field(default_factory=dict)
+    content: bytes = b""
+    encoding: str = "utf-8"
+
+    @property
+    def text(self) -> str:
+        """
+        Body of the response as text
+
+        Returns:
+            str: Decoded body
+        """
+        return self.content.decode(self.encoding, errors="replace")
+
+
+class HttpClient:
+    """
+    Async http client with one pooled session for the lifetime of the app. Connections
+    are kept alive and reused, the number of connections per host is limited and
+    failed requests are retried with exponential backoff.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 4,
+        keepalive_timeout: int = 30,
+        retries: int = 3,
+        backoff: float = 0.5,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._session: aiohttp.ClientSession = None
+
+    def configure(self, config: GenReqConfiguration) -> None:
+        """
+        Function to take over the settings of the configuration. Changes of the
+        connection limits are applied with the next session.
+
+        Args:
+            config (GenReqConfiguration): Settings for generic requests
+        """
+        self.limit = config.limit
+        self.limit_per_host = config.limit_per_host
+        self.keepalive_timeout = config.keepalive_timeout
+        self.retries = config.retries
+        self.backoff = config.backoff
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Shared session of the client, created with the first request
+
+        Returns:
+            aiohttp.ClientSession: Pooled session
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                )
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Function to close the session and all open connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get(self, url: str, header: dict, req_timeout: float) -> HttpResponse:
+        """
+        Function to send a GET request. Connection errors, timeouts and responses
+        with a status of RETRY_STATUS are retried with exponential backoff.
+
+        Args:
+            url (str): The URL to send the request
+            header (dict): The headers to include in the request
+            req_timeout (float): Timeout of one attempt in seconds
+
+        Returns:
+            HttpResponse: Response of the last attempt
+        """
+        timeout = aiohttp.ClientTimeout(total=req_timeout)
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.session.get(
+                    url, headers=header, timeout=timeout
+                ) as response:
+                    result = HttpResponse(
+                        status_code=response.status,
+                        url=str(response.url),
+                        headers=dict(response.headers),
+                        content=await response.read(),
+                        encoding=response.get_encoding(),
+                    )
+                if result.status_code not in RETRY_STATUS or attempt == self.retries:
+                    return result
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(self.backoff * 2**attempt)
+        return result
+
+
+http_client = HttpClient()
+
+
 async def generic_http_request(
     url: str,
     header: dict,
     req_timeout: int = GENERIC_REQUEST_TIMEOUT_THR,
     logger: watcher.loguru.Logger = None,
-) -> requests.Response:
+    client: HttpClient = None,
+) -> HttpResponse:
     """Function for http requests with all possible exceptions which are then stored by a logger.
 
     Args:
         url (str): The URL to send the request
         header (dict): The headers to include in the request
+        req_timeout (int, optional): Timeout of one attempt in seconds
         logger (loguru.logger): Logger for storing the error
+        client (HttpClient, optional): Client for the request. Defaults to the shared client.
 
     Returns:
-        requests.Response: Return value from http request or in failure case a None
+        HttpResponse: Return value from http request or in failure case a None
     """
     try:
-        return requests.get(
-            url, headers=header, timeout=req_timeout
-        )
-    except requests.exceptions.HTTPError as err:
+        return await (client or http_client).get(url, header, req_timeout)
+    except aiohttp.ClientResponseError as err:
         if logger is not None:
             watcher.logger.error(f"HTTP error occurred: {err}")
         else:
             print(f"HTTP error occurred: {err}")
         return None
-    except requests.exceptions.ConnectTimeout as err:
+    except asyncio.TimeoutError as err:
         if logger is not None:
             watcher.logger.error(f"Connection timeout error occurred: {err}")
         else:
             print(f"Connection timeout error occurred: {err}")
         return None
-    except requests.exceptions.ConnectionError as err:
+    except aiohttp.ClientConnectionError as err:
         if logger is not None:
             watcher.logger.error(f"Connection error occurred: {err}")
         else:
             print(f"Connection error occurred: {err}")
         return None
+
+
+class HttpCache:
+    """
+    On-disk cache for conditional GET requests. For every URL the body and the
+    validators ETag and Last-Modified of the last successful response are stored.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def _path(self, url: str, suffix: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.{suffix}"
+
+    def validators(self, url: str) -> dict:
+        """
+        Function to get the headers for a conditional request of the URL.
+
+        Args:
+            url (str): URL of the request
+
+        Returns:
+            dict: If-None-Match and If-Modified-Since headers or an empty dict
+        """
+        meta_path = self._path(url, "json")
+        if not meta_path.exists() or not self._path(url, "body").exists():
+            return {}
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def body(self, url: str) -> bytes | None:
+        """
+        Function to get the cached body of the URL.
+
+        Args:
+            url (str): URL of the request
+
+        Returns:
+            bytes | None: Body of the last successful response or None
+        """
+        body_path = self._path(url, "body")
+        return body_path.read_bytes() if body_path.exists() else None
+
+    def store(self, url: str, response: HttpResponse) -> None:
+        """
+        Function to store the body and the validators of a response.
+
+        Args:
+            url (str): URL of the request
+            response (HttpResponse): Successful response
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        self._path(url, "body").write_bytes(response.content)
+        self._path(url, "json").write_text(
+            json.dumps(
+                {
+                    "url": url,
+                    "etag": headers.get("etag"),
+                    "last_modified": headers.get("last-modified"),
+                }
+            ),
+            encoding="utf-8",
+        )
+
+
+async def conditional_http_request(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+    url: str,
+    header: dict,
+    cache: HttpCache,
+    req_timeout: int = GENERIC_REQUEST_TIMEOUT_THR,
+    logger: watcher.loguru.Logger = None,
+    client: HttpClient = None,
+) -> HttpResponse:
+    """Function for conditional http requests with the validators of the cache. If the
+    resource is unchanged the server answers with status 304 and without body. A
+    successful response is not stored, the caller stores it with cache.store once it
+    is processed, so a failed processing is repeated with the next request.
+
+    Args:
+        url (str): The URL to send the request
+        header (dict): The headers to include in the request
+        cache (HttpCache): Cache with the validators of the last response
+        req_timeout (int, optional): Timeout of one attempt in seconds
+        logger (loguru.logger): Logger for storing the error
+        client (HttpClient, optional): Client for the request. Defaults to the shared client.
+
+    Returns:
+        HttpResponse: Return value from http request or in failure case a None
+    """
+    return await generic_http_request(
+        url,
+        {**header, **cache.validators(url)},
+        req_timeout=req_timeout,
+        logger=logger,
+        client=client,
+    )
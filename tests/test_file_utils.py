@@ -0,0 +1,57 @@
+"""
+This file contains unit tests for the validation and change detection of the task import.
+"""
+
+import pandas as pd
+from src.file_utils import (
+    TASK_COLUMNS,
+    check_rows,
+    check_updated,
+    normalize_tasks,
+    task_fingerprints,
+)
+
+
+def test_import_splits_new_changed_and_failed_rows():
+    """
+    Verifies that the vectorised import finds invalid rows, new tasks and changed tasks
+    by the content fingerprint.
+
+    Steps:
+    1. Create a task table with a new, a changed, an unchanged, a duplicated and
+       two invalid rows.
+    2. Validate and normalize the table and compare it with the existing tasks.
+    3. Assert the failed rows, the new tasks, the changed tasks with their ID and the
+       number of unchanged tasks.
+    """
+    df = pd.DataFrame(
+        [
+            ["new", "yes", "no", 10, "d", None, 1, "task"],
+            ["changed", "yes", "no", 20, "new text", "en", 1, "task"],
+            ["same", "no", "yes", 30, "d", "en", 1, "main"],
+            [None, "yes", "no", 40, "d", "en", 1, "task"],
+            ["bad_game", "yes", "no", 50, "d", "en", "one", "task"],
+            ["new", "no", "no", 15, "d2", None, 1, "task"],
+        ],
+        columns=TASK_COLUMNS,
+    )
+    existing = pd.DataFrame(
+        [
+            [1, "changed", True, False, 20, "old text", "en", 1, "task"],
+            [2, "same", False, True, 30.0, "d", "en", 1, "main"],
+        ],
+        columns=["id"] + TASK_COLUMNS,
+    )
+    existing["fingerprint"] = task_fingerprints(existing)
+    valid = check_rows(df)
+    new_tasks, changed_tasks, unchanged = check_updated(
+        normalize_tasks(df[valid]), existing[["id", "name", "fingerprint"]]
+    )
+    assert df.index[~valid].tolist() == [3, 4]
+    assert unchanged == 1
+    assert new_tasks[["name", "active", "rating", "description"]].values.tolist() == [
+        ["new", False, 15, "d2"]
+    ]
+    assert changed_tasks[["id", "name", "description"]].values.tolist() == [
+        [1, "changed", "new text"]
+    ]
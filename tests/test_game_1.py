@@ -0,0 +1,208 @@
+"""
+This file contains unit tests for the evaluation flow of 'Fast and hungry, task hunt'.
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import pytest
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.db import (
+    Base,
+    Game,
+    Game1PlayerResult,
+    GamePlayerAssociation,
+    GameStatus,
+    League,
+    Player,
+    Rank,
+    Reaction,
+    ReactionStatus,
+    active_games,
+)
+from src.game_1 import enter_results_game_1
+from src.game_setup import StatusSelect, evaluate_stopped_games
+from src.lock_manager import LockManager
+
+MESSAGE_ID = 555
+# Completed tasks of each player as registered reactions on the game message, the
+# results modal has room for two players
+COMPLETED_TASKS = {"1001": ["1️⃣", "2️⃣", "3️⃣"], "1002": ["1️⃣"]}
+
+
+class FakeInteraction:
+    """
+    Interaction that records the sent messages and hands over every sent view or modal.
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.views = asyncio.Queue()
+        self.response = SimpleNamespace(
+            send_message=self.send,
+            send_modal=self.views.put,
+            edit_message=AsyncMock(),
+        )
+        self.followup = SimpleNamespace(send=self.send)
+
+    async def send(self, content=None, **kwargs):
+        """
+        Records a message and hands over its view.
+        """
+        self.messages.append(content)
+        if kwargs.get("view") is not None:
+            await self.views.put(kwargs["view"])
+
+
+@pytest.fixture(name="config")
+async def fixture_config(tmp_path):
+    """
+    Creates a minimal app configuration with a paused game of two players and the
+    registered reactions of their completed tasks.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    config = SimpleNamespace(
+        db=SimpleNamespace(
+            session=async_sessionmaker(engine, expire_on_commit=False),
+            locks=LockManager(),
+        ),
+        game=SimpleNamespace(
+            weighted_rank_task_g1=10, weighted_rank_surv_g1=5, weighted_rank_days_g1=1
+        ),
+        watcher=SimpleNamespace(logger=logger),
+    )
+    async with config.db.session() as session:
+        async with session.begin():
+            session.add(
+                Game(
+                    id=1,
+                    name="Fast and hungry, task hunt",
+                    status=GameStatus.PAUSED,
+                    timestamp=datetime.now(),
+                    message_id=MESSAGE_ID,
+                    channel_id=1,
+                )
+            )
+            for player_id, (dc_id, emojis) in enumerate(COMPLETED_TASKS.items(), start=1):
+                session.add(Player(id=player_id, dc_id=dc_id, name=f"player{dc_id}", hours=10))
+                session.add(GamePlayerAssociation(game_id=1, player_id=player_id))
+                session.add_all(
+                    Reaction(
+                        dc_id=dc_id,
+                        status=ReactionStatus.REGISTERED,
+                        timestamp=datetime.now(),
+                        message_id=MESSAGE_ID,
+                        channel_id=1,
+                        emoji=emoji,
+                        game_id=1,
+                    )
+                    for emoji in emojis
+                )
+    yield config
+    active_games.remove(1)
+    await engine.dispose()
+
+
+async def get_game(config) -> Game:
+    """
+    Helper function to load the game of the test.
+
+    Args:
+        config (SimpleNamespace): Test configuration
+
+    Returns:
+        Game: Game with ID 1
+    """
+    async with config.db.session() as session:
+        return (await session.execute(select(Game).where(Game.id == 1))).scalar_one()
+
+
+async def count(config, table) -> int:
+    """
+    Helper function to count the rows of a table.
+
+    Args:
+        config (SimpleNamespace): Test configuration
+        table (Base): Model of the table
+
+    Returns:
+        int: Number of rows
+    """
+    async with config.db.session() as session:
+        return (await session.execute(select(func.count()).select_from(table))).scalar()
+
+
+async def enter_results(config, interaction: FakeInteraction) -> bool:
+    """
+    Helper function to enter the default results of all players like a user: open
+    the modal with the button and submit it.
+
+    Args:
+        config (SimpleNamespace): Test configuration
+        interaction (FakeInteraction): Interaction of the user
+
+    Returns:
+        bool: Result of the results input
+    """
+    async with asyncio.timeout(10):
+        entered = asyncio.create_task(
+            enter_results_game_1(config, await get_game(config), interaction)
+        )
+        view = await interaction.views.get()
+        opened = asyncio.create_task(view.open_modal.callback(interaction))
+        modal = await interaction.views.get()
+        await modal.on_submit(interaction)
+        modal.stop()
+        await opened
+        return await entered
+
+
+async def test_stop_enter_results_and_batch_finish(config):
+    """
+    Verifies that a game whose results were entered separately stays stopped and is
+    finished by the batch evaluation.
+
+    Steps:
+    1. Stop the paused game with the status select.
+    2. Enter the results twice and assert that the game stays stopped with one
+       result per player.
+    3. Evaluate all stopped games and confirm the evaluation.
+    4. Assert that the game is finished, ranked by completed tasks and in the league.
+    """
+    status_select = StatusSelect(config, await get_game(config))
+    status_select._refresh_state(None, {"values": ["3"]})  # pylint: disable=protected-access
+    await status_select.callback(FakeInteraction())
+    assert (await get_game(config)).status == GameStatus.STOPPED
+
+    assert await enter_results(config, FakeInteraction())
+    assert await enter_results(config, FakeInteraction())
+    assert (await get_game(config)).status == GameStatus.STOPPED
+    assert await count(config, Game1PlayerResult) == len(COMPLETED_TASKS)
+
+    interaction = FakeInteraction()
+    async with asyncio.timeout(10):
+        evaluation = asyncio.create_task(evaluate_stopped_games(interaction, config))
+        confirmation_view = await interaction.views.get()
+        await confirmation_view.button_callback.callback(interaction)
+        await evaluation
+
+    assert (await get_game(config)).status == GameStatus.FINISHED
+    assert "Player rankings in game (ID: 1)" in interaction.messages[-1]
+    async with config.db.session() as session:
+        points = dict(
+            (
+                await session.execute(
+                    select(GamePlayerAssociation.player_id, Rank.points).join(
+                        GamePlayerAssociation,
+                        Rank.game_player_association_id == GamePlayerAssociation.id,
+                    )
+                )
+            ).all()
+        )
+    assert points == {1: 6, 2: 5}
+    assert await count(config, League) == len(COMPLETED_TASKS)
@@ -0,0 +1,218 @@
+"""
+This file contains unit tests for the rebuild and the incremental maintenance of the
+league table.
+"""
+
+import random
+from collections import defaultdict
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from loguru import logger
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.db import (
+    Base,
+    Game,
+    GamePlayerAssociation,
+    GameStatus,
+    League,
+    Player,
+    Rank,
+    add_ranks_to_league,
+    check_league_consistency,
+    rebuild_league_table,
+)
+from src.lock_manager import LockManager
+
+PLAYERS = 8
+GAMES = 12
+
+
+@pytest.fixture(name="config")
+async def fixture_config(tmp_path):
+    """
+    Creates a minimal app configuration with players and games, where every game has
+    five random players.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    config = SimpleNamespace(
+        db=SimpleNamespace(
+            session=async_sessionmaker(engine, expire_on_commit=False),
+            locks=LockManager(),
+        ),
+        watcher=SimpleNamespace(logger=logger),
+    )
+    rng = random.Random(42)
+    async with config.db.session() as session:
+        async with session.begin():
+            session.add_all(
+                Player(id=i, dc_id=str(1000 + i), name=f"player{i}", hours=10 * i)
+                for i in range(1, PLAYERS + 1)
+            )
+            for game_id in range(1, GAMES + 1):
+                session.add(
+                    Game(
+                        id=game_id,
+                        name="Fast and hungry, task hunt",
+                        status=GameStatus.STOPPED,
+                        timestamp=datetime.now(),
+                    )
+                )
+                for player_id in rng.sample(range(1, PLAYERS + 1), 5):
+                    session.add(GamePlayerAssociation(game_id=game_id, player_id=player_id))
+    yield config
+    await engine.dispose()
+
+
+async def create_ranks(config, game_ids: list[int]) -> list[Rank]:
+    """
+    Helper function to create random ranks for all players of the games.
+
+    Args:
+        config (SimpleNamespace): Test configuration
+        game_ids (list[int]): Games to create the ranks for
+
+    Returns:
+        list[Rank]: Ranks that are not yet stored
+    """
+    rng = random.Random(sum(game_ids))
+    async with config.db.session() as session:
+        association_ids = (
+            await session.execute(
+                select(GamePlayerAssociation.id)
+                .where(GamePlayerAssociation.game_id.in_(game_ids))
+                .order_by(GamePlayerAssociation.id)
+            )
+        ).scalars().all()
+    return [
+        Rank(
+            placement=1,
+            points=rng.randint(1, 6),
+            survived=rng.randint(0, 70),
+            timestamp=datetime.now(),
+            game_player_association_id=association_id,
+        )
+        for association_id in association_ids
+    ]
+
+
+async def per_row_league(config) -> list[tuple]:
+    """
+    Helper function with the former per-row rebuild: all ranks are loaded, summed per
+    player in Python and sorted by points and survived days. Ties are broken by the
+    player ID like the set-based rebuild.
+
+    Args:
+        config (SimpleNamespace): Test configuration
+
+    Returns:
+        list[tuple]: player_id, points, survived and position for each player
+    """
+    async with config.db.session() as session:
+        ranks = (
+            await session.execute(
+                select(Rank, GamePlayerAssociation.player_id).join(
+                    GamePlayerAssociation,
+                    Rank.game_player_association_id == GamePlayerAssociation.id,
+                )
+            )
+        ).all()
+    player_data = defaultdict(lambda: {"total_points": 0, "total_survived": 0})
+    for rank, player_id in ranks:
+        player_data[player_id]["total_points"] += rank.points
+        player_data[player_id]["total_survived"] += rank.survived
+    sorted_players = sorted(
+        player_data.items(),
+        key=lambda x: (-x[1]["total_points"], -x[1]["total_survived"], x[0]),
+    )
+    return [
+        (player_id, value["total_points"], value["total_survived"], position)
+        for position, (player_id, value) in enumerate(sorted_players, start=1)
+    ]
+
+
+async def stored_league(config) -> list[tuple]:
+    """
+    Helper function to read the stored league table in league order.
+
+    Args:
+        config (SimpleNamespace): Test configuration
+
+    Returns:
+        list[tuple]: player_id, points, survived and position for each player
+    """
+    async with config.db.session() as session:
+        return [
+            tuple(row)
+            for row in (
+                await session.execute(
+                    select(
+                        League.player_id, League.points, League.survived, League.position
+                    ).order_by(League.position)
+                )
+            ).all()
+        ]
+
+
+async def test_rebuild_matches_per_row_rebuild(config):
+    """
+    Verifies that the set-based rebuild creates the same league table as the former
+    per-row rebuild.
+
+    Steps:
+    1. Store random ranks of all games.
+    2. Rebuild the league table.
+    3. Assert that the table equals the result of the per-row rebuild and that all
+       players are reported as changes of the empty table.
+    """
+    async with config.db.session() as session:
+        async with session.begin():
+            session.add_all(await create_ranks(config, list(range(1, GAMES + 1))))
+    changes = await rebuild_league_table(config)
+    expected = await per_row_league(config)
+    assert await stored_league(config) == expected
+    assert len(changes) == len(expected)
+
+
+async def test_incremental_update_matches_rebuild(config):
+    """
+    Verifies that the league table maintained with the ranks of each finished game
+    equals a full rebuild.
+
+    Steps:
+    1. Add the ranks of the games in three steps to the league table.
+    2. Assert that a dry run of the rebuild finds no differences.
+    3. Assert that the table equals the result of the per-row rebuild.
+    """
+    for game_ids in ([1, 2, 3], [4], list(range(5, GAMES + 1))):
+        await add_ranks_to_league(config, await create_ranks(config, game_ids))
+        assert await rebuild_league_table(config, dry_run=True) == []
+    assert await stored_league(config) == await per_row_league(config)
+
+
+async def test_consistency_check_repairs_corrupted_row(config):
+    """
+    Verifies that the consistency check finds a corrupted league entry and repairs
+    the table.
+
+    Steps:
+    1. Add the ranks of all games to the league table.
+    2. Change the points of the player on the last position to a leading value.
+    3. Assert that the check reports the player and that the table equals the
+       per-row rebuild afterwards.
+    4. Assert that a second check finds no differences.
+    """
+    await add_ranks_to_league(config, await create_ranks(config, list(range(1, GAMES + 1))))
+    last_player = (await stored_league(config))[-1][0]
+    async with config.db.session() as session:
+        async with session.begin():
+            await session.execute(
+                update(League).where(League.player_id == last_player).values(points=1000)
+            )
+    changes = await check_league_consistency(config)
+    assert last_player in [change.player_id for change in changes]
+    assert await stored_league(config) == await per_row_league(config)
+    assert await check_league_consistency(config) == []
@@ -0,0 +1,91 @@
+"""
+This file contains unit tests for the lock manager of the database writes.
+"""
+
+import asyncio
+import pytest
+from src.lock_manager import LockManager
+
+
+async def test_opposite_key_order_does_not_deadlock():
+    """
+    Verifies that the locks are acquired in the same order regardless of the order of
+    the keys, so that two writers with the same keys do not deadlock.
+
+    Steps:
+    1. Start two writers that request the same two locks in opposite order and yield
+       to the event loop while holding them.
+    2. Assert that both writers finish and entered the locks one after the other.
+    """
+    manager = LockManager()
+    events = []
+
+    async def writer(name: str, *keys: tuple) -> None:
+        async with manager.acquire(*keys):
+            events.append(f"{name} in")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} out")
+
+    await asyncio.wait_for(
+        asyncio.gather(
+            writer("a", ("game", 1), ("league",)),
+            writer("b", ("league",), ("game", 1)),
+        ),
+        timeout=1,
+    )
+    assert events == ["a in", "a out", "b in", "b out"]
+
+
+async def test_locks_released_on_exception():
+    """
+    Verifies that all locks are released and removed if the block raises an error.
+
+    Steps:
+    1. Raise an error while holding two locks.
+    2. Assert that no lock and no holder is left.
+    3. Assert that the locks can be acquired again without waiting.
+    """
+    manager = LockManager()
+    with pytest.raises(ValueError):
+        async with manager.acquire(("game", 1), ("player", "123")):
+            assert len(manager) == 2
+            raise ValueError("write failed")
+    assert len(manager) == 0
+    assert not manager.holders()
+    async with asyncio.timeout(1):
+        async with manager.acquire(("game", 1), ("player", "123")):
+            pass
+
+
+async def test_locks_removed_after_last_user():
+    """
+    Verifies that a lock is kept while a task holds or waits for it and removed with
+    the last user, also if a waiting task is cancelled.
+
+    Steps:
+    1. Hold a lock and start two tasks that wait for it.
+    2. Cancel one waiting task and assert that the lock is still present.
+    3. Release the lock, let the other task finish and assert that no lock is left.
+    4. Acquire many different keys one after the other and assert that no lock is left.
+    """
+    manager = LockManager()
+    key = ("game", 1)
+
+    async def waiter() -> None:
+        async with manager.acquire(key):
+            pass
+
+    async with manager.acquire(key):
+        cancelled = asyncio.create_task(waiter())
+        finished = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert len(manager) == 1
+    await finished
+    assert len(manager) == 0
+    for game_id in range(100):
+        async with manager.acquire(("game", game_id)):
+            pass
+    assert len(manager) == 0
@@ -0,0 +1,173 @@
+"""
+This file contains unit tests for the schema migrations of the database.
+"""
+
+from types import SimpleNamespace
+import pytest
+from loguru import logger
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.db import Base, Reaction
+from src.migrations import MigrationContext, run_migrations, migrations
+
+# Schema of a database created by the version before the migrations were introduced
+BASELINE_SCHEMA = [
+    (
+        "CREATE TABLE players (id INTEGER NOT NULL, dc_id VARCHAR NOT NULL, name "
+        "VARCHAR NOT NULL, hours INTEGER NOT NULL, PRIMARY KEY (id))"
+    ),
+    (
+        "CREATE TABLE games (id INTEGER NOT NULL, name VARCHAR NOT NULL, status "
+        "VARCHAR(8) NOT NULL, playing_days INTEGER NOT NULL, timestamp DATETIME "
+        "NOT NULL, message_id INTEGER, channel_id INTEGER, PRIMARY KEY (id))"
+    ),
+    (
+        "CREATE TABLE tasks (id INTEGER NOT NULL, name VARCHAR NOT NULL, active "
+        "BOOLEAN NOT NULL, once BOOLEAN NOT NULL, rating INTEGER NOT NULL, "
+        "description VARCHAR NOT NULL, language VARCHAR, game INTEGER NOT NULL, "
+        "type VARCHAR NOT NULL, PRIMARY KEY (id))"
+    ),
+    (
+        "CREATE TABLE game_player_association (id INTEGER NOT NULL, game_id "
+        "INTEGER NOT NULL, player_id INTEGER NOT NULL, PRIMARY KEY (id), FOREIGN "
+        "KEY(game_id) REFERENCES games (id), FOREIGN KEY(player_id) REFERENCES "
+        "players (id))"
+    ),
+    (
+        "CREATE TABLE league (id INTEGER NOT NULL, points INTEGER NOT NULL, "
+        "player_id INTEGER NOT NULL, survived INTEGER NOT NULL, PRIMARY KEY (id), "
+        "FOREIGN KEY(player_id) REFERENCES players (id))"
+    ),
+    (
+        "CREATE TABLE exercises (id INTEGER NOT NULL, timestamp DATETIME NOT "
+        "NULL, task_id INTEGER NOT NULL, player_id INTEGER NOT NULL, PRIMARY KEY "
+        "(id), FOREIGN KEY(task_id) REFERENCES tasks (id), FOREIGN KEY(player_id) "
+        "REFERENCES players (id))"
+    ),
+    (
+        "CREATE TABLE reactions (id INTEGER NOT NULL, dc_id VARCHAR NOT NULL, "
+        "status VARCHAR(14) NOT NULL, timestamp DATETIME NOT NULL, last_modified "
+        "DATETIME, message_id INTEGER NOT NULL, channel_id INTEGER NOT NULL, "
+        "emoji VARCHAR NOT NULL, game_id INTEGER, PRIMARY KEY (id), FOREIGN "
+        "KEY(game_id) REFERENCES games (id))"
+    ),
+    (
+        "CREATE TABLE ranks (id INTEGER NOT NULL, placement INTEGER, points "
+        "INTEGER NOT NULL, timestamp DATETIME NOT NULL, survived INTEGER NOT "
+        "NULL, game_player_association_id INTEGER NOT NULL, PRIMARY KEY (id), "
+        "FOREIGN KEY(game_player_association_id) REFERENCES "
+        "game_player_association (id))"
+    ),
+    (
+        "CREATE TABLE game1_player_results (id INTEGER NOT NULL, player_days "
+        "INTEGER NOT NULL, total_tasks INTEGER NOT NULL, completed_tasks INTEGER "
+        "NOT NULL, survived VARCHAR NOT NULL, game_player_association_id INTEGER "
+        "NOT NULL, PRIMARY KEY (id), FOREIGN KEY(game_player_association_id) "
+        "REFERENCES game_player_association (id))"
+    ),
+    (
+        "CREATE TABLE quests (id INTEGER NOT NULL, start_time DATETIME NOT NULL, "
+        "end_time DATETIME, status VARCHAR NOT NULL, task_id INTEGER NOT NULL, "
+        "position INTEGER NOT NULL, game_player_association_id INTEGER NOT NULL, "
+        "PRIMARY KEY (id), FOREIGN KEY(task_id) REFERENCES tasks (id), FOREIGN "
+        "KEY(game_player_association_id) REFERENCES game_player_association (id))"
+    ),
+]
+
+
+@pytest.fixture(name="config")
+async def fixture_config(tmp_path):
+    """
+    Creates a minimal app configuration with an empty SQLite database.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    yield SimpleNamespace(
+        db=SimpleNamespace(engine=engine, migration_batch_size=3),
+        watcher=SimpleNamespace(logger=logger),
+    )
+    await engine.dispose()
+
+
+async def test_run_migrations_fresh_and_repeated(config):
+    """
+    Verifies that all migrations are applied to a new database only once.
+
+    Steps:
+    1. Run the migrations on an empty database.
+    2. Assert that the latest version is reached and every version is recorded.
+    3. Run the migrations again and assert that the version is unchanged.
+    """
+    latest = max(migration.version for migration in migrations)
+    assert await run_migrations(config) == latest
+    async with config.db.engine.connect() as conn:
+        versions = (
+            await conn.exec_driver_sql("SELECT version FROM schema_version")
+        ).scalars().all()
+    assert sorted(versions) == [migration.version for migration in migrations]
+    assert await run_migrations(config) == latest
+
+
+async def test_rebuild_table_in_batches(config):
+    """
+    Verifies that a table rebuild copies all rows and restores the indexes.
+
+    Steps:
+    1. Create the schema and insert ten reactions.
+    2. Rebuild the reactions table with a batch size of three rows.
+    3. Assert that all rows and the indexes of the table are present.
+    """
+    await run_migrations(config)
+    async with config.db.engine.begin() as conn:
+        for i in range(10):
+            await conn.exec_driver_sql(
+                "INSERT INTO reactions (dc_id, status, timestamp, message_id, channel_id, emoji) "
+                f"VALUES ('{i}', 'NEW', '2025-01-01', {i}, 1, 'x')"
+            )
+    await MigrationContext(config).rebuild_table(Reaction.__table__)
+    async with config.db.engine.connect() as conn:
+        dc_ids = (
+            await conn.exec_driver_sql("SELECT dc_id FROM reactions ORDER BY id")
+        ).scalars().all()
+        indexes = (
+            await conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='reactions'"
+            )
+        ).scalars().all()
+    assert dc_ids == [str(i) for i in range(10)]
+    assert {index.name for index in Reaction.__table__.indexes} <= set(indexes)
+
+
+async def test_upgrade_database_of_baseline_schema(config):
+    """
+    Verifies that a database created before the migrations is upgraded to the latest
+    version with all columns and indexes of the models.
+
+    Steps:
+    1. Create the tables of the baseline schema without schema version and one league row.
+    2. Run the migrations.
+    3. Assert the latest version, the columns and indexes of every table, including
+       the league position index, and the initialized league position.
+    """
+    async with config.db.engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            await conn.exec_driver_sql(statement)
+        await conn.exec_driver_sql("INSERT INTO players VALUES (1, '1', 'p', 0)")
+        await conn.exec_driver_sql("INSERT INTO league VALUES (7, 3, 1, 20)")
+    assert await run_migrations(config) == max(m.version for m in migrations)
+    context = MigrationContext(config)
+    async with config.db.engine.connect() as conn:
+        indexes = set(
+            (
+                await conn.exec_driver_sql(
+                    "SELECT name FROM sqlite_master WHERE type='index'"
+                )
+            ).scalars()
+        )
+        position = (
+            await conn.exec_driver_sql("SELECT position FROM league")
+        ).scalar_one()
+    for table in Base.metadata.sorted_tables:
+        assert [column.name for column in table.columns] == await context.get_columns(
+            table.name
+        )
+        assert {index.name for index in table.indexes} <= indexes
+    assert position == 7
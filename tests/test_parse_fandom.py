@@ -0,0 +1,73 @@
+"""
+This file contains unit tests for the conditional download and merge of the wiki items.
+"""
+
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from loguru import logger
+import src
+from src.parse_fandom import parse_items
+
+ITEM_PAGE = """
+<html><body><table>
+<tr><th>Name</th><th>Type</th><th>Stack</th><th>Floatable?</th><th>Acquisition</th></tr>
+<tr><td>Log</td><td>Resource</td><td>20</td><td>Yes</td><td>Tree</td></tr>
+<tr><td>Rocks</td><td>Resource</td><td>40</td><td>No</td><td>Boulder</td></tr>
+</table></body></html>
+"""
+
+
+@pytest.fixture(name="wiki_server")
+async def fixture_wiki_server():
+    """
+    Starts a local HTTP stub server with an item page that answers conditional
+    requests with the ETag "v1" with status 304.
+    """
+    statuses = []
+
+    async def items(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            statuses.append(304)
+            return web.Response(status=304)
+        statuses.append(200)
+        return web.Response(text=ITEM_PAGE, headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/items", items)
+    server = TestServer(app)
+    await server.start_server()
+    server.statuses = statuses
+    yield server
+    await server.close()
+
+
+async def test_failed_merge_is_repeated(wiki_server, tmp_path):
+    """
+    Verifies that the page of a failed merge is not cached, so the next run downloads
+    and merges it again instead of getting a 304 response.
+
+    Steps:
+    1. Parse the items into a directory that does not exist, so the merge fails.
+    2. Parse the items again into a valid path and assert the download and the merge.
+    3. Parse a third time and assert that the unchanged page is answered with 304.
+    """
+    config = SimpleNamespace(
+        gen_req=SimpleNamespace(request_timeout=5),
+        watcher=SimpleNamespace(logger=logger),
+    )
+    url = str(wiki_server.make_url("/items"))
+    item_list = tmp_path / "item_list.csv"
+    client = src.HttpClient(retries=0, backoff=0)
+    try:
+        assert not await parse_items(
+            config, url, tmp_path / "missing" / "item_list.csv", tmp_path / "cache", client
+        )
+        assert await parse_items(config, url, item_list, tmp_path / "cache", client)
+        assert await parse_items(config, url, item_list, tmp_path / "cache", client)
+    finally:
+        await client.close()
+    assert wiki_server.statuses == [200, 200, 304]
+    assert pd.read_csv(item_list)["Name"].tolist() == ["Log", "Rocks"]
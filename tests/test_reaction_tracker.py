@@ -0,0 +1,116 @@
+"""
+This file contains unit tests for the reaction classification and the handling of
+reactions in the reaction tracker.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import pytest
+from loguru import logger
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.db import GameStatus, ReactionStatus, active_games
+from src.game_index import GameIndexEntry
+from src.lock_manager import LockManager
+from src.reaction_tracker import classify_reaction, schedule_reaction_tracker_add
+from src.reaction_writer import reaction_writer
+
+GAME_EMOJIS = frozenset(["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "🇭"])
+PLAYER_ID = 1001
+OTHER_ID = 2002
+
+
+def create_entry(status: GameStatus) -> GameIndexEntry:
+    """
+    Helper function to create a cached game with one player and the game emojis.
+
+    Args:
+        status (GameStatus): Status of the game
+
+    Returns:
+        GameIndexEntry: Cached game state
+    """
+    return GameIndexEntry(
+        game_id=7,
+        name="Fast and hungry, task hunt",
+        status=status,
+        emojis=GAME_EMOJIS,
+        player_dc_ids=frozenset([PLAYER_ID]),
+        message_id=555,
+        channel_id=1,
+    )
+
+
+@pytest.mark.parametrize(
+    "status, emoji, user_id, expected_status, expected_remove",
+    [
+        (GameStatus.CREATED, "1️⃣", PLAYER_ID, ReactionStatus.DELETED_STATUS, True),
+        (GameStatus.PAUSED, "🇭", OTHER_ID, ReactionStatus.DELETED_STATUS, True),
+        (GameStatus.RUNNING, "2️⃣", PLAYER_ID, ReactionStatus.REGISTERED, False),
+        (GameStatus.RUNNING, "2️⃣", OTHER_ID, ReactionStatus.DELETED_PLAYER, True),
+        (GameStatus.RUNNING, "👍", PLAYER_ID, ReactionStatus.SUPPORTER, False),
+        (GameStatus.CREATED, "👍", OTHER_ID, ReactionStatus.SUPPORTER, False),
+        (GameStatus.FAILURE, "1️⃣", PLAYER_ID, ReactionStatus.REVIEW, False),
+    ],
+)
+def test_classify_reaction(status, emoji, user_id, expected_status, expected_remove):
+    """
+    Verifies the classification of a reaction for all game status and emoji combinations.
+
+    Steps:
+    1. Create a cached game in the given status.
+    2. Classify a reaction with the given emoji and user.
+    3. Assert the final status, the game ID and whether the reaction has to be removed.
+    """
+    classification = classify_reaction(create_entry(status), emoji, user_id)
+    assert classification.status == expected_status
+    assert classification.game_id == 7
+    assert classification.remove == expected_remove
+
+
+async def test_lost_registered_reaction_is_reported(tmp_path):
+    """
+    Verifies that a registered reaction which cannot be stored is removed from the
+    message and the user is asked to react again.
+
+    Steps:
+    1. Start the reaction writer on a database without schema, so every write fails.
+    2. Register a running game and add a game reaction of a player.
+    3. Assert that the reaction is removed and the user gets a message.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    config = SimpleNamespace(
+        db=SimpleNamespace(
+            session=async_sessionmaker(engine, expire_on_commit=False),
+            locks=LockManager(),
+            reaction_batch_size=100,
+            reaction_flush_ms=10,
+        ),
+        watcher=SimpleNamespace(logger=logger),
+    )
+    message = SimpleNamespace(remove_reaction=AsyncMock())
+    user = SimpleNamespace(send=AsyncMock())
+    bot = SimpleNamespace(
+        fetch_channel=AsyncMock(
+            return_value=SimpleNamespace(fetch_message=AsyncMock(return_value=message))
+        ),
+        fetch_user=AsyncMock(return_value=user),
+    )
+    payload = SimpleNamespace(
+        emoji=SimpleNamespace(name="2️⃣"),
+        member=None,
+        user_id=PLAYER_ID,
+        message_id=555,
+        channel_id=1,
+    )
+    active_games.register(
+        7, "Fast and hungry, task hunt", GameStatus.RUNNING, [PLAYER_ID], 555, 1
+    )
+    reaction_writer.start(config)
+    try:
+        await schedule_reaction_tracker_add(bot, config, payload)
+    finally:
+        await reaction_writer.stop()
+        active_games.remove(7)
+        await engine.dispose()
+    message.remove_reaction.assert_awaited_once()
+    user.send.assert_awaited_once()
@@ -0,0 +1,109 @@
+"""
+This file contains unit tests for the write-behind pipeline of the reactions.
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.db import Base, Reaction, ReactionStatus
+from src.lock_manager import LockManager
+from src.reaction_writer import ReactionWriter
+
+
+@pytest.fixture(name="config")
+async def fixture_config(tmp_path):
+    """
+    Creates a minimal app configuration with the schema in an empty SQLite database.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield SimpleNamespace(
+        db=SimpleNamespace(
+            session=async_sessionmaker(engine, expire_on_commit=False),
+            locks=LockManager(),
+            reaction_batch_size=100,
+            reaction_flush_ms=50,
+        ),
+        watcher=SimpleNamespace(logger=logger),
+    )
+    await engine.dispose()
+
+
+def create_reaction(dc_id: str, emoji: str | None) -> Reaction:
+    """
+    Helper function to create a registered reaction on game 1.
+
+    Args:
+        dc_id (str): Discord ID of the reacting user
+        emoji (str | None): Emoji of the reaction, None violates the schema
+
+    Returns:
+        Reaction: Reaction to write
+    """
+    return Reaction(
+        dc_id=dc_id,
+        status=ReactionStatus.REGISTERED,
+        timestamp=datetime.now(),
+        message_id=555,
+        channel_id=1,
+        emoji=emoji,
+        game_id=1,
+    )
+
+
+async def test_failed_row_does_not_drop_batch(config):
+    """
+    Verifies that a faulty reaction only loses itself and not the rest of its batch.
+
+    Steps:
+    1. Start the writer and submit three durable reactions in one batch, the second
+       one without emoji.
+    2. Assert that only the faulty reaction is acknowledged with False.
+    3. Assert that the other two reactions are stored.
+    """
+    writer = ReactionWriter()
+    writer.start(config)
+    try:
+        acks = await asyncio.gather(
+            writer.submit(config, create_reaction("1", "1️⃣"), durable=True),
+            writer.submit(config, create_reaction("2", None), durable=True),
+            writer.submit(config, create_reaction("3", "2️⃣"), durable=True),
+        )
+    finally:
+        await writer.stop()
+    assert acks == [True, False, True]
+    async with config.db.session() as session:
+        dc_ids = (await session.execute(select(Reaction.dc_id))).scalars().all()
+    assert sorted(dc_ids) == ["1", "3"]
+
+
+async def test_unexpected_error_resolves_batch(config):
+    """
+    Verifies that an error other than a database error does not end the writer and
+    every waiting caller of the batch gets an answer.
+
+    Steps:
+    1. Start the writer with an insert that raises an OSError.
+    2. Submit a durable reaction and flush the writer.
+    3. Assert that the reaction is acknowledged with False, the flush returns and the
+       writer is still running.
+    """
+    writer = ReactionWriter()
+    writer.start(config)
+
+    async def broken_insert(_reactions):
+        raise OSError("disk I/O error")
+
+    writer._insert = broken_insert  # pylint: disable=protected-access
+    try:
+        async with asyncio.timeout(5):
+            assert not await writer.submit(config, create_reaction("1", "1️⃣"), durable=True)
+            await writer.flush()
+        assert writer.running
+    finally:
+        await writer.stop()
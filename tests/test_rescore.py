@@ -0,0 +1,36 @@
+"""
+This file contains unit tests for the offline re-scoring of finished games.
+"""
+
+import numpy as np
+from src.db import diff_league
+from src.rescore import parse_profile, rescore_league
+
+
+def test_rescore_league_with_other_weights():
+    """
+    Verifies that the league table is recalculated from the player results with the
+    given weights and compared with the stored league table.
+
+    Steps:
+    1. Create the results of two games with three players.
+    2. Re-score the results with weights for tasks and for survival.
+    3. Assert the league tables and the differences between both profiles.
+    """
+    results = {
+        "game_id": np.array([1, 1, 1, 2, 2, 2]),
+        "player_id": np.array([10, 20, 30, 10, 20, 30]),
+        "completed_tasks": np.array([5, 3, 3, 2, 4, 1]),
+        "survived": np.array([False, True, True, False, True, False]),
+        "player_days": np.array([20, 70, 70, 30, 70, 40]),
+    }
+    tasks_league = rescore_league(results, parse_profile("10000,1000,1"))
+    survival_league = rescore_league(results, parse_profile("0,1000,1"))
+    assert tasks_league == [(20, 11, 140), (10, 11, 50), (30, 9, 110)]
+    assert survival_league == [(20, 12, 140), (30, 11, 110), (10, 9, 50)]
+    changes = diff_league(tasks_league, survival_league)
+    assert [(change.player_id, change.old_position, change.new_position) for change in changes] == [
+        (10, 2, 3),
+        (20, 1, 1),
+        (30, 3, 2),
+    ]
@@ -0,0 +1,61 @@
+"""
+This file contains unit tests for the vectorised scoring of game 1 results.
+"""
+
+import random
+import numpy as np
+import pytest
+from src.scoring import ScoreWeights, score_games
+
+WEIGHTS = ScoreWeights(10, 5, 1)
+
+
+def loop_ranking(results: list[tuple]) -> list[tuple]:
+    """
+    Reference implementation of the former ranking loop of one game.
+
+    Args:
+        results (list[tuple]): completed tasks, survived and player days of each player
+
+    Returns:
+        list[tuple]: Index, score, placement and points of each player, best first
+    """
+    scores = [
+        (index, tasks * WEIGHTS.tasks + survived * WEIGHTS.survived + days * WEIGHTS.days)
+        for index, (tasks, survived, days) in enumerate(results)
+    ]
+    ranking = []
+    rank, points, last_score = 1, 6, 0
+    for index, score in sorted(scores, key=lambda x: x[1], reverse=True):
+        if score < last_score:
+            rank += 1
+            points -= 1
+        last_score = score
+        ranking.append((index, score, rank, points))
+    return ranking
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_score_games_matches_ranking_loop(seed):
+    """
+    Verifies that the vectorised scoring ranks several games like the former loop.
+
+    Steps:
+    1. Create random results with many ties for several games in mixed order.
+    2. Score all games with one call and every game with the reference loop.
+    3. Assert equal order, scores, placements and points for every game.
+    """
+    rng = random.Random(seed)
+    rows = [
+        (rng.randint(1, 5), rng.randint(0, 5), rng.random() < 0.5, rng.choice([0, 10, 70]))
+        for _ in range(60)
+    ]
+    game_ids, tasks, survived, days = (np.array(column) for column in zip(*rows))
+    result = score_games(game_ids, tasks, survived, days, WEIGHTS)
+    for game_id in sorted(set(game_ids.tolist())):
+        indexes = [i for i in result.order if game_ids[i] == game_id]
+        expected = loop_ranking([rows[i][1:] for i in np.flatnonzero(game_ids == game_id)])
+        assert [
+            (result.scores[i], result.placements[i], result.points[i]) for i in indexes
+        ] == [(score, rank, points) for _, score, rank, points in expected]
+        assert indexes == [np.flatnonzero(game_ids == game_id)[i] for i, *_ in expected]
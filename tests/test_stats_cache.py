@@ -0,0 +1,72 @@
+"""
+This file contains unit tests for the cached rank inputs and the vectorised rank
+calculation.
+"""
+
+import random
+import pytest
+from src.stats_cache import GameStatsCache, StatsSnapshot, player_ranks
+
+
+def loop_rank(hours: int, position: int, snapshot: StatsSnapshot) -> float:
+    """
+    Reference implementation of the former rank calculation of one player.
+
+    Args:
+        hours (int): Playing hours of the player
+        position (int): League position of the player, 0 if not in the league
+        snapshot (StatsSnapshot): Rank inputs
+
+    Returns:
+        float: Rank of the player
+    """
+    game_score = 0.4 * (hours / snapshot.max_hours)
+    if position < 1:
+        return game_score
+    return game_score + 0.6 * (
+        1 - ((position - 1) / (snapshot.count_league_participants - 1))
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_player_ranks_match_former_calculation(seed):
+    """
+    Verifies that the vectorised rank calculation matches the former calculation.
+
+    Steps:
+    1. Create a snapshot and random players inside and outside of the league.
+    2. Calculate the ranks of all players with one call.
+    3. Assert that every rank equals the rank of the former calculation.
+    """
+    rng = random.Random(seed)
+    snapshot = StatsSnapshot({}, rng.randint(2, 30), rng.randint(1, 5000))
+    players = [
+        (rng.randint(0, snapshot.max_hours), rng.randint(0, snapshot.count_league_participants))
+        for _ in range(6)
+    ]
+    ranks = player_ranks(
+        [hours for hours, _ in players], [pos for _, pos in players], snapshot, 0.4, 0.6
+    )
+    assert ranks.tolist() == pytest.approx(
+        [loop_rank(hours, pos, snapshot) for hours, pos in players]
+    )
+    assert player_ranks([10], [1], StatsSnapshot({}, 0, 100), 0.4, 0.6).tolist() == [0]
+
+
+def test_cache_drops_snapshot_loaded_before_invalidation():
+    """
+    Verifies that a snapshot loaded before an invalidation is not stored.
+
+    Steps:
+    1. Read the generation, invalidate the cache and store the loaded snapshot.
+    2. Assert that the snapshot is rejected and the cache is invalid.
+    3. Store a snapshot with the current generation and assert that it is valid.
+    """
+    cache = GameStatsCache()
+    snapshot = StatsSnapshot({1: 1}, 1, 100)
+    generation = cache.generation
+    cache.invalidate()
+    assert not cache.store(snapshot, generation)
+    assert not cache.valid
+    assert cache.store(snapshot, cache.generation)
+    assert cache.snapshot == snapshot
@@ -0,0 +1,131 @@
+"""
+This file contains unit tests for the rating queries of the in-memory task pool.
+"""
+
+import random
+from types import SimpleNamespace
+import pytest
+from src.task_pool import TaskPool, TaskSampler
+
+
+def create_tasks(ratings: list[int], task_type: str = "task") -> list[SimpleNamespace]:
+    """
+    Helper function to create task objects with the given ratings.
+
+    Args:
+        ratings (list[int]): Rating of each task
+        task_type (str, optional): Type of the tasks. Defaults to "task".
+
+    Returns:
+        list[SimpleNamespace]: Task objects with ID, rating and type
+    """
+    return [
+        SimpleNamespace(id=i, rating=rating, type=task_type)
+        for i, rating in enumerate(ratings, start=1)
+    ]
+
+
+def widening_search(tasks: list[SimpleNamespace], rating: int) -> list[int]:
+    """
+    Reference implementation of the former database search for game 1.
+
+    Args:
+        tasks (list[SimpleNamespace]): All tasks
+        rating (int): Start rating of the search
+
+    Returns:
+        list[int]: Sorted IDs of the found tasks
+    """
+    for _ in range(6):
+        found = [task.id for task in tasks if task.rating <= rating]
+        if len(found) >= 5:
+            return sorted(found)
+        rating += 5
+    return []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rating_groups_match_widening_search(seed):
+    """
+    Verifies that the pool finds the same tasks as the widening database search and
+    divides them into the rating groups of the balanced task mix.
+
+    Steps:
+    1. Load random tasks and a main task into the pool.
+    2. Query the pool for every start rating from 0 to 100.
+    3. Assert that the found tasks are equal to the reference search and every
+       task is in the group rating // 20.
+    """
+    rng = random.Random(seed)
+    tasks = create_tasks([rng.randint(0, 100) for _ in range(rng.randint(0, 30))])
+    pool = TaskPool()
+    pool.load(tasks + create_tasks([0], task_type="main"))
+    for rating in range(0, 101):
+        rating_max = pool.widened_rating("task", rating)
+        expected = widening_search(tasks, rating)
+        if rating_max is None:
+            assert not expected
+            continue
+        groups = pool.rating_groups("task", rating_max)
+        assert sorted(task.id for group in groups for task in group) == expected
+        for index, group in enumerate(groups):
+            assert all(min(task.rating // 20, 4) == index for task in group)
+
+
+@pytest.mark.parametrize("weighting", ["uniform", "rating"])
+def test_seeded_draw_is_reproducible_and_in_range(weighting):
+    """
+    Verifies that seeded samplers draw the same distinct tasks within the rating range.
+
+    Steps:
+    1. Load tasks with ratings from 0 to 99 into the pool.
+    2. Draw tasks with two samplers with the same seed.
+    3. Assert that both draws are equal, distinct and within the rating range.
+    """
+    pool = TaskPool()
+    pool.load(create_tasks(list(range(100))))
+    draws = [
+        TaskSampler(seed=7).draw(pool, "task", 5, 20, 40, weighting) for _ in range(2)
+    ]
+    assert [task.id for task in draws[0]] == [task.id for task in draws[1]]
+    assert len({task.id for task in draws[0]}) == 5
+    assert all(20 <= task.rating < 40 for task in draws[0])
+    assert len(TaskSampler(seed=7).draw(pool, "task", 50, 20, 40, weighting)) == 20
+
+
+def test_rating_weighted_draw_prefers_hard_tasks():
+    """
+    Verifies that the rating weighted draw selects tasks proportional to rating + 1.
+
+    Steps:
+    1. Load one task with rating 0 and one with rating 99 into the pool.
+    2. Draw one task many times with a seeded sampler.
+    3. Assert that the hard task is drawn about 100 times as often.
+    """
+    pool = TaskPool()
+    pool.load(create_tasks([0, 99]))
+    sampler = TaskSampler(seed=1)
+    hard = sum(
+        sampler.draw(pool, "task", 1, weighting="rating")[0].rating == 99
+        for _ in range(10000)
+    )
+    assert 9850 < hard < 9950
+
+
+def test_tasks_without_type_returns_all_types():
+    """
+    Verifies that the pool returns the tasks of all types if no type is given.
+
+    Steps:
+    1. Load normal tasks and main tasks into the pool.
+    2. Get the tasks of a rating range without type.
+    3. Assert that the tasks of both types are returned sorted by rating.
+    """
+    pool = TaskPool()
+    pool.load(create_tasks([10, 30, 50]) + create_tasks([20, 60], task_type="main"))
+    tasks = pool.tasks(None, 15, 55)
+    assert [(task.type, task.rating) for task in tasks] == [
+        ("main", 20),
+        ("task", 30),
+        ("task", 50),
+    ]
@@ -3,11 +3,13 @@ This file contains unit tests for verifying the functionality of
 generic utilities and functions within package tetue_generic.
 """
 
+import asyncio
 import os
 import sys
 from unittest.mock import patch
 import pytest
-from asyncmock import AsyncMock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from pydantic import ValidationError
 import src
 from src.tetue_generic import GENERIC_REQUEST_TIMEOUT_THR
@@ -15,142 +17,163 @@ from src.tetue_generic import GENERIC_REQUEST_TIMEOUT_THR
 sys.path.append("..")
 
 
-@pytest.mark.asyncio
-async def test_generic_http_request_success(mocker):
+@pytest.fixture(name="stub_server")
+async def fixture_stub_server():
     """
-    Tests the successful execution of a generic HTTP request.
+    Starts a local HTTP stub server with endpoints for success, server errors,
+    slow responses and a redirect loop.
+    """
+    calls = {"flaky": 0}
 
-    This test verifies that the `generic_http_request` function behaves correctly
-    when an HTTP request succeeds. Using mocking, it simulates the behavior of an
-    HTTP GET request to ensure that the function:
-    - Returns a valid response.
-    - Correctly processes the response's status code and text.
+    async def success(request):
+        return web.Response(text=f"Success {request.headers.get('Authorization')}")
 
-    Args:
-        mocker: A fixture used to mock modules and functions,
-        applied here to patch `src.requests.get`.
+    async def flaky(_request):
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            return web.Response(status=503)
+        return web.Response(text="Recovered")
 
-    Test Steps:
-    1. Create a mock HTTP response with a status code of 200 and the text "Success."
-    2. Patch the `src.requests.get` function to return the mock response.
-    3. Call the `generic_http_request` function with a sample URL and headers.
-    4. Validate the returned response to ensure that:
-        - It is not `None`.
-        - It contains a status code of 200.
-        - It includes the text "Success."
-    """
-    mock_response = AsyncMock()
-    mock_response.status_code = 200
-    mock_response.text = "Success"
-    mocker.patch("src.requests.get", return_value=mock_response)
-
-    url = "https://example.com"
-    header = {"Authorization": "Bearer token"}
-    response = await src.generic_http_request(url, header)
+    async def slow(_request):
+        await asyncio.sleep(1)
+        return web.Response(text="Too late")
 
-    assert response is not None
-    assert response.status_code == 200
-    assert response.text == "Success"
+    async def loop(_request):
+        raise web.HTTPFound("/loop")
+
+    async def etag(request):
+        calls["etag"] = calls.get("etag", 0) + 1
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text="Items", headers={"ETag": '"v1"'})
 
+    app = web.Application()
+    app.router.add_get("/success", success)
+    app.router.add_get("/flaky", flaky)
+    app.router.add_get("/slow", slow)
+    app.router.add_get("/loop", loop)
+    app.router.add_get("/etag", etag)
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    yield server
+    await server.close()
 
-@pytest.mark.asyncio
-async def test_generic_requests_http_error(mocker, capsys):
+
+@pytest.fixture(name="client")
+async def fixture_client():
     """
-    Tests the behavior of `generic_http_request` when an HTTP error occurs.
+    Creates a HTTP client without wait time between retries.
+    """
+    client = src.HttpClient(retries=2, backoff=0)
+    yield client
+    await client.close()
 
-    This test ensures that the `generic_http_request` function handles HTTP errors gracefully by:
-    - Returning `None` when an HTTP error is encountered.
-    - Logging the appropriate error message to standard output.
 
-    Args:
-        mocker: A fixture used to mock modules and functions,
-        here used to simulate an HTTP error by patching `requests.get`.
-        capsys: A pytest fixture for capturing and inspecting standard output and error streams.
+async def test_generic_http_request_success(stub_server, client):
+    """
+    Tests the successful execution of a generic HTTP request against the stub server.
 
     Test Steps:
-    1. Mock the `requests.get` function to raise an `HTTPError` when called.
-    2. Provide a sample URL and headers to the `generic_http_request` function.
-    3. Verify the following:
-        - The function returns `None`.
-        - The error message "HTTP error occurred: \n" is logged to the standard output.
+    1. Send a request with an authorization header to the success endpoint.
+    2. Validate that the response has the status code 200 and the expected text.
     """
+    response = await src.generic_http_request(
+        str(stub_server.make_url("/success")),
+        {"Authorization": "Bearer token"},
+        client=client,
+    )
 
-    mocker.patch("requests.get", side_effect=src.requests.exceptions.HTTPError)
-    url = "https://example.com"
-    header = {"Authorization": "Bearer token"}
+    assert response is not None
+    assert response.status_code == 200
+    assert response.text == "Success Bearer token"
 
-    # with pytest.raises(src.requests.exceptions.HTTPError):
-    response = await src.generic_http_request(url, header)
-    captured = capsys.readouterr()
-    assert response is None
-    assert captured.out == "HTTP error occurred: \n"
 
+async def test_generic_http_request_retry(stub_server, client):
+    """
+    Tests that server errors are retried until the request succeeds.
 
-@pytest.mark.asyncio
-async def test_generic_requests_connect_timeout(mocker, capsys):
+    Test Steps:
+    1. Send a request to an endpoint that fails twice with status 503.
+    2. Validate that the third attempt is returned and the endpoint was called three times.
     """
-    Tests the behavior of `generic_http_request` when a connection timeout occurs.
+    response = await src.generic_http_request(
+        str(stub_server.make_url("/flaky")), {}, client=client
+    )
+
+    assert response.status_code == 200
+    assert response.text == "Recovered"
+    assert stub_server.calls["flaky"] == 3
 
-    This test ensures that the `generic_http_request` function handles connection timeouts
-    gracefully by:
-    - Returning `None` when a `ConnectTimeout` exception is raised.
-    - Logging the appropriate timeout error message to standard output.
 
-    Args:
-        mocker: A fixture used to mock modules and functions,
-        here used to simulate a connection timeout by patching `requests.get`.
-        capsys: A pytest fixture for capturing and inspecting standard output and error streams.
+async def test_generic_requests_http_error(stub_server, client, capsys):
+    """
+    Tests the behavior of `generic_http_request` when an HTTP error occurs.
 
     Test Steps:
-    1. Mock the `requests.get` function to raise a `ConnectTimeout` exception when called.
-    2. Provide a sample URL and headers to the `generic_http_request` function.
-    3. Verify the following:
-        - The function returns `None`.
-        - The error message "Connection timeout error occurred: \n"
-        is logged to the standard output.
+    1. Send a request to an endpoint that redirects to itself.
+    2. Verify that the function returns `None` and the HTTP error is printed.
     """
+    response = await src.generic_http_request(
+        str(stub_server.make_url("/loop")), {}, client=client
+    )
+    captured = capsys.readouterr()
+    assert response is None
+    assert captured.out.startswith("HTTP error occurred: ")
 
-    mocker.patch("requests.get", side_effect=src.requests.exceptions.ConnectTimeout)
-    url = "https://example.com"
-    header = {"Authorization": "Bearer token"}
 
-    response = await src.generic_http_request(url, header)
+async def test_generic_requests_connect_timeout(stub_server, client, capsys):
+    """
+    Tests the behavior of `generic_http_request` when a request times out.
+
+    Test Steps:
+    1. Send a request with a short timeout to an endpoint that answers too late.
+    2. Verify that the function returns `None` after all retries and the timeout
+       error is printed.
+    """
+    response = await src.generic_http_request(
+        str(stub_server.make_url("/slow")), {}, req_timeout=0.1, client=client
+    )
     captured = capsys.readouterr()
     assert response is None
-    assert captured.out == "Connection timeout error occurred: \n"
+    assert captured.out.startswith("Connection timeout error occurred: ")
 
 
-@pytest.mark.asyncio
-async def test_generic_requests_connection_error(mocker, capsys):
+async def test_generic_requests_connection_error(stub_server, client, capsys):
     """
     Tests the behavior of `generic_http_request` when a connection error occurs.
 
-    This test ensures that the `generic_http_request` function handles
-    connection errors appropriately by:
-    - Returning `None` when a `ConnectionError` exception is raised.
-    - Logging the correct connection error message to standard output.
-
-    Args:
-        mocker: A fixture used to mock modules and functions,
-        here used to simulate a connection error by patching `requests.get`.
-        capsys: A pytest fixture for capturing and inspecting standard output and error streams.
-
     Test Steps:
-    1. Mock the `requests.get` function to raise a `ConnectionError` exception when called.
-    2. Provide a sample URL and headers to the `generic_http_request` function.
-    3. Verify the following:
-        - The function returns `None`.
-        - The error message "Connection error occurred: \n" is logged to the standard output.
+    1. Stop the stub server and send a request to its address.
+    2. Verify that the function returns `None` and the connection error is printed.
     """
-
-    mocker.patch("requests.get", side_effect=src.requests.exceptions.ConnectionError)
-    url = "https://example.com"
-    header = {"Authorization": "Bearer token"}
-
-    response = await src.generic_http_request(url, header)
+    url = str(stub_server.make_url("/success"))
+    await stub_server.close()
+    response = await src.generic_http_request(url, {}, client=client)
     captured = capsys.readouterr()
     assert response is None
-    assert captured.out == "Connection error occurred: \n"
+    assert captured.out.startswith("Connection error occurred: ")
+
+
+async def test_conditional_http_request_not_modified(stub_server, client, tmp_path):
+    """
+    Tests that a conditional request sends the stored ETag and gets a 304 response.
+
+    Test Steps:
+    1. Send a conditional request with an empty cache and store the response.
+    2. Send the request again with the validators of the cache.
+    3. Validate that the second response is 304 and the cache keeps the first body.
+    """
+    url = str(stub_server.make_url("/etag"))
+    cache = src.HttpCache(tmp_path)
+    first = await src.conditional_http_request(url, {}, cache, client=client)
+    cache.store(url, first)
+    second = await src.conditional_http_request(url, {}, cache, client=client)
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert cache.validators(url) == {"If-None-Match": '"v1"'}
+    assert cache.body(url) == b"Items"
 
 
 def test_gen_req_configuration_default():